@@ -0,0 +1,76 @@
+"""
+Run benchmarks:
+
+    python -m benchmarks [--filter <regex>] [--save <file>] [--compare <file>]
+
+Exits with code 1 if any benchmark is slower than the baseline by more than --threshold
+"""
+import argparse
+import json
+import sys
+
+from . import engine, bots
+from .core import compare, measure, select
+
+
+def format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument(
+        '-k', '--filter',
+        help='run only benchmarks which names match given regex',
+    )
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=5,
+        help='number of repeats of every benchmark. default is 5',
+    )
+    parser.add_argument(
+        '--min-time', type=float, default=0.2,
+        help='minimal time of one repeat in seconds. default is 0.2',
+    )
+    parser.add_argument(
+        '-s', '--save',
+        help='save results to json file to use as baseline',
+    )
+    parser.add_argument(
+        '-c', '--compare',
+        help='compare results with baseline json file',
+    )
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=0.1,
+        help='allowed slowdown relative to baseline. default is 0.1 (10%%)',
+    )
+
+    args = parser.parse_args()
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    results = {}
+    for name, setup in select(args.filter).items():
+        result = measure(setup, repeat=args.repeat, minTime=args.min_time)
+        results[name] = result
+
+        line = f'{name:<42} {format_time(result["best"]):>10}/{setup.unit}'
+        if setup.unit == 'game':
+            line += f' ({1 / result["best"]:.1f} games/s)'
+        if name in baseline:
+            change = result['best'] / baseline[name]['best'] - 1
+            line += f' {change:+.1%}'
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=4)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name in regressions:
+        print(f'REGRESSION: {name}')
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,56 @@
+import strategy3_bot
+from playGame import play_one_game
+from src.importsTools import import_bot
+
+from .core import benchmark
+from .positions import midgame, occupation
+
+
+@benchmark('strategy3_bot.setValuesAroundCell')
+def set_values_around_cell():
+    _, _, mazeSize, apple = midgame()
+    maze = [[0 for _ in range(mazeSize.y)] for _ in range(mazeSize.x)]
+
+    def run():
+        strategy3_bot.setValuesAroundCell(maze, mazeSize, apple, strategy3_bot.APPLE_REWARDS)
+    return run
+
+
+@benchmark('strategy3_bot.pathExists (all moves)')
+def path_exists():
+    snake, opponent, mazeSize, _ = midgame()
+    grid = occupation(snake, opponent, mazeSize)
+    moves = list(strategy3_bot.allowedMoves(snake.head, mazeSize, grid))
+
+    def run():
+        for move in moves:
+            strategy3_bot.pathExists(move, len(snake.body), grid, mazeSize)
+    return run
+
+
+@benchmark('strategy3_bot.isMoveSafe depth 3 (all moves)')
+def is_move_safe():
+    snake, opponent, mazeSize, _ = midgame()
+    grid = occupation(snake, opponent, mazeSize)
+    moves = list(strategy3_bot.allowedMoves(snake.head, mazeSize, grid))
+
+    def run():
+        for move in moves:
+            strategy3_bot.isMoveSafe(move, snake.body, opponent.body, grid, mazeSize, 3)
+    return run
+
+
+def full_game(bot1, bot2):
+    def run():
+        play_one_game(import_bot(bot1), import_bot(bot2))
+    return run
+
+
+@benchmark('game random_bot vs random_bot', unit='game')
+def random_vs_random():
+    return full_game('random_bot.py', 'random_bot.py')
+
+
+@benchmark('game strategy3_bot vs rational4_bot', unit='game')
+def strategy3_vs_rational4():
+    return full_game('strategy3_bot.py', 'rational4_bot.py')
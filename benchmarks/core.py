@@ -0,0 +1,69 @@
+import random
+import re
+import statistics
+import time
+
+# {name: setup function}. Setup returns a function without arguments to benchmark
+BENCHMARKS = {}
+
+SEED = 42
+
+
+def benchmark(name: str, unit='op'):
+    """
+    Register benchmark. Decorated function prepares data
+    and returns the function to measure
+    """
+    def decorator(setup):
+        setup.unit = unit
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def autorange(func, minTime) -> int:
+    """
+    Return number of calls that takes at least minTime seconds
+    """
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= minTime:
+            return number
+        number *= 2
+
+
+def measure(setup, repeat=5, minTime=0.2) -> dict:
+    """
+    Return the best and the median time of one call in seconds
+    """
+    random.seed(SEED)
+    func = setup()
+    number = autorange(func, minTime)
+
+    times = []
+    for _ in range(repeat):
+        random.seed(SEED)
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - start) / number)
+
+    return {'best': min(times), 'median': statistics.median(times), 'number': number}
+
+
+def select(pattern=None):
+    return {name: setup for name, setup in BENCHMARKS.items()
+            if not pattern or re.search(pattern, name)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Return names of benchmarks that are slower than baseline by more than threshold
+    """
+    return [
+        name for name, result in results.items()
+        if name in baseline and result['best'] > baseline[name]['best'] * (1 + threshold)
+    ]
@@ -0,0 +1,106 @@
+from src.game import Game, GameOver
+from src.geometry import UP, Coordinate, directions
+from src.importsTools import import_bot
+from src.multiGame import MultiGame
+from src.territory import Territory, occupation_grid
+
+from .core import benchmark
+from .positions import midgame
+
+
+@benchmark('geometry.Coordinate.hash (all cells)')
+def coordinate_hash():
+    cells = [Coordinate(x, y) for x in range(14) for y in range(14)]
+
+    def run():
+        for cell in cells:
+            hash(cell)
+    return run
+
+
+@benchmark('geometry.Coordinate.moveTo (all cells)')
+def coordinate_move_to():
+    cells = [Coordinate(x, y) for x in range(14) for y in range(14)]
+
+    def run():
+        for cell in cells:
+            for d in directions:
+                cell.moveTo(d)
+    return run
+
+
+@benchmark('snake.Snake.moveTo')
+def snake_move_to():
+    snake, _, _, _ = midgame()
+
+    def run():
+        # clone to keep the snake in the same position every call
+        snake.clone().moveTo(UP)
+    return run
+
+
+@benchmark('snake.Snake.clone')
+def snake_clone():
+    snake, _, _, _ = midgame()
+    return snake.clone
+
+
+def random_game():
+    bot = 'random_bot.py'
+    return Game.default_game(bots=(import_bot(bot), import_bot(bot)))
+
+
+@benchmark('game.Game.run_one_step')
+def game_run_one_step():
+    games = [random_game()]
+
+    def run():
+        try:
+            games[0].run_one_step()
+        except GameOver:
+            games[0] = random_game()
+    return run
+
+
+@benchmark('game.Game.randomNonOccupiedCell')
+def game_random_non_occupied_cell():
+    game = random_game()
+    game.snake1, game.snake2, _, _ = midgame()
+
+    def run():
+        game.randomNonOccupiedCell
+    return run
+
+
+@benchmark('territory.Territory.compute')
+def territory_compute():
+    snake, opponent, mazeSize, _ = midgame()
+    grid = occupation_grid(mazeSize, snake.body, opponent.body)
+    territory = Territory(mazeSize)
+
+    def run():
+        territory.compute(grid, snake.head, opponent.head)
+    return run
+
+
+def multi_game_step(n):
+    """
+    run_one_step of n random bots on 32x32, the cost should grow linearly with n
+    """
+    def new_game():
+        return MultiGame.default_game([import_bot('random_bot.py') for _ in range(n)], mazeSize=Coordinate(32, 32))
+
+    def setup():
+        games = [new_game()]
+
+        def run():
+            try:
+                games[0].run_one_step()
+            except GameOver:
+                games[0] = new_game()
+        return run
+    return setup
+
+
+for _n in (2, 4, 8):
+    benchmark(f'multiGame.MultiGame.run_one_step ({_n} snakes)')(multi_game_step(_n))
@@ -0,0 +1,88 @@
+"""
+Load test of the checker mode against the stand-in executor host:
+
+    python -m benchmarks.executor --concurrency 1 8 64 256 --latency 0.005
+
+Every game runs in its own thread, requests of all games are batched
+into round trips to one host. Shows how many games one host can serve
+"""
+import argparse
+import itertools
+import pickle
+import threading
+import time
+
+from src.executors import BatchChannel, LocalExecutor, LocalExecutorHost
+from src.game import Game
+from src.importsTools import import_bot
+
+
+def play_games(channel, bots, ids, results):
+    for gameId in ids:
+        executors = tuple(
+            LocalExecutor(channel, gameId, side, import_bot(path))
+            for side, path in enumerate(bots, 1))
+        game = Game.default_game(executors=executors, parallel=True)
+        for _ in game.__iter__():
+            pass
+        for executor in executors:
+            executor.stop()
+        results.append(game.iterationNumber)
+
+
+def load_test(bots, concurrency, games, latency):
+    channel = BatchChannel(LocalExecutorHost(), latency=latency)
+    ids = itertools.count()
+    results = []
+
+    # games are split between `concurrency` threads
+    perThread = [[next(ids) for _ in range(games // concurrency + (i < games % concurrency))]
+                 for i in range(concurrency)]
+    threads = [threading.Thread(target=play_games, args=(channel, bots, gameIds, results))
+               for gameIds in perThread]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(results)
+    print(f'{concurrency:>5} games at once: {len(results) / elapsed:8.1f} games/s, '
+          f'{ticks / elapsed:9.0f} ticks/s, '
+          f'{channel.frames / max(channel.batches, 1):6.1f} requests per round trip, '
+          f'{channel.bytesSent / max(channel.frames, 1):5.1f} bytes per request')
+
+
+def pickled_size():
+    """
+    Size of the state as it was sent before: pickled clones of game objects
+    """
+    game = Game.default_game(bots=(import_bot('random_bot.py'), import_bot('random_bot.py')))
+    return len(pickle.dumps((game.snake1, game.snake2, game.mazeSize, game.appleCoordinate)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.executor')
+    parser.add_argument(
+        '-c', '--concurrency', type=int, nargs='+', default=[1, 8, 64],
+        help='numbers of games played at the same time. default is 1 8 64',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=64,
+        help='number of games for every concurrency. default is 64',
+    )
+    parser.add_argument(
+        '-l', '--latency', type=float, default=0.005,
+        help='simulated latency of a round trip to the host in seconds. default is 0.005',
+    )
+    parser.add_argument(
+        '--bots', nargs=2, default=['random_bot.py', 'random_bot.py'],
+        help='two paths to python files with Bot class',
+    )
+
+    args = parser.parse_args()
+    print(f'Pickled state at the start of the game: {pickled_size()} bytes')
+    for concurrency in args.concurrency:
+        load_test(args.bots, concurrency, args.games, args.latency)
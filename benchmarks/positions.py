@@ -0,0 +1,37 @@
+from src.geometry import Coordinate
+from src.snake import Snake
+
+MAZE_SIZE = Coordinate(14, 14)
+
+# midgame position from playMove.py
+SNAKE_BODY = ['4 9', '3 9', '3 8', '3 7', '2 7', '2 8', '2 9', '2 10', '2 11', '3 11', '4 11', '5 11']
+OPPONENT_BODY = ['5 10', '5 9', '5 8', '5 7', '6 7', '6 8', '6 9', '7 9', '8 9', '8 8', '8 7']
+APPLE = Coordinate(13, 0)
+
+
+def to_coordinate(string):
+    x, y = string.split()
+    return Coordinate(int(x), int(y))
+
+
+def midgame():
+    """
+    Return (snake, opponent, mazeSize, apple)
+    """
+    snake_body = [to_coordinate(s) for s in SNAKE_BODY]
+    opponent_body = [to_coordinate(s) for s in OPPONENT_BODY]
+    snake = Snake(MAZE_SIZE, set(snake_body), snake_body)
+    opponent = Snake(MAZE_SIZE, set(opponent_body), opponent_body)
+    return snake, opponent, MAZE_SIZE, APPLE
+
+
+def occupation(snake, opponent, mazeSize):
+    """
+    Occupation grid as it is built by rational and strategy bots
+    """
+    grid = [[0 for _ in range(mazeSize.y)] for _ in range(mazeSize.x)]
+    for i, cell in enumerate(snake.body[::-1]):
+        grid[cell.x][cell.y] = i + 1
+    for i, cell in enumerate(opponent.body[::-1]):
+        grid[cell.x][cell.y] = i + 1
+    return grid
@@ -0,0 +1,110 @@
+"""
+Scaling of the engine and bots with the size of the maze:
+
+    python -m benchmarks.scaling [--sizes 14 32 64 128] [--bots <paths>] [--moves 100]
+
+For every size prints engine steps per second with random bots and move latency
+of every bot playing against itself. The exponent is log(time ratio) / log(area ratio)
+relative to the first size: ~0 is constant, ~1 is linear in the area of the maze,
+~2 is quadratic. Bots slower than --max-latency are not run on larger mazes
+"""
+import argparse
+import glob
+import math
+import random
+import time
+
+from src.game import Game, GameOver
+from src.geometry import Coordinate
+from src.importsTools import import_bot
+from src.stats import LatencyHistogram
+
+from .core import SEED
+
+# bots never time out here, slow bots are measured instead
+TIMEOUT = 3600
+
+
+def play_steps(bots, mazeSize: Coordinate, steps: int):
+    """
+    Play `steps` steps, new games are started when the previous ends.
+    Return (seconds, [histogram of move latency of every bot])
+    """
+    random.seed(SEED)
+    latencies = [LatencyHistogram() for _ in bots]
+    elapsed = 0
+    while steps > 0:
+        game = Game.default_game(bots=tuple(import_bot(path) for path in bots), mazeSize=mazeSize)
+        start = time.perf_counter()
+        try:
+            while steps > 0:
+                steps -= 1
+                game.run_one_step(timeout=TIMEOUT, requestTimeout=TIMEOUT)
+        except GameOver:
+            pass
+        elapsed += time.perf_counter() - start
+        for histogram, runner in zip(latencies, (game.bot1_runner, game.bot2_runner)):
+            histogram.merge(runner.latency)
+    return elapsed, latencies
+
+
+def exponent(value, baseline, area, baselineArea):
+    if not baseline or area == baselineArea:
+        return ''
+    return f'{math.log(value / baseline) / math.log(area / baselineArea):+.2f}'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.scaling')
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[14, 32, 64, 128],
+        help='sides of square mazes. default is 14 32 64 128',
+    )
+    parser.add_argument(
+        '--bots', nargs='+', default=sorted(glob.glob('*_bot.py')),
+        help='paths to bots. default is all bots in the current directory',
+    )
+    parser.add_argument(
+        '-n', '--moves', type=int, default=100,
+        help='game steps for every bot and size. default is 100',
+    )
+    parser.add_argument(
+        '--engine-steps', type=int, default=2000,
+        help='game steps of random bots for the engine. default is 2000',
+    )
+    parser.add_argument(
+        '--max-latency', type=float, default=1.0,
+        help='skip larger mazes for bots with p50 latency above given seconds. default is 1',
+    )
+
+    args = parser.parse_args()
+    sizes = sorted(args.sizes)
+    area0 = sizes[0] ** 2
+
+    print('Engine (random_bot.py):')
+    print('{:>6} {:>12} {:>9}'.format('size', 'steps/s', 'exponent'))
+    baseline = None
+    for size in sizes:
+        elapsed, latencies = play_steps(('random_bot.py', 'random_bot.py'), Coordinate(size, size), args.engine_steps)
+        # time of the engine without decisions of bots
+        engine = max(elapsed - sum(h.total for h in latencies) / 1e9, 1e-9) / args.engine_steps
+        baseline = baseline or engine
+        print('{:>6} {:>12.0f} {:>9}'.format(size, 1 / engine, exponent(engine, baseline, size ** 2, area0)))
+
+    print('Move latency, ms:')
+    print('{:<26} {:>6} {:>8} {:>8} {:>8} {:>9}'.format('Bot', 'size', 'moves', 'p50', 'p95', 'exponent'))
+    for path in args.bots:
+        baseline = None
+        for size in sizes:
+            _, latencies = play_steps((path, path), Coordinate(size, size), args.moves)
+            histogram = LatencyHistogram()
+            for h in latencies:
+                histogram.merge(h)
+            p50 = histogram.quantile(0.5)
+            baseline = baseline or p50
+            print('{:<26} {:>6} {:>8} {:>8.2f} {:>8.2f} {:>9}'.format(
+                path, size, histogram.count, p50 / 1e6, histogram.quantile(0.95) / 1e6,
+                exponent(p50, baseline, size ** 2, area0)))
+            if p50 > args.max_latency * 1e9:
+                print(f'{path} is too slow for larger mazes')
+                break
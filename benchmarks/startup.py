@@ -0,0 +1,56 @@
+"""
+Startup-time benchmark for entry points used in worker processes.
+
+Measures wall time of `python -c "<import>"` minus the time of a bare
+interpreter start and fails if the difference exceeds the budget
+"""
+import argparse
+import subprocess
+import sys
+import time
+
+IMPORTS = {
+    'playGame': 'from playGame import play_one_game',
+    'simulator': 'import simulator',
+    'importsTools': 'from src.importsTools import import_bot',
+}
+
+
+def measure(code: str, repeat: int) -> float:
+    """
+    Return the best wall time of running given code in a new interpreter
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(repeat=10, budget=0.05) -> bool:
+    baseline = measure('pass', repeat)
+    print(f'Interpreter startup: {baseline * 1000:.1f} ms')
+
+    ok = True
+    for name, code in IMPORTS.items():
+        overhead = measure(code, repeat) - baseline
+        status = 'ok' if overhead <= budget else 'TOO SLOW'
+        ok &= overhead <= budget
+        print(f'{name:<14} +{overhead * 1000:.1f} ms ({status})')
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=10,
+        help='number of runs of each import. default is 10',
+    )
+    parser.add_argument(
+        '-b', '--budget', type=float, default=50,
+        help='allowed import time in milliseconds. default is 50',
+    )
+
+    args = parser.parse_args()
+    sys.exit(0 if run(args.repeat, args.budget / 1000) else 1)
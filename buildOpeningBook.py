@@ -0,0 +1,34 @@
+import argparse
+import multiprocessing
+import time
+
+from src.openingBook import build_book, write_book
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Search the first moves from the start position for every apple')
+    parser.add_argument(
+        '-p', '--plies', type=int, default=3,
+        help='number of first moves of a snake in the book. default is 3',
+    )
+    parser.add_argument(
+        '-d', '--depth', type=int, default=6,
+        help='depth of the search in moves of both snakes. default is 6',
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=multiprocessing.cpu_count(),
+        help='number of worker processes. default is number of CPUs',
+    )
+    parser.add_argument(
+        '-o', '--output', default='openings.book',
+        help='path to the book. default is openings.book',
+    )
+
+    args = parser.parse_args()
+    startTime = time.perf_counter()
+
+    def progress(done, total):
+        print(f'\r{done}/{total} apples, {time.perf_counter() - startTime:.0f} s', end='', flush=True)
+
+    book = build_book(args.plies, args.depth, args.processes, progress)
+    write_book(args.output, book, args.plies, args.depth)
+    print(f'\n{len(book)} positions are written to {args.output}')
@@ -0,0 +1,19 @@
+import argparse
+import time
+
+from src.tablebase import CELLS, WINDOW, solve, write_tablebase
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=f'Solve longest paths in all pockets of a {WINDOW}x{WINDOW} window (requires numpy)')
+    parser.add_argument(
+        '-o', '--output', default='pockets.tb',
+        help='path to the tablebase. default is pockets.tb next to the bots',
+    )
+
+    args = parser.parse_args()
+    startTime = time.perf_counter()
+    table = solve()
+    write_tablebase(args.output, table)
+    print(f'{len(table)} masks x {CELLS} cells are solved in {time.perf_counter() - startTime:.1f} s '
+          f'and written to {args.output}')
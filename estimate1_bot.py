@@ -42,8 +42,8 @@ class Bot(IBot):
 
     def initMaze(self, mazeSize):
         self.baseMaze = []
-        for y in range(mazeSize.y):
-            self.baseMaze.append([0 for x in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            self.baseMaze.append([0 for y in range(mazeSize.y)])
 
         # penalize edges
         for y in range(mazeSize.y):
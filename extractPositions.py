@@ -0,0 +1,135 @@
+import argparse
+import json
+import logging
+import pathlib
+
+import src.constants as constants
+from src.corpus import CorpusWriter, position_key, position_to_args
+from src.importsTools import import_bot
+from src.utils import find_all_files_with_pattern
+
+
+def game_ticks(states: dict) -> list:
+    """
+    Return recorded game states ordered by iteration
+    """
+    ticks = [int(key) for key in states if key != 'metadata']
+    return [states[str(tick)] for tick in sorted(ticks)]
+
+
+def maze_size(states: dict) -> tuple:
+    """
+    Size of the maze of a recorded game. Games recorded before it was saved are on the default maze
+    """
+    return tuple(states['metadata'].get('mazeSize', constants.GAME_SIZE))
+
+
+def make_position(state: dict, side: int, tick: int, source: str, tag: str, mazeSize: tuple) -> dict:
+    """
+    Position from the point of view of the snake number `side`
+    """
+    opponentSide = 2 if side == 1 else 1
+    return {
+        'snake': state[f'snake{side}'],
+        'opponent': state[f'snake{opponentSide}'],
+        'apple': state['apple'],
+        'mazeSize': '{} {}'.format(*mazeSize),
+        'tick': tick,
+        'source': source,
+        'tags': [tag],
+    }
+
+
+def positions_before_loss(states: dict, source: str, last: int):
+    """
+    Last ticks of the game from the point of view of the loser
+    """
+    winner = states['metadata'].get('winner')
+    if winner not in (1, 2):
+        return
+
+    loser = 2 if winner == 1 else 1
+    ticks = game_ticks(states)
+    mazeSize = maze_size(states)
+    for tick in range(max(0, len(ticks) - last), len(ticks)):
+        yield make_position(ticks[tick], loser, tick, source, 'loss', mazeSize)
+
+
+def positions_with_winning_cells(states: dict, source: str, botPath: str):
+    """
+    Ticks where the strategy bot finds winning cells
+    """
+    ticks = game_ticks(states)
+    mazeSize = maze_size(states)
+    for side in (1, 2):
+        bot = import_bot(botPath)
+        for tick, state in enumerate(ticks):
+            position = make_position(state, side, tick, source, 'winning', mazeSize)
+            bot.chooseDirection(*position_to_args(position))
+            if getattr(bot, 'winningCells', None):
+                yield position
+
+
+def extract(files, last, winningBot=None):
+    positions = {}
+    for path in files:
+        try:
+            with open(path) as file:
+                states = json.load(file)
+        except (OSError, ValueError) as e:
+            logging.warning(f"Skip {path}: {e}")
+            continue
+
+        if 'metadata' not in states:
+            logging.warning(f"Skip {path}: not a recorded game")
+            continue
+
+        found = list(positions_before_loss(states, path, last))
+        if winningBot:
+            found += positions_with_winning_cells(states, path, winningBot)
+
+        for position in found:
+            key = position_key(position)
+            if key in positions:
+                tags = positions[key]['tags']
+                tags += [tag for tag in position['tags'] if tag not in tags]
+            else:
+                positions[key] = position
+
+    return list(positions.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'directory',
+        help='directory with games recorded by playGame.py --output',
+    )
+    parser.add_argument(
+        '-o', '--output', type=pathlib.Path, default='positions.snkc',
+        help='path to the corpus file. default is positions.snkc',
+    )
+    parser.add_argument(
+        '-n', '--last', type=int, default=5,
+        help='number of ticks before a loss to extract. default is 5',
+    )
+    parser.add_argument(
+        '-w', '--winning', metavar='BOT',
+        help='also extract ticks where given bot (e.g. strategy3_bot.py) finds winning cells',
+    )
+    parser.add_argument(
+        '-r', '--recursive', action='store_true',
+        help='search for games in subdirectories',
+    )
+
+    args = parser.parse_args()
+    if args.winning and getattr(import_bot(args.winning), 'winningCells', None) is None:
+        parser.error(f'{args.winning} does not report winning cells (winningCells), use e.g. strategy3_bot.py')
+    files = find_all_files_with_pattern(args.directory, r'\.json$', recursive=args.recursive)
+    positions = extract(sorted(files), args.last, args.winning)
+
+    with CorpusWriter(args.output) as corpus:
+        for position in positions:
+            corpus.write(position)
+
+    print(f"{len(positions)} positions from {len(files)} games written to {args.output}")
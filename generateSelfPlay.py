@@ -0,0 +1,52 @@
+import argparse
+import itertools
+import multiprocessing
+import time
+
+from playGame import add_board_arguments, board_options
+from src.selfPlay import SelfPlayDataset, generate
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate a self-play dataset of encoded positions (requires numpy)')
+    parser.add_argument(
+        'bots', nargs='+',
+        help='paths to bots. every ordered pair of them (including a bot with itself) plays in turn',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=100,
+        help='number of games. default is 100',
+    )
+    parser.add_argument(
+        '-o', '--output', default='selfplay',
+        help='directory of the dataset. new shards are added to an existing one. default is selfplay',
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=multiprocessing.cpu_count(),
+        help='number of worker processes. default is number of CPUs',
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='seed of the first game, the next games get the next seeds. default is 0',
+    )
+    parser.add_argument(
+        '--shard-size', type=int, default=32768,
+        help='positions per shard. default is 32768',
+    )
+    add_board_arguments(parser)
+
+    args = parser.parse_args()
+    board = board_options(parser, args)
+    pairs = list(itertools.product(args.bots, repeat=2))
+
+    def progress(done, total):
+        print(f'\r{done}/{total} games', end='', flush=True)
+
+    start = time.perf_counter()
+    try:
+        positions = generate(args.output, pairs, args.games, args.processes, args.seed, board,
+                             args.shard_size, progress=progress)
+    except ValueError as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    print(f'\n{positions} positions in {elapsed:.1f} s ({positions / elapsed:.0f} positions/s), '
+          f'{len(SelfPlayDataset(args.output))} in {args.output}')
@@ -0,0 +1,87 @@
+import os
+
+import numpy as np
+
+from src.geometry import directions
+from src.importsTools import load_bot_class, shared_file
+from src.network import PolicyValueNet
+from src.openingBook import MOVES, move_body
+from src.planes import PLANES, encode_cells
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# trained by trainNetwork.py, without it the bot plays as rational4_bot
+NETWORK_PATH = os.path.join(DIRECTORY, 'network.npz')
+# weight of the own policy added to values of moves
+PRIOR_WEIGHT = 0.1
+
+network = shared_file(NETWORK_PATH, PolicyValueNet.load) if os.path.exists(NETWORK_PATH) else None
+Rational4Bot = load_bot_class(os.path.join(DIRECTORY, 'rational4_bot.py'))
+
+
+def safe_moves(body, opponent, mazeSize):
+    """
+    Mask of moves which do not run into walls or bodies at once. Tails are left free
+    """
+    occupied = set(body[:-1]) | set(opponent[:-1])
+    x, y = body[0]
+    return np.array([0 <= x + dx < mazeSize[0] and 0 <= y + dy < mazeSize[1] and (x + dx, y + dy) not in occupied
+                     for dx, dy in MOVES])
+
+
+# one ply of simultaneous moves scored by the policy/value network
+class Bot(Rational4Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.network = network
+        self.planes = None
+
+    def evaluate(self, positions):
+        """
+        Return (probabilities of moves [N, 4], values [N]) of positions (snake, opponent, apple)
+        given as tuples of cells, in one forward pass
+        """
+        if self.planes is None or len(self.planes) < len(positions):
+            self.planes = np.zeros((max(len(positions), 2 * len(MOVES) ** 2),
+                                    len(PLANES)) + self.network.mazeSize, dtype=np.uint8)
+        for planes, (snake, opponent, apple) in zip(self.planes, positions):
+            encode_cells(snake, opponent, self.network.mazeSize, apple, out=planes)
+        return self.network.evaluate(self.planes[:len(positions)])
+
+    def chooseDirection(self, snake, opponent, mazeSize, apple):
+        if self.network is None or (mazeSize.x, mazeSize.y) != self.network.mazeSize:
+            return super().chooseDirection(snake, opponent, mazeSize, apple)
+
+        size = (mazeSize.x, mazeSize.y)
+        body = tuple((c.x, c.y) for c in snake.body)
+        opponentBody = tuple((c.x, c.y) for c in opponent.body)
+        appleCell = (apple.x, apple.y) if apple is not None else None
+
+        # values of leaves [move, opponent move]: terminal ones are known, the rest go to the network
+        values = np.zeros((len(MOVES), len(MOVES)))
+        positions = [(body, opponentBody, appleCell), (opponentBody, body, appleCell)]
+        leaves = []
+        for i, move in enumerate(MOVES):
+            for j, opponentMove in enumerate(MOVES):
+                newBody, grown, dead = move_body(body, move, appleCell, size)
+                newOpponent, opponentGrown, opponentDead = move_body(opponentBody, opponentMove, appleCell, size)
+                dead |= newBody[0] in newOpponent
+                opponentDead |= newOpponent[0] in newBody
+                if dead or opponentDead:
+                    values[i, j] = opponentDead - dead
+                else:
+                    # the next apple is not known yet
+                    positions.append((newBody, newOpponent, None if grown or opponentGrown else appleCell))
+                    leaves.append((i, j))
+
+        probabilities, leafValues = self.evaluate(positions)
+        for (i, j), value in zip(leaves, leafValues[2:]):
+            values[i, j] = value
+
+        # the opponent is expected to play its policy over moves which do not lose at once
+        opponentPolicy = probabilities[1] * safe_moves(opponentBody, body, size)
+        if opponentPolicy.sum() <= 0:
+            opponentPolicy = np.ones(len(MOVES))
+        opponentPolicy /= opponentPolicy.sum()
+
+        scores = values @ opponentPolicy + PRIOR_WEIGHT * probabilities[0]
+        return directions[int(np.argmax(scores))]
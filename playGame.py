@@ -1,45 +1,100 @@
-import argparse
-import json
 import logging
-import pathlib
 import time
-from typing import Tuple, Union
 
-import src.constants as constants
-from src import IBot
+from src.bot import IBot
 from src.game import Game, GameOver
+from src.geometry import Coordinate, directions
 from src.importsTools import import_bot
+from src.render import TerminalRenderer, snakes_cells
 
 
-def play_one_game(bot1: IBot, bot2: IBot, show=0) -> dict:
+def play_one_game(bot1: IBot, bot2: IBot, show=0, profiler=None, parallel=False, board=None, every=1) -> dict:
     """
-    Plays game between two bots
+    Plays game between two bots.
+    board is a dict of arguments of Game.default_game (see board_options).
+    With show every `every`-th tick is drawn and followed by a pause of `show` seconds
 
     Return info about the game in json format
     """
     logging.debug(f"Play game between {bot1._name} and {bot2._name}")
-    game = Game.default_game(bots=(bot1, bot2))
+    game = Game.default_game(bots=(bot1, bot2), parallel=parallel, **(board or {}))
+    game.set_profiler(profiler)
+    renderer = TerminalRenderer(game.mazeSize, every=every) if show else None
 
     # run game using python iterations
     gameIter = game.__iter__()
     for _ in gameIter:
-        if show:
-            print(
-                f"Snake1: {game.bot1_runner.lastMove} \tSnake2: {game.bot2_runner.lastMove}")
-            print(game)
-            time.sleep(show)
+        if renderer:
+            status = f"Snake1: {game.bot1_runner.lastMove} \tSnake2: {game.bot2_runner.lastMove}" \
+                     f"\tScore: {game.score1}:{game.score2}\tTick: {game.iterationNumber}"
+            # the last frame is always drawn
+            if renderer.draw(snakes_cells((game.snake1, game.snake2), game.appleCoordinate), status,
+                             force=gameIter.stop):
+                time.sleep(show)
 
     states = gameIter.getStates()
     game_description = GameOver(
         states['metadata']['winner'], states['metadata']['description']).__str__()
     logging.debug(game_description)
-    if show:
+    if renderer:
+        renderer.close()
         print(game_description)
 
     return states
 
 
+def add_board_arguments(parser):
+    parser.add_argument(
+        '--size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+        help='size of the maze. default is 14 14',
+    )
+    parser.add_argument(
+        '--length', type=int,
+        help='initial size of snakes. default is 3',
+    )
+    parser.add_argument(
+        '--starts', nargs=2, metavar=('X,Y,TAIL', 'X,Y,TAIL'),
+        help='heads of snakes and directions of their tails, e.g. 6,5,down 7,8,up. '
+             'default is generated for the maze',
+    )
+
+
+def parse_start(value: str):
+    parts = value.split(',')
+    if len(parts) != 3:
+        raise ValueError(f"start {value} should be X,Y,TAIL")
+    x, y, tail = parts
+    names = {d.name.lower(): d for d in directions}
+    if tail.lower() not in names:
+        raise ValueError(f"unknown direction {tail}, expected one of {', '.join(names)}")
+    return Coordinate(int(x), int(y)), names[tail.lower()]
+
+
+def board_options(parser, args) -> dict:
+    """
+    Arguments of Game.default_game from add_board_arguments.
+    Invalid boards are reported with parser.error before any game is played
+    """
+    board = {}
+    if args.size:
+        board['mazeSize'] = Coordinate(*args.size)
+    if args.length is not None:
+        board['size'] = args.length
+    try:
+        if args.starts:
+            board['starts'] = tuple(map(parse_start, args.starts))
+        Game.default_board(**board)
+    except ValueError as e:
+        parser.error(str(e))
+    return board
+
+
 if __name__ == "__main__":
+    # imported here to keep import of play_one_game fast in worker processes
+    import argparse
+    import json
+    import pathlib
+
     parser = argparse.ArgumentParser()
     parser.add_argument(
         'bots', nargs=2,
@@ -48,16 +103,54 @@ if __name__ == "__main__":
     parser.add_argument(
         '-s', '--show', type=float,
         help='add animation with given delay in seconds')
+    parser.add_argument(
+        '--every', type=int, default=1, metavar='K',
+        help='with --show draw only every K-th tick. default is 1',
+    )
     parser.add_argument(
         '-o', '--output', type=pathlib.Path,
         help='path to output states of game. default is game.json',
     )
+    parser.add_argument(
+        '--profile', choices=['cprofile', 'sampling', 'memory'],
+        help='profile chooseDirection of bots. memory also tracks allocations of the engine',
+    )
+    parser.add_argument(
+        '--profile-dir', default='profiles',
+        help='directory for .pstats and .collapsed files of bots. default is profiles',
+    )
+    parser.add_argument(
+        '-p', '--parallel', action='store_true',
+        help='run bots in separate processes and ask them at the same time',
+    )
+    add_board_arguments(parser)
 
     args = parser.parse_args()
+    board = board_options(parser, args)
+    if args.parallel and args.profile:
+        parser.error('--profile can not be used with --parallel')
+
     bot1_path, bot2_path = args.bots
-    bot1, bot2 = import_bot(bot1_path), import_bot(bot2_path)
+    if args.parallel:
+        from src.botProcess import BotProcess
+        bot1, bot2 = BotProcess(bot1_path), BotProcess(bot2_path)
+    else:
+        bot1, bot2 = import_bot(bot1_path), import_bot(bot2_path)
+
+    profiler = None
+    if args.profile:
+        from src.profiling import PROFILERS
+        profiler = PROFILERS[args.profile]()
+
+    states = play_one_game(bot1, bot2, show=args.show, profiler=profiler, parallel=args.parallel, board=board,
+                           every=args.every)
+
+    if args.parallel:
+        bot1.close()
+        bot2.close()
 
-    states = play_one_game(bot1, bot2, show=args.show)
+    if profiler:
+        profiler.dump(args.profile_dir)
 
     if args.output:
         with open(args.output, 'w') as file:
@@ -0,0 +1,89 @@
+import argparse
+import time
+from collections import defaultdict
+
+from src.game import GameOver
+from src.geometry import Coordinate
+from src.importsTools import import_bot
+from src.multiGame import MultiGame
+from src.render import TerminalRenderer, snakes_cells
+
+
+def play_multi_game(bots, show=0, board=None, every=1) -> dict:
+    """
+    Play free-for-all game of len(bots) snakes. Return metadata of the game
+    """
+    game = MultiGame.default_game(bots, **(board or {}))
+    if not show:
+        return game.run()
+
+    renderer = TerminalRenderer(game.mazeSize, every=every)
+
+    def draw(force=False):
+        snakes = [snake for snake, alive in zip(game.snakes, game.alive) if alive]
+        status = f"Alive: {len(snakes)}\tScores: {game.scores}\tTick: {game.iterationNumber}"
+        if renderer.draw(snakes_cells(snakes, game.appleCoordinate), status, force=force):
+            time.sleep(show)
+
+    try:
+        while True:
+            draw()
+            game.run_one_step()
+    except GameOver:
+        # the last frame is always drawn
+        draw(force=True)
+    finally:
+        renderer.close()
+    metadata = game.metadata()
+    print(f"{metadata['description']}, places: {game.places}")
+    return metadata
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Free-for-all games of N snakes')
+    parser.add_argument(
+        'bots', nargs='+',
+        help='paths to python files with Bot class, one per snake. a path can be repeated',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=1,
+        help='number of games. default is 1',
+    )
+    parser.add_argument(
+        '-s', '--show', type=float,
+        help='add animation with given delay in seconds',
+    )
+    parser.add_argument(
+        '--every', type=int, default=1, metavar='K',
+        help='with --show draw only every K-th tick. default is 1',
+    )
+    parser.add_argument(
+        '--size', type=int, nargs=2, metavar=('WIDTH', 'HEIGHT'),
+        help='size of the maze. default is 14 14',
+    )
+    parser.add_argument(
+        '--length', type=int,
+        help='initial size of snakes. default is 3',
+    )
+
+    args = parser.parse_args()
+    if len(args.bots) < 2:
+        parser.error('at least 2 bots are needed')
+    board = {'mazeSize': Coordinate(*args.size) if args.size else None, 'size': args.length}
+
+    points = defaultdict(float)
+    wins = defaultdict(int)
+    for _ in range(args.games):
+        # every snake has its own instance and module state of the bot
+        bots = [import_bot(path) for path in args.bots]
+        try:
+            metadata = play_multi_game(bots, show=args.show, board=board, every=args.every)
+        except ValueError as e:
+            parser.error(str(e))
+        for i, team in enumerate(metadata['teams']):
+            points[(i, team['name'])] += team['points']
+            wins[(i, team['name'])] += team['place'] == 1 and metadata['winner'] != 0
+
+    print('{:<4} {:<26} {:>10} {:>6}'.format('#', 'Bot', 'points', 'wins'))
+    for (i, name), total in points.items():
+        print('{:<4} {:<26} {:>10.2f} {:>6}'.format(i + 1, name, total / args.games, wins[(i, name)]))
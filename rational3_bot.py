@@ -1,4 +1,5 @@
 from src.bot import IBot
+from src.connectivity import pocket_size
 from src.geometry import Direction, Coordinate, directions
 from src.snake import Snake
 
@@ -50,8 +51,8 @@ class Bot(IBot):
 
     def initMaze(self, mazeSize):
         self.baseMaze = []
-        for y in range(mazeSize.y):
-            self.baseMaze.append([0 for _ in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            self.baseMaze.append([0 for _ in range(mazeSize.y)])
 
         # penalize edges
         for y in range(mazeSize.y):
@@ -98,8 +99,8 @@ class Bot(IBot):
 
         # avoid dead zones
         occupation = []
-        for y in range(mazeSize.y):
-            occupation.append([0 for _ in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            occupation.append([0 for _ in range(mazeSize.y)])
         for i, cell in enumerate(snake.body[::-1]):
             occupation[cell.x][cell.y] = i + 1
         for i, cell in enumerate(opponent.body[::-1]):
@@ -119,11 +120,13 @@ class Bot(IBot):
                         return True
             return False
 
+        # pockets smaller than the snake are dead zones without the search
         for neighbor in neighbors(snake.head, mazeSize):
             if neighbor not in cells_to_avoid\
                     and neighbor not in snake.elements\
                     and neighbor not in opponent.elements\
-                    and not path_exists(neighbor, len(snake.body)):
+                    and (pocket_size(occupation, mazeSize, neighbor, len(snake.body)) < len(snake.body)
+                         or not path_exists(neighbor, len(snake.body))):
                 cells_to_avoid.add(neighbor)
 
         possible_directions = []
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import itertools
+from collections import Counter
+
+from src.asyncGames import AsyncStandInExecutor, GameScheduler
+from src.utils import get_package_name
+
+
+def print_metrics(metrics):
+    print(f"finished {metrics['finished']}, running {metrics['running']}, "
+          f"{metrics['games/min']:.0f} games/min, queue depth {metrics['queue depth']}, "
+          f"in flight {metrics['in flight']}")
+
+
+async def main(args):
+    executors = {
+        get_package_name(path): AsyncStandInExecutor(path, latency=args.latency, maxInFlight=args.max_in_flight)
+        for path in args.bots
+    }
+    names = list(executors)
+    # every bot plays every other bot on both sides. a single bot plays itself
+    schedule = list(itertools.permutations(names, 2)) or [(names[0], names[0])]
+    pairs = list(itertools.islice(itertools.cycle(schedule), args.games))
+
+    scheduler = GameScheduler(executors, maxGames=args.concurrency,
+                              timeout=args.timeout, requestTimeout=args.request_timeout)
+    try:
+        results = await scheduler.run(pairs, reportInterval=args.report, callback=print_metrics)
+    finally:
+        for executor in executors.values():
+            executor.close()
+    print_metrics(scheduler.metrics())
+
+    descriptions = Counter(states['metadata']['description'] for states in results)
+    for description, count in descriptions.most_common():
+        print(f'{count}: {description}')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'bots', nargs='+',
+        help='paths to python files with Bot class',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=200,
+        help='number of games. default is 200',
+    )
+    parser.add_argument(
+        '-c', '--concurrency', type=int, default=100,
+        help='maximum number of games at the same time. default is 100',
+    )
+    parser.add_argument(
+        '-l', '--latency', type=float, nargs=2, default=[0.005, 0.02], metavar=('MIN', 'MAX'),
+        help='simulated latency of a container in seconds. default is 0.005 0.02',
+    )
+    parser.add_argument(
+        '-m', '--max-in-flight', type=int, default=16,
+        help='maximum number of requests handled by one bot executor at the same time. default is 16',
+    )
+    parser.add_argument(
+        '--timeout', type=float, default=1,
+        help='time for a decision of a bot in seconds. default is 1',
+    )
+    parser.add_argument(
+        '--request-timeout', type=float, default=2,
+        help='time for a request to an executor in seconds. default is 2',
+    )
+    parser.add_argument(
+        '-r', '--report', type=float, default=1,
+        help='interval of metrics reports in seconds. default is 1',
+    )
+
+    asyncio.run(main(parser.parse_args()))
@@ -1,32 +1,104 @@
-from collections import Counter
-from scipy.stats import binom_test
-from tqdm import tqdm
+import argparse
+from collections import defaultdict
 
+from playGame import add_board_arguments, board_options, play_one_game
 from src.importsTools import import_bot
-from playGame import play_one_game
+from src.stats import LatencyHistogram, binom_tail
 
 
-def play(bot1, bot2, n_games):
-    wins = [0, 0]
-    scores = [0, 0]
-    descriptions = Counter()
-    for _ in tqdm(range(n_games)):
-        result = play_one_game(bot1, bot2)
-        for i in range(2):
-            wins[i] += result['metadata']['result'][i]
-            scores[i] += result['metadata']['score'][i]
-        descriptions.update({result['metadata']['description']: 1})
-    n_wins = sum(wins)
-    print(f'Total games: {n_games}')
-    print(f'Results: +{wins[0]}={n_games - n_wins}-{wins[1]} ({int(wins[0] / n_wins * 100)}%)')
-    print('Average score: {:.1f}:{:.1f}'.format(scores[0] / n_games, scores[1] / n_games))
-    print('P-value: {:.3f}'.format(binom_test(max(wins), n_wins, alternative='greater')))
+def progress(iterable, total, enabled):
+    """
+    Wrap iterable with tqdm progress bar. tqdm is imported only when it is needed
+    """
+    if not enabled:
+        return iterable
+    from tqdm import tqdm
+    return tqdm(iterable, total=total)
 
-    for desc in descriptions.most_common():
-        print(f'{desc[1]}: {desc[0]}')
 
+def play(bot1, bot2, n_games, show_progress=False, profiler=None, board=None) -> 'ResultTable':
+    # numpy is imported only when games are played, not on import of simulator
+    from src.results import ResultTable, format_summary
+    table = ResultTable((bot1._name, bot2._name), capacity=n_games)
+    latencies = defaultdict(LatencyHistogram)
+    for _ in progress(range(n_games), n_games, show_progress):
+        result = play_one_game(bot1, bot2, profiler=profiler, board=board)
+        table.append(result['metadata'])
+        for team in ('team1', 'team2'):
+            metadata = result['metadata'][team]
+            latencies[metadata['name']].merge(LatencyHistogram.from_dict(metadata['latency']))
 
-new_bot = import_bot('estimate_bot.py', 'estimate1')
-baseline_bot = import_bot('random_bot.py', 'random')
+    summary = table.summary()
+    print(format_summary(summary))
+    wins1, _, wins2 = summary['results']
+    print('P-value: {:.3f}'.format(binom_tail(max(wins1, wins2), wins1 + wins2)))
 
-play(new_bot, baseline_bot, 100)
+    print_latencies(latencies)
+    return table
+
+
+def print_latencies(latencies):
+    """
+    Print decision time percentiles of every bot in milliseconds
+    """
+    print('Move latency, ms:')
+    print('{:<22} {:>8} {:>8} {:>8} {:>8} {:>8}'.format('Bot', 'moves', 'p50', 'p95', 'p99', 'max'))
+    for name, histogram in latencies.items():
+        percentiles = [histogram.quantile(q) / 1e6 for q in (0.5, 0.95, 0.99)]
+        print('{:<22} {:>8} {:>8.2f} {:>8.2f} {:>8.2f} {:>8.2f}'.format(
+            name, histogram.count, *percentiles, histogram.max / 1e6))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'bots', nargs=2,
+        help='two paths to python files with Bot class',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=100,
+        help='number of games. default is 100',
+    )
+    parser.add_argument(
+        '-p', '--progress', action='store_true',
+        help='show progress bar (requires tqdm)',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='directory to save results of games as columns (see summarizeResults.py)',
+    )
+    parser.add_argument(
+        '--csv',
+        help='export results of games to the CSV file',
+    )
+    parser.add_argument(
+        '--profile', choices=['cprofile', 'sampling', 'memory'],
+        help='profile chooseDirection of bots. memory also tracks allocations of the engine',
+    )
+    parser.add_argument(
+        '--profile-dir', default='profiles',
+        help='directory for .pstats and .collapsed files of bots. default is profiles',
+    )
+    add_board_arguments(parser)
+
+    args = parser.parse_args()
+    board = board_options(parser, args)
+    bot1_path, bot2_path = args.bots
+
+    new_bot = import_bot(bot1_path)
+    baseline_bot = import_bot(bot2_path)
+
+    profiler = None
+    if args.profile:
+        from src.profiling import PROFILERS
+        profiler = PROFILERS[args.profile]()
+
+    table = play(new_bot, baseline_bot, args.games, show_progress=args.progress, profiler=profiler,
+                 board=board)
+    if args.output:
+        table.save(args.output)
+    if args.csv:
+        table.to_csv(args.csv)
+
+    if profiler:
+        profiler.dump(args.profile_dir)
@@ -1,2 +1,15 @@
-from .bot import IBot
-from .game import Game, GameIter
\ No newline at end of file
+import importlib
+
+# submodules are imported on first access, so importing one module of src
+# does not pull in the whole package
+_lazy = {
+    'IBot': '.bot',
+    'Game': '.game',
+    'GameIter': '.game',
+}
+
+
+def __getattr__(name):
+    if name in _lazy:
+        return getattr(importlib.import_module(_lazy[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,198 @@
+"""
+Asyncio scheduler which runs many games over one event loop.
+
+Every bot is served by an executor (a container in production).
+While a game waits for a decision, the event loop drives other games.
+An executor handles at most `maxInFlight` requests at the same time,
+other requests wait in its queue (back-pressure)
+"""
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
+
+from .game import Game, GameIter, GameOver
+from .importsTools import import_bot
+from .protocol import StateDecoder, StateEncoder, decode_reply, encode_reply
+from .snake import SnakeRunner
+from .utils import get_package_name
+
+
+class AsyncStandInExecutor:
+    """
+    Local stand-in for a bot container. Simulates latency of a round trip
+    and talks to the bot with the protocol of src.protocol.
+    Bots think in a pool of `maxInFlight` threads, so the event loop drives
+    other games meanwhile
+    """
+
+    def __init__(self, path, latency=(0.005, 0.02), maxInFlight=16):
+        self.path = path
+        self.name = get_package_name(path)
+        self.latency = latency
+        self.semaphore = asyncio.Semaphore(maxInFlight)
+        self.pool = ThreadPoolExecutor(maxInFlight, thread_name_prefix=self.name)
+        self.waiting = 0
+        self.inFlight = 0
+
+    def session(self):
+        """
+        New instance of the bot for a game
+        """
+        return AsyncSession(self, import_bot(self.path))
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+
+    async def request(self, session, payload: bytes, timeout: float, requestTimeout: float) -> bytes:
+        """
+        Raise asyncio.TimeoutError if the request takes longer than requestTimeout.
+        The clock starts when the request leaves the queue of the executor
+        """
+        self.waiting += 1
+        async with self.semaphore:
+            self.waiting -= 1
+            self.inFlight += 1
+            try:
+                return await asyncio.wait_for(self.round_trip(session, payload, timeout), requestTimeout)
+            finally:
+                self.inFlight -= 1
+
+    async def round_trip(self, session, payload: bytes, timeout: float) -> bytes:
+        await asyncio.sleep(random.uniform(*self.latency))
+        return await asyncio.get_running_loop().run_in_executor(self.pool, self.handle, session, payload, timeout)
+
+    @staticmethod
+    def handle(session, payload: bytes, timeout: float) -> bytes:
+        """
+        Container side of the request. Runs in a thread of the pool
+        """
+        try:
+            data = session.decoder.decode(payload)
+            # CPU time of the thread: bots of other games share the interpreter, a container would not
+            startTime = time.thread_time()
+            result = session.bot.chooseDirection(*data)
+            if time.thread_time() - startTime > timeout:
+                return encode_reply(error='timeout')
+            return encode_reply(result)
+        except Exception as e:
+            return encode_reply(error=e.__str__())
+
+
+class AsyncSession:
+    """
+    Bot of one game on the executor. Used by SnakeRunner as an executor
+    only for name and id of the team
+    """
+
+    def __init__(self, executor: AsyncStandInExecutor, bot):
+        self.executor = executor
+        self.bot = bot
+        self.encoder = StateEncoder()
+        self.decoder = StateDecoder()
+        self.team = SimpleNamespace(name=bot._name, number=bot._id)
+        self.running = True
+        self.status = 'running'
+
+    async def send(self, data, timeout, requestTimeout) -> Tuple[str, object]:
+        payload = self.encoder.encode(*data)
+        return decode_reply(await self.executor.request(self, payload, timeout, requestTimeout))
+
+
+async def get_decision(runner: SnakeRunner, timeout, requestTimeout):
+    """
+    Async version of Game.get_decision for runners with AsyncSession executor
+    """
+    data = (runner.snake, runner.opponent, runner.mazeSize, runner.apple)
+    startTime = time.perf_counter_ns()
+    try:
+        error, result = await runner.executor.send(data, timeout, requestTimeout)
+    except asyncio.TimeoutError:
+        error, result = 'timeout', None
+    runner.add_latency(time.perf_counter_ns() - startTime)
+
+    if error:
+        return None, TimeoutError() if 'timeout' in error else Exception(error)
+    runner.lastMove = result
+    return result, None
+
+
+async def play_game(game: Game, timeout=1, requestTimeout=2) -> dict:
+    """
+    Play the game as GameIter does, but wait for both bots without blocking the loop
+    """
+    gameIter = GameIter(game, timeout=timeout, requestTimeout=requestTimeout)
+    while not gameIter.stop:
+        try:
+            gameIter.record_state()
+            game.prepare_step()
+            decision1, decision2 = await asyncio.gather(
+                get_decision(game.bot1_runner, timeout, requestTimeout),
+                get_decision(game.bot2_runner, timeout, requestTimeout))
+            game.check_decision(1, decision1)
+            game.check_decision(2, decision2)
+            game.apply_moves(decision1[0], decision2[0])
+        except GameOver:
+            gameIter.finish()
+    return gameIter.getStates()
+
+
+class GameScheduler:
+    """
+    Runs games between bots of given executors, at most `maxGames` at the same time
+    """
+
+    def __init__(self, executors: Dict[str, AsyncStandInExecutor], maxGames=100, timeout=1, requestTimeout=2):
+        self.executors = executors
+        self.maxGames = maxGames
+        self.timeout = timeout
+        self.requestTimeout = requestTimeout
+
+        self.startTime = None
+        self.running = 0
+        self.finished = 0
+        self.results: List[dict] = []
+
+    async def play(self, slots, name1, name2):
+        async with slots:
+            self.running += 1
+            try:
+                sessions = (self.executors[name1].session(), self.executors[name2].session())
+                game = Game.default_game(executors=sessions)
+                states = await play_game(game, self.timeout, self.requestTimeout)
+            finally:
+                self.running -= 1
+            self.finished += 1
+            self.results.append(states)
+
+    def metrics(self) -> dict:
+        elapsed = time.perf_counter() - self.startTime
+        return {
+            'finished': self.finished,
+            'running': self.running,
+            'games/min': self.finished / elapsed * 60 if elapsed else 0,
+            'queue depth': sum(e.waiting for e in self.executors.values()),
+            'in flight': sum(e.inFlight for e in self.executors.values()),
+        }
+
+    async def report(self, interval, callback):
+        while True:
+            await asyncio.sleep(interval)
+            callback(self.metrics())
+
+    async def run(self, pairs: List[Tuple[str, str]], reportInterval=1.0, callback=None) -> List[dict]:
+        """
+        Play a game for every pair of executor names.
+        callback gets metrics every reportInterval seconds
+        """
+        self.startTime = time.perf_counter()
+        slots = asyncio.Semaphore(self.maxGames)
+        reporter = asyncio.ensure_future(self.report(reportInterval, callback)) if callback else None
+        try:
+            await asyncio.gather(*(self.play(slots, name1, name2) for name1, name2 in pairs))
+        finally:
+            if reporter:
+                reporter.cancel()
+        return self.results
@@ -0,0 +1,118 @@
+"""
+Pool of worker processes with warm bots.
+
+Every worker compiles bot modules once (see load_bot_class) and keeps
+their shared() tables loaded between games.
+Every game still gets fresh Bot instances with fresh module state
+"""
+import multiprocessing
+import os
+import random
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Tuple
+
+from .game import Game
+from .importsTools import import_bot
+from .stats import LatencyHistogram
+
+# absolute paths of bots which have made a move in the current worker process
+_movedBots = set()
+
+
+def bot_path(spec) -> str:
+    return os.path.abspath(spec[0] if isinstance(spec, tuple) else spec)
+
+
+def warm_up(paths: List[str], moves: bool):
+    """
+    Initializer of workers: import bots and make a move with each of them
+    """
+    for path in paths:
+        bot = import_bot(path)
+        if moves:
+            game = Game.default_game(bots=(bot, import_bot(path)))
+            game.bot1_runner.run(timeout=float('inf'))
+            _movedBots.add(bot_path(path))
+
+
+def make_bot(spec):
+    """
+    spec is a path to the bot or (path, constants of the bot module)
+    """
+    if isinstance(spec, tuple):
+        path, constants = spec
+        return import_bot(path, constants=constants)
+    return import_bot(spec)
+
+
+def play_task(task) -> tuple:
+    """
+    Play one game in a worker. task is (bot1, bot2, seed, key),
+    bots are specs of make_bot. Return (key, metadata, cold) where cold tells
+    for each side if the bot had not made a move in this process before the game
+    """
+    bot1, bot2, seed, key = task
+    cold = tuple(bot_path(bot) not in _movedBots for bot in (bot1, bot2))
+    if seed is not None:
+        random.seed(seed)
+
+    game = Game.default_game(bots=(make_bot(bot1), make_bot(bot2)))
+    gameIter = game.__iter__()
+    for _ in gameIter:
+        pass
+
+    _movedBots.update(bot_path(bot) for bot in (bot1, bot2))
+    return key, gameIter.getStates()['metadata'], cold
+
+
+class BotPool:
+    def __init__(self, paths: List[str], processes=None, warmUp=True):
+        """
+        paths  -- bots to keep loaded in workers
+        warmUp -- make a move with every bot when a worker starts
+        """
+        self.pool = multiprocessing.Pool(processes, initializer=warm_up, initargs=(list(paths), warmUp))
+        # first moves of bots which have not moved in the worker yet (no warm-up move either) and of the others
+        self.coldFirstMoves = defaultdict(LatencyHistogram)
+        self.warmFirstMoves = defaultdict(LatencyHistogram)
+        self.moves = defaultdict(LatencyHistogram)
+
+    def play(self, tasks: Iterable[Tuple[object, object, int, object]]) -> Iterator[Tuple[object, dict]]:
+        """
+        Play games (bot1, bot2, seed, key) in workers.
+        Yield (key, metadata of the game) in order of finishing
+        """
+        for key, metadata, cold in self.pool.imap_unordered(play_task, tasks):
+            for team, isCold in zip((metadata['team1'], metadata['team2']), cold):
+                name = team['name']
+                if team['firstLatency'] is not None:
+                    firstMoves = self.coldFirstMoves if isCold else self.warmFirstMoves
+                    firstMoves[name].add(team['firstLatency'])
+                self.moves[name].merge(LatencyHistogram.from_dict(team['latency']))
+            yield key, metadata
+
+    def print_latencies(self):
+        """
+        Compare latency of the first move with steady-state latency.
+        A cold first move is the first move of the bot in its worker process,
+        so with warm-up every first move is warm
+        """
+        print('Move latency p50, ms:')
+        print('{:<22} {:>16} {:>16} {:>12}'.format('Bot', 'first move cold', 'first move warm', 'all moves'))
+        for name in sorted(self.moves):
+            cold, warm = self.coldFirstMoves[name], self.warmFirstMoves[name]
+            print('{:<22} {:>16} {:>16} {:>12.2f}'.format(
+                name,
+                f'{cold.quantile(0.5) / 1e6:.2f}' if cold.count else '-',
+                f'{warm.quantile(0.5) / 1e6:.2f}' if warm.count else '-',
+                self.moves[name].quantile(0.5) / 1e6))
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.pool.terminate()
@@ -0,0 +1,62 @@
+import multiprocessing
+
+from .bot import IBot
+from .importsTools import import_bot
+from .utils import get_package_name
+
+
+def serve(connection, path, name, _id):
+    """
+    Loop of the bot process: receive game state, send back the direction
+    """
+    try:
+        bot = import_bot(path, name, _id)
+    except Exception as e:
+        connection.send((f"{type(e).__name__}: {e}", None))
+        return
+    connection.send((None, None))
+
+    while True:
+        data = connection.recv()
+        if data is None:
+            break
+        try:
+            connection.send((None, bot.chooseDirection(*data)))
+        except Exception as e:
+            connection.send((e.__str__(), None))
+
+
+class BotProcess(IBot):
+    """
+    Bot running in a separate process.
+    Waiting for the answer releases the GIL, so bots of one game
+    can think at the same time (see Game(parallel=True))
+    """
+
+    def __init__(self, path, name=None, _id=None):
+        super().__init__(_name=name or get_package_name(path), _id=_id)
+        self.connection, childConnection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=serve, args=(childConnection, path, self._name, self._id), daemon=True)
+        self.process.start()
+
+        error, _ = self.connection.recv()
+        if error:
+            self.process.join()
+            raise ImportError(error)
+
+    def chooseDirection(self, snake, opponent, mazeSize, apple):
+        self.connection.send((snake, opponent, mazeSize, apple))
+        try:
+            error, result = self.connection.recv()
+        except EOFError:
+            raise Exception(f"Process of bot {self._name} is dead")
+        if error:
+            raise Exception(error)
+        return result
+
+    def close(self):
+        if self.process.is_alive():
+            self.connection.send(None)
+            self.process.join()
+        self.connection.close()
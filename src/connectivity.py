@@ -0,0 +1,49 @@
+"""
+Pockets of the cells a snake can use in the next `length` moves.
+
+A path of `length` cells can only go through cells with occupation < length,
+because the rest are still occupied when the path reaches them.
+The pocket of a cell is the largest number of cells a snake can visit after
+entering it: the cell and the largest piece of free cells around it.
+A pocket smaller than the length of the snake is a dead zone for sure,
+so the exponential path search is needed only for the other moves.
+
+This is an upper-bound pre-check, not the requested per-turn index of the
+maze (components and articulation points): such an index was slower on
+14x14 than these flood fills, which stop once a piece holds `length` cells,
+and no bot looks cells up in one
+"""
+from typing import List
+
+from .geometry import Coordinate
+
+
+def pocket_size(occupation: List[List[int]], mazeSize: Coordinate, cell: Coordinate, length: int) -> int:
+    """
+    Upper bound of the number of cells of a path which starts in the cell,
+    counting at most `length` cells. Flood fills stop as soon as a piece
+    is large enough, so it is cheap when there is room
+    """
+    width, height = mazeSize.x, mazeSize.y
+    visited = {(cell.x, cell.y)}
+    largest = 0
+    for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+        start = (cell.x + dx, cell.y + dy)
+        if start in visited or not (0 <= start[0] < width and 0 <= start[1] < height) \
+                or occupation[start[0]][start[1]] >= length:
+            continue
+        visited.add(start)
+        stack = [start]
+        size = 0
+        while stack:
+            x, y = stack.pop()
+            size += 1
+            if size >= length - 1:
+                return length
+            for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if neighbor not in visited and 0 <= neighbor[0] < width and 0 <= neighbor[1] < height \
+                        and occupation[neighbor[0]][neighbor[1]] < length:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        largest = max(largest, size)
+    return 1 + largest
@@ -0,0 +1,123 @@
+import json
+import struct
+import zlib
+from typing import Iterator, List
+
+from .geometry import Coordinate
+from .snake import Snake
+
+MAGIC = b'SNKC'
+VERSION = 1
+
+# magic, version
+HEADER = struct.Struct('<4sH')
+# offset, length
+INDEX_ENTRY = struct.Struct('<QI')
+# index offset, number of records, magic
+FOOTER = struct.Struct('<QI4s')
+
+
+def to_coordinate(string: str) -> Coordinate:
+    x, y = string.split()
+    return Coordinate(int(x), int(y))
+
+
+def position_key(position: dict) -> tuple:
+    """
+    Key for deduplication of positions
+    """
+    return (
+        tuple(position['snake']), tuple(position['opponent']),
+        position['apple'], position['mazeSize'],
+    )
+
+
+def position_to_args(position: dict) -> tuple:
+    """
+    Return (snake, opponent, mazeSize, apple) ready for chooseDirection
+    """
+    mazeSize = to_coordinate(position['mazeSize'])
+    snake_body = [to_coordinate(s) for s in position['snake']]
+    opponent_body = [to_coordinate(s) for s in position['opponent']]
+
+    snake = Snake(mazeSize, set(snake_body), snake_body)
+    opponent = Snake(mazeSize, set(opponent_body), opponent_body)
+    return snake, opponent, mazeSize, to_coordinate(position['apple'])
+
+
+class CorpusWriter:
+    """
+    Writes positions to the corpus file.
+
+    Every position is compressed separately, so any of them
+    can be read without decompressing the whole file.
+    The index of record offsets is written at the end of the file
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION))
+        self.index = []
+
+    def write(self, position: dict):
+        data = zlib.compress(json.dumps(position, separators=(',', ':')).encode())
+        self.index.append((self.file.tell(), len(data)))
+        self.file.write(data)
+
+    def close(self):
+        indexOffset = self.file.tell()
+        for entry in self.index:
+            self.file.write(INDEX_ENTRY.pack(*entry))
+        self.file.write(FOOTER.pack(indexOffset, len(self.index), MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CorpusReader:
+    """
+    Random access to positions of the corpus file
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+
+        magic, version = HEADER.unpack(self.file.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a corpus file")
+        if version != VERSION:
+            raise ValueError(f"Unsupported corpus version {version} in {path}")
+
+        self.file.seek(-FOOTER.size, 2)
+        indexOffset, count, magic = FOOTER.unpack(self.file.read(FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Corpus file {path} is truncated")
+
+        self.file.seek(indexOffset)
+        rawIndex = self.file.read(count * INDEX_ENTRY.size)
+        self.index: List[tuple] = list(INDEX_ENTRY.iter_unpack(rawIndex))
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> dict:
+        offset, length = self.index[i]
+        self.file.seek(offset)
+        return json.loads(zlib.decompress(self.file.read(length)))
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,138 @@
+"""
+Stand-in for the container executors of the checker.
+
+LocalExecutorHost plays the role of a container host which serves bots
+of many games. BatchChannel collects requests of all games into batches,
+so one (simulated) round trip serves many games at once.
+LocalExecutor is what SnakeRunner talks to in checker mode
+"""
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+from .bot import IBot
+from .protocol import (StateDecoder, StateEncoder, decode_batch, decode_reply,
+                       encode_batch, encode_reply)
+
+
+class LocalExecutorHost:
+    """
+    Runs bots of many games in the current process
+    """
+
+    def __init__(self):
+        # {(game id, side): (bot, decoder)}
+        self.bots = {}
+
+    def add_bot(self, gameId: int, side: int, bot: IBot):
+        self.bots[(gameId, side)] = (bot, StateDecoder())
+
+    def remove_game(self, gameId: int):
+        for side in (1, 2):
+            self.bots.pop((gameId, side), None)
+
+    def handle(self, gameId: int, side: int, payload: bytes) -> bytes:
+        try:
+            bot, decoder = self.bots[(gameId, side)]
+            return encode_reply(bot.chooseDirection(*decoder.decode(payload)))
+        except Exception as e:
+            return encode_reply(error=e.__str__())
+
+    def handle_batch(self, data: bytes) -> bytes:
+        return encode_batch([
+            (gameId, side, self.handle(gameId, side, payload))
+            for gameId, side, payload in decode_batch(data)
+        ])
+
+
+class BatchChannel:
+    """
+    Connection to the host with simulated latency of a round trip.
+    Requests of all threads which come within `window` seconds
+    are sent to the host as one batch
+    """
+
+    def __init__(self, host: LocalExecutorHost, latency=0.0, window=0.001, maxBatch=512):
+        self.host = host
+        self.latency = latency
+        self.window = window
+        self.maxBatch = maxBatch
+        self.requests = queue.Queue()
+
+        self.batches = 0
+        self.frames = 0
+        self.bytesSent = 0
+
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def request(self, gameId: int, side: int, payload: bytes, timeout: float) -> bytes:
+        """
+        Send payload and wait for the reply. Raise TimeoutError after timeout seconds
+        """
+        request = SimpleNamespace(frame=(gameId, side, payload), reply=None, done=threading.Event())
+        self.requests.put(request)
+        if not request.done.wait(timeout):
+            raise TimeoutError
+        return request.reply
+
+    def queue_depth(self) -> int:
+        return self.requests.qsize()
+
+    def serve(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.maxBatch:
+                try:
+                    batch.append(self.requests.get(timeout=max(0, deadline - time.perf_counter())))
+                except queue.Empty:
+                    break
+
+            data = encode_batch([request.frame for request in batch])
+            self.batches += 1
+            self.frames += len(batch)
+            self.bytesSent += len(data)
+
+            if self.latency:
+                time.sleep(self.latency)
+            replies = decode_batch(self.host.handle_batch(data))
+
+            for request, (_, _, reply) in zip(batch, replies):
+                request.reply = reply
+                request.done.set()
+
+
+class LocalExecutor:
+    """
+    Executor of one bot in one game, compatible with SnakeRunner in checker mode
+    """
+    # the state is serialized, so SnakeRunner does not need to clone it
+    serializes = True
+
+    def __init__(self, channel: BatchChannel, gameId: int, side: int, bot: IBot):
+        self.channel = channel
+        self.gameId = gameId
+        self.side = side
+        self.encoder = StateEncoder()
+        self.team = SimpleNamespace(name=bot._name, number=bot._id)
+        self.running = True
+        self.status = 'running'
+        channel.host.add_bot(gameId, side, bot)
+
+    def send(self, _data, timeout=2):
+        """
+        Return (error, direction)
+        """
+        payload = self.encoder.encode(*_data)
+        try:
+            reply = self.channel.request(self.gameId, self.side, payload, timeout)
+        except TimeoutError:
+            return 'timeout', None
+        return decode_reply(reply)
+
+    def stop(self):
+        self.running = False
+        self.status = 'stopped'
+        self.channel.host.remove_game(self.gameId)
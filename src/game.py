@@ -1,14 +1,58 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 from itertools import chain
 from typing import Tuple, Union
 import logging
 
 from . import constants
 from .bot import IBot
-from .geometry import DOWN, LEFT, RIGHT, UP, Coordinate, Direction
+from .geometry import DOWN, UP, Coordinate, Direction, is_direction
 from .snake import Snake, SnakeRunner
 
 
+_decisionPool = None
+
+
+def decision_pool() -> ThreadPoolExecutor:
+    """
+    Threads shared by all games for asking bots in parallel.
+    Threads only wait for executors or bot processes (see src.botProcess)
+    """
+    global _decisionPool
+    if _decisionPool is None:
+        _decisionPool = ThreadPoolExecutor(max_workers=256, thread_name_prefix='decision')
+    return _decisionPool
+
+
+def start_positions(mazeSize: Coordinate, size: int) -> Tuple[Tuple[Coordinate, Direction], Tuple[Coordinate, Direction]]:
+    """
+    Return ((head1, tailDir1), (head2, tailDir2)) for any board.
+    Layout of src.constants: the snakes are vertical near the center and
+    symmetric about it, the first one is moved up if its tail does not fit
+    """
+    if size < 1:
+        raise ValueError(f"size of snakes must be positive, not {size}")
+    if mazeSize.x < 2 or size > mazeSize.y:
+        raise ValueError(f"snakes of size {size} do not fit in {mazeSize.x}x{mazeSize.y} maze")
+    head1 = Coordinate(mazeSize.x // 2 - 1, max(mazeSize.y // 2 - 2, size - 1))
+    head2 = Coordinate(mazeSize.x - 1 - head1.x, mazeSize.y - 1 - head1.y)
+    return (head1, DOWN), (head2, UP)
+
+
+def check_start_positions(mazeSize: Coordinate, size: int, starts):
+    """
+    Raise ValueError if the snakes are out of the maze or overlap
+    """
+    cells = set()
+    for number, (head, tailDir) in enumerate(starts, 1):
+        body = Snake(mazeSize, initialHead=head, tailDireciton=tailDir, size=size).body
+        if not all(cell.inBounds(mazeSize) for cell in body):
+            raise ValueError(f"snake #{number} is out of {mazeSize.x}x{mazeSize.y} maze")
+        if cells & set(body):
+            raise ValueError(f"snake #{number} overlaps another snake")
+        cells.update(body)
+
+
 class GameOver(Exception):
     """
     Exception for stopping the game
@@ -36,7 +80,8 @@ class Game:
             head2: Coordinate, tailDir2: Coordinate,
             size: int, mazeSize: Coordinate = None,
             bots: Tuple[IBot, IBot] = None,
-            executors: Tuple[SnakeRunner, SnakeRunner] = None):
+            executors: Tuple[SnakeRunner, SnakeRunner] = None,
+            parallel: bool = False):
 
         self.gameId = random.randint(2**31, 2**32)
 
@@ -66,6 +111,10 @@ class Game:
             raise TypeError(f"executors or bots should be tuple of size 2")
 
         self.moves = []
+        # ask both bots at the same time
+        self.parallel = parallel
+        # src.profiling.BotProfiler, see set_profiler
+        self.profiler = None
 
         self.end = False
         self.snakeWinner = -1
@@ -73,25 +122,51 @@ class Game:
         self.result_description = "None"
 
     @staticmethod
-    def default_game(bots=None, executors=None):
+    def default_board(mazeSize: Coordinate = None, size: int = None, starts=None):
         """
-        Prepare and return default local game
+        Return (mazeSize, size, starts) with defaults filled in.
+        Maze size and size of snakes are taken from src.constants if not given.
+        starts are ((head1, tailDir1), (head2, tailDir2)), by default the positions
+        of src.constants on the default maze and start_positions on others.
+        Raise ValueError if the snakes do not fit
         """
+        defaultMaze = Coordinate(*constants.GAME_SIZE)
+        if mazeSize is None:
+            mazeSize = defaultMaze
+        if size is None:
+            size = constants.SNAKES_INITIAL_SIZE
+        if size < 1:
+            raise ValueError(f"size of snakes must be positive, not {size}")
+
+        if starts is None:
+            if mazeSize == defaultMaze and size == constants.SNAKES_INITIAL_SIZE:
+                starts = ((Coordinate(*constants.SNAKE1_INITIAL_HEAD), Direction(*constants.SNAKE1_INITIAL_DIRECTION)),
+                          (Coordinate(*constants.SNAKE2_INITIAL_HEAD), Direction(*constants.SNAKE2_INITIAL_DIRECTION)))
+            else:
+                starts = start_positions(mazeSize, size)
+        check_start_positions(mazeSize, size, starts)
+        return mazeSize, size, starts
 
-        mazeSize = Coordinate(*constants.GAME_SIZE)
-
-        head1 = Coordinate(*constants.SNAKE1_INITIAL_HEAD)
-        tailDir1 = Direction(*constants.SNAKE1_INITIAL_DIRECTION)
-
-        head2 = Coordinate(*constants.SNAKE2_INITIAL_HEAD)
-        tailDir2 = Direction(*constants.SNAKE2_INITIAL_DIRECTION)
-
-        snakeSize = constants.SNAKES_INITIAL_SIZE
+    @staticmethod
+    def default_game(bots=None, executors=None, parallel=False,
+                     mazeSize: Coordinate = None, size: int = None, starts=None):
+        """
+        Prepare and return default local game. See default_board for the board arguments
+        """
+        mazeSize, snakeSize, ((head1, tailDir1), (head2, tailDir2)) = Game.default_board(mazeSize, size, starts)
 
         game = Game(head1, tailDir1, head2, tailDir2,
-                    snakeSize, mazeSize, bots=bots, executors=executors)
+                    snakeSize, mazeSize, bots=bots, executors=executors, parallel=parallel)
         return game
 
+    def set_profiler(self, profiler):
+        """
+        Profile bots and steps of the game with given src.profiling.BotProfiler
+        """
+        self.profiler = profiler
+        self.bot1_runner.profiler = profiler
+        self.bot2_runner.profiler = profiler
+
     @property
     def randomNonOccupiedCell(self) -> Union[Coordinate, None]:
         """
@@ -146,11 +221,36 @@ class Game:
                 self.end_game(
                     0, prefix + ' and they had the same amount of points')
 
-    def run_one_step(self, timeout=1, requestTimeout=2):
-        directions = [UP, DOWN, LEFT, RIGHT]
+    @staticmethod
+    def get_decision(runner: SnakeRunner, timeout, requestTimeout) -> Tuple[Direction, Exception]:
         """
-        Run one step of the game. 
-        If any of snakes died, then finish the game
+        Ask runner for the next direction.
+        Return (direction, None) or (None, exception raised by runner)
+        """
+        try:
+            return runner.run(timeout=timeout, requestTimeout=requestTimeout), None
+        except Exception as e:
+            return None, e
+
+    def check_decision(self, snakeNumber: int, decision: Tuple[Direction, Exception]):
+        """
+        End the game if the snake failed to make a valid decision
+        """
+        opponentNumber = 2 if snakeNumber == 1 else 1
+        ordinal = '1st' if snakeNumber == 1 else '2nd'
+        direction, error = decision
+
+        if isinstance(error, TimeoutError):
+            self.end_game(opponentNumber, f'took too long to make a decision for {ordinal}')
+        elif error is not None:
+            self.end_game(opponentNumber, error.__str__())
+
+        if not is_direction(direction):
+            self.end_game(opponentNumber, f"Invalid direction for {ordinal}: {direction}")
+
+    def prepare_step(self):
+        """
+        Check if the game can go on and update runners before asking bots
         """
         # check if game is already over
         if self.end:
@@ -162,28 +262,34 @@ class Game:
         self.bot1_runner.apple = self.appleCoordinate
         self.bot2_runner.apple = self.appleCoordinate
 
-        try:
-            d1 = self.bot1_runner.run(
-                timeout=timeout, requestTimeout=requestTimeout)
-        except TimeoutError:
-            self.end_game(2, 'took too long to make a decision for 1st')
-        except Exception as e:
-            self.end_game(2, e.__str__())
-
-        if d1 not in directions:
-            self.end_game(2, f"Invalid direction for 1st: {d1}")
-
-        try:
-            d2 = self.bot2_runner.run(
-                timeout=timeout, requestTimeout=requestTimeout)
-        except TimeoutError:
-            self.end_game(1, 'took too long to make a decision for 2nd')
-        except Exception as e:
-            self.end_game(1, e.__str__())
+    def run_one_step(self, timeout=1, requestTimeout=2):
+        """
+        Run one step of the game. 
+        If any of snakes died, then finish the game
+        """
+        self.prepare_step()
+
+        if self.parallel:
+            # both bots think at the same time, the results are checked
+            # in the same order as in sequential mode
+            pool = decision_pool()
+            future1 = pool.submit(self.get_decision, self.bot1_runner, timeout, requestTimeout)
+            future2 = pool.submit(self.get_decision, self.bot2_runner, timeout, requestTimeout)
+            decision1, decision2 = future1.result(), future2.result()
+            self.check_decision(1, decision1)
+            self.check_decision(2, decision2)
+        else:
+            decision1 = self.get_decision(self.bot1_runner, timeout, requestTimeout)
+            self.check_decision(1, decision1)
+            decision2 = self.get_decision(self.bot2_runner, timeout, requestTimeout)
+            self.check_decision(2, decision2)
 
-        if d2 not in directions:
-            self.end_game(1, f"Invalid direction for 2st: {d2}")
+        self.apply_moves(decision1[0], decision2[0])
 
+    def apply_moves(self, d1: Direction, d2: Direction):
+        """
+        Move snakes in checked directions and end the game if needed
+        """
         try:
             grow1 = self.snake1.head.moveTo(d1) == self.appleCoordinate
         except Exception as e:
@@ -233,7 +339,8 @@ class Game:
 
         class Map:
             def __init__(self, mazeSize, emptyField='.'):
-                self._map = [[emptyField for _ in range(mazeSize.y)] for _ in range(mazeSize.x)]
+                # rows are y, the top row is printed first
+                self._map = [[emptyField for _ in range(mazeSize.x)] for _ in range(mazeSize.y)]
             
             def set_value(self, coord: Coordinate, value):
                 try:
@@ -304,25 +411,47 @@ class GameIter:
         if self.stop:
             raise StopIteration
         try:
-            self.states[str(self.game.iterationNumber)] = self.game.get_state()
-            self.game.run_one_step(timeout=self.timeout,
-                                   requestTimeout=self.requestTimeout)
+            self.record_state()
+            if self.game.profiler:
+                self.game.profiler.tick(self.game.run_one_step, timeout=self.timeout,
+                                        requestTimeout=self.requestTimeout)
+            else:
+                self.game.run_one_step(timeout=self.timeout,
+                                       requestTimeout=self.requestTimeout)
         except GameOver as e:
-            metadata = self.states['metadata']
-            metadata['winner'] = self.game.snakeWinner
-            metadata['description'] = self.game.result_description
-            metadata['score'] = self.game.score1, self.game.score2
-            metadata['gameId'] = self.game.gameId
-            metadata['result'] = self.game.result
-
-            team1 = metadata['team1']
-            team2 = metadata['team2']
-            team1['name'] = self.game.bot1_runner.name
-            team2['name'] = self.game.bot2_runner.name
-            team1['id'] = self.game.bot1_runner.id
-            team2['id'] = self.game.bot2_runner.id
-
-            self.stop = True
+            self.finish()
+
+    def record_state(self):
+        """
+        Remember state of the game before the step
+        """
+        self.states[str(self.game.iterationNumber)] = self.game.get_state()
+
+    def finish(self):
+        """
+        Fill metadata of the finished game and stop iterations
+        """
+        metadata = self.states['metadata']
+        metadata['winner'] = self.game.snakeWinner
+        metadata['description'] = self.game.result_description
+        metadata['score'] = self.game.score1, self.game.score2
+        metadata['gameId'] = self.game.gameId
+        metadata['result'] = self.game.result
+        metadata['iterations'] = self.game.iterationNumber
+        metadata['mazeSize'] = self.game.mazeSize.x, self.game.mazeSize.y
+
+        team1 = metadata['team1']
+        team2 = metadata['team2']
+        team1['name'] = self.game.bot1_runner.name
+        team2['name'] = self.game.bot2_runner.name
+        team1['id'] = self.game.bot1_runner.id
+        team2['id'] = self.game.bot2_runner.id
+        team1['latency'] = self.game.bot1_runner.latency.to_dict()
+        team2['latency'] = self.game.bot2_runner.latency.to_dict()
+        team1['firstLatency'] = self.game.bot1_runner.firstLatency
+        team2['firstLatency'] = self.game.bot2_runner.firstLatency
+
+        self.stop = True
 
     def getStates(self):
         return self.states
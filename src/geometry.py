@@ -1,33 +1,62 @@
-from typing import Union
+import functools
+from array import array
+from typing import List, Union
 
 
 class Direction:
     """
-    Represents direction in changing current coordinate (vector)
+    Represents direction in changing current coordinate (vector).
+
+    Directions are interned: Direction(0, 1) is UP itself, so == and hash
+    are by identity and checks of directions are pointer compares.
+    index is the position in `directions` (-1 for other vectors),
+    it is the key of OPPOSITE, LEFT_TURN, RIGHT_TURN and move_table
     """
-    def __init__(self, dx: int, dy: int, name: str = ""):
-        self.dx = dx
-        self.dy = dy
-        self.name = name
-        self.v = Coordinate(dx, dy)
-    
-    def __str__(self):
-        for d in directions:
-            if self == d:
-                return d.name
-        
-        return f"{self.dx} {self.dy}"
-
-    def __eq__(self, other):
-        if isinstance(other, Direction):
-            return self.v == other.v
-        else:
-            return False
+    _interned = {}
+
+    def __new__(cls, dx: int, dy: int, name: str = ""):
+        direction = cls._interned.get((dx, dy))
+        if direction is None:
+            direction = super().__new__(cls)
+            direction.dx = dx
+            direction.dy = dy
+            direction.name = name
+            direction.v = Coordinate(dx, dy)
+            direction.index = -1
+            cls._interned[(dx, dy)] = direction
+        elif name and not direction.name:
+            direction.name = name
+        return direction
 
+    def __str__(self):
+        return self.name or f"{self.dx} {self.dy}"
 
     def __repr__(self):
         return self.__str__()
 
+    def __reduce__(self):
+        # unpickled directions are the interned ones
+        return Direction, (self.dx, self.dy, self.name)
+
+    @property
+    def opposite(self):
+        return directions[OPPOSITE[self.index]] if self.index >= 0 else Direction(-self.dx, -self.dy)
+
+    @property
+    def left(self):
+        """
+        Direction after turning counterclockwise
+        """
+        return directions[LEFT_TURN[self.index]] if self.index >= 0 else Direction(-self.dy, self.dx)
+
+    @property
+    def right(self):
+        """
+        Direction after turning clockwise
+        """
+        return directions[RIGHT_TURN[self.index]] if self.index >= 0 else Direction(self.dy, -self.dx)
+
+
 class Coordinate:
     def __init__(self, x: int, y: int):
         self.x = x
@@ -40,19 +69,14 @@ class Coordinate:
         """
         Move coordinate in given direction
         """
-        return self + d.v
+        return Coordinate(self.x + d.dx, self.y + d.dy)
     
     def getDirection(self, other) -> Union[Direction, None]:
         """
-        Returns direction of given vector
-
-        TODO: looks like useless method. Delete?
+        Returns direction of given vector if it is one of `directions`
         """
-        vector = Coordinate(other.x - self.x, other.y - self.y)
-        for direction in directions:
-            if (direction.dx == vector.x and direction.dy == vector.y):
-                return direction
-        return None
+        direction = Direction._interned.get((other.x - self.x, other.y - self.y))
+        return direction if direction is not None and direction.index >= 0 else None
     
     def inBounds(self, mazeSize) -> bool:
         """
@@ -104,3 +128,34 @@ RIGHT = Direction(1, 0, "RIGHT")
 LEFT = Direction(-1, 0, "LEFT")
 
 directions = [UP, DOWN, RIGHT, LEFT]
+for _index, _direction in enumerate(directions):
+    _direction.index = _index
+
+# indexes of directions in the order of `directions`
+OPPOSITE = [1, 0, 3, 2]
+LEFT_TURN = [3, 2, 0, 1]
+RIGHT_TURN = [2, 3, 1, 0]
+
+
+def is_direction(value) -> bool:
+    """
+    True if value is one of `directions`
+    """
+    return isinstance(value, Direction) and value.index >= 0
+
+
+@functools.lru_cache(maxsize=16)
+def move_table(width: int, height: int) -> List[array]:
+    """
+    table[d.index][cell] is the index of the next cell in direction d,
+    -1 outside the maze. Cell index is x * height + y. Tables are shared,
+    do not modify them
+    """
+    tables = []
+    for d in directions:
+        table = array('i', [-1] * (width * height))
+        for x in range(max(0, -d.dx), min(width, width - d.dx)):
+            for y in range(max(0, -d.dy), min(height, height - d.dy)):
+                table[x * height + y] = (x + d.dx) * height + y + d.dy
+        tables.append(table)
+    return tables
@@ -1,39 +1,77 @@
 import importlib
+import importlib.util
 import logging
+import os
 import sys
 from typing import Tuple, Union
 
 from .bot import IBot
 from .utils import get_directory, get_package_name
 
+# {absolute path: (mtime, spec, compiled code)} of validated bot modules
+_botModules = {}
+# {key: value} of read-only resources of bots, see shared()
+_sharedResources = {}
 
-def import_bot(path, name=None, _id=None) -> IBot:
+
+def _compile_bot(path):
+    spec = importlib.util.spec_from_file_location(get_package_name(path), os.path.abspath(path))
+    if spec is None:
+        raise ImportError(f"{path} is not a python module")
+    try:
+        code = spec.loader.get_code(spec.name)
+    except OSError as e:
+        raise ModuleNotFoundError(f"Import error during importing module {spec.name} from {get_directory(path)}: {e}")
+    return spec, code
+
+
+def _execute_bot(spec, code, constants: dict = None) -> type:
     """
-    Import and return instance of participant bot
+    Run compiled code of the bot in a new module and return its Bot attribute
     """
-    dirName = get_directory(path)
-    packageName = get_package_name(path)
+    dirName = get_directory(spec.origin)
+    packageName = spec.name
+    module = importlib.util.module_from_spec(spec)
     sys.path.insert(0, dirName)
+    # the module is visible while it runs, as during a regular import
+    previous = sys.modules.get(packageName)
+    sys.modules[packageName] = module
     logging.debug(f"Trying to import {packageName} from {dirName}\n{sys.path}")
-    
+
     try:
-        Bot: IBot = importlib.import_module(packageName).Bot
+        exec(code, module.__dict__)
+        Bot: IBot = module.Bot
     except ModuleNotFoundError as e:
         raise ModuleNotFoundError(f"Import error during importing module {packageName} from {dirName}: {e}")
-    
+
     except AttributeError:
         raise ImportError(f"Package {packageName} does not contain attribute Bot")
 
-    # remove all info about module to prevent cheating
-    sys.path.remove(dirName)
-    del sys.modules[packageName]
+    else:
+        for name, value in (constants or {}).items():
+            if not hasattr(module, name):
+                raise AttributeError(f"Package {packageName} does not contain constant {name}")
+            setattr(module, name, value)
+
+    finally:
+        # remove all info about module to prevent cheating
+        sys.path.remove(dirName)
+        if previous is None:
+            sys.modules.pop(packageName, None)
+        else:
+            # a module of the same name imported before stays as it was
+            sys.modules[packageName] = previous
+
+    return Bot
 
+
+def _validate(Bot, packageName):
     if not isinstance(Bot, type):
         raise ImportError(
             f"Attribute Bot in package {packageName} is not a class")
 
     try:
-        bot = Bot(_name=name or packageName, _id=_id)
+        bot = Bot(_name=packageName)
 
         # check if bot has all attributes from IBot
         for attr in IBot().__dict__:
@@ -43,4 +81,66 @@ def import_bot(path, name=None, _id=None) -> IBot:
         raise ImportError(
             f"In {packageName} you need to inherit from IBot, pass *args and **kwargs in __init__ and initialize IBot subclass")
 
-    return bot
+
+def load_bot_class(path, constants: dict = None, cache=True) -> type:
+    """
+    Return validated Bot class of the participant bot from a new copy of its module.
+
+    The module is read, compiled and validated once per path and modification time
+    of the file. Every call runs the module code again, so module-level variables
+    are never shared between calls: resources which should be loaded once go
+    through shared().
+    constants -- {name: value} of module-level variables to replace after the import
+    """
+    key = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _botModules.get(key)
+    if cache and cached and cached[0] == mtime:
+        _, spec, code = cached
+        return _execute_bot(spec, code, constants)
+
+    spec, code = _compile_bot(path)
+    Bot = _execute_bot(spec, code, constants)
+    _validate(Bot, spec.name)
+    _botModules[key] = (mtime, spec, code)
+    return Bot
+
+
+def import_bot(path, name=None, _id=None, cache=True, constants: dict = None) -> IBot:
+    """
+    Import and return instance of participant bot
+
+    Every instance gets its own copy of the module (see load_bot_class),
+    the module itself stays out of sys.modules. Pass cache=False to read
+    and validate the file again.
+
+    constants replace module-level variables (e.g. EDGE_PENALTY) of the bot
+    """
+    Bot = load_bot_class(path, constants, cache)
+    return Bot(_name=name or get_package_name(path), _id=_id)
+
+
+def shared(key, load, *args):
+    """
+    Return load(*args), called only once per key in the process.
+    For read-only resources of bots (tables, books, weights): module-level
+    variables are not shared between instances, values of shared() are.
+    Callers must never modify the values
+    """
+    if key not in _sharedResources:
+        _sharedResources[key] = load(*args)
+    return _sharedResources[key]
+
+
+def shared_file(path, load):
+    """
+    shared() resource loaded from the file by load(path), loaded again if the file changes
+    """
+    path = os.path.abspath(path)
+    return shared((path, os.stat(path).st_mtime_ns), load, path)
+
+
+def clear_bot_cache():
+    _botModules.clear()
+    _sharedResources.clear()
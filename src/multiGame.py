@@ -0,0 +1,332 @@
+"""
+Free-for-all game of N snakes.
+
+All snakes share one occupancy index: occupancy[x * height + y] is the number
+of body cells in the cell. A tick moves the tails first, then the new heads are
+put into a hash {cell: snakes}. A snake dies if its head leaves the maze, hits
+an occupied cell or shares the cell with another head, so a tick costs O(N)
+whatever the number of snakes is. Dead snakes are removed from the maze.
+
+The rules are the rules of src.game.Game: a tail moved away in the same tick
+frees its cell, head-on collisions kill both snakes. With two snakes a game
+is the same as Game, but a bot which fails to make a decision only loses its snake.
+
+Bots keep IBot.chooseDirection(snake, opponent, ...): the opponent is the snake
+with the nearest head (see NearestOpponentRunner).
+
+Places: the longer a snake survives the better, snakes which die in the same tick
+(or survive until the end) are ordered by score. FFA points of a snake are the
+number of snakes with worse places plus 0.5 for every tie
+"""
+import logging
+import random
+from typing import List, Sequence, Tuple, Union
+
+from . import constants
+from .bot import IBot
+from .game import Game, GameOver, check_start_positions, decision_pool, start_positions
+from .geometry import DOWN, UP, Coordinate, Direction, is_direction
+from .snake import Snake, SnakeRunner
+
+
+def multi_start_positions(mazeSize: Coordinate, size: int, n: int) -> List[Tuple[Coordinate, Direction]]:
+    """
+    Return [(head, tailDir)] of n snakes. Two snakes start as in start_positions,
+    more snakes are vertical in evenly spaced columns, heads up and down in turn
+    """
+    if n == 2:
+        return list(start_positions(mazeSize, size))
+    if size < 1:
+        raise ValueError(f"size of snakes must be positive, not {size}")
+    if n > mazeSize.x or size > mazeSize.y:
+        raise ValueError(f"{n} snakes of size {size} do not fit in {mazeSize.x}x{mazeSize.y} maze")
+
+    low = max(mazeSize.y // 2 - 2, size - 1)
+    return [
+        (Coordinate((2 * i + 1) * mazeSize.x // (2 * n), low), DOWN) if i % 2 == 0
+        else (Coordinate((2 * i + 1) * mazeSize.x // (2 * n), mazeSize.y - 1 - low), UP)
+        for i in range(n)
+    ]
+
+
+class NearestOpponentRunner(SnakeRunner):
+    """
+    Adapter of two-snake bots: before every decision `opponent`
+    is set to the alive snake with the nearest head
+    """
+
+    def choose_opponent(self, snakes: Sequence[Snake], alive: Sequence[bool]):
+        head = self.snake.head
+        nearest = None
+        for other, isAlive in zip(snakes, alive):
+            if isAlive and other is not self.snake:
+                distance = abs(other.head.x - head.x) + abs(other.head.y - head.y)
+                if nearest is None or distance < nearest[0]:
+                    nearest = distance, other
+        # the last snake plays against an empty one
+        self.opponent = nearest[1] if nearest else Snake(self.mazeSize)
+
+
+class MultiGame:
+    """
+    Represents one free-for-all game of N snakes
+    """
+
+    def __init__(self, starts: Sequence[Tuple[Coordinate, Direction]], size: int, mazeSize: Coordinate,
+                 bots: Sequence[IBot], parallel: bool = False):
+        if len(bots) != len(starts):
+            raise TypeError(f"{len(starts)} bots are needed, {len(bots)} given")
+        check_start_positions(mazeSize, size, starts)
+
+        self.gameId = random.randint(2**31, 2**32)
+        self.mazeSize = mazeSize
+        self.height = mazeSize.y
+        self.occupancy = bytearray(mazeSize.x * mazeSize.y)
+
+        self.snakes = [Snake(mazeSize, initialHead=head, tailDireciton=tailDir, size=size) for head, tailDir in starts]
+        for snake in self.snakes:
+            for cell in snake.body:
+                self.occupancy[cell.x * self.height + cell.y] += 1
+        self.alive = [True] * len(self.snakes)
+
+        self.iterationNumber = 0
+        self.scores = [0] * len(self.snakes)
+        # tick of death, alive snakes get the last tick of the game
+        self.deathTicks = [None] * len(self.snakes)
+        # bots which failed to make a decision lose to snakes which die in the same tick
+        self.failed = [False] * len(self.snakes)
+        self.reasons = [None] * len(self.snakes)
+        self.appleCoordinate = self.randomNonOccupiedCell
+
+        self.runners = [NearestOpponentRunner(snake, snake, mazeSize, self.appleCoordinate, bot=bot)
+                        for snake, bot in zip(self.snakes, bots)]
+        self.parallel = parallel
+
+        self.end = False
+        self.places = []
+        self.points = []
+
+    @staticmethod
+    def default_game(bots: Sequence[IBot], parallel=False, mazeSize: Coordinate = None, size: int = None, starts=None):
+        """
+        Prepare and return a game of len(bots) snakes.
+        Maze size and size of snakes are taken from src.constants if not given
+        """
+        if mazeSize is None:
+            mazeSize = Coordinate(*constants.GAME_SIZE)
+        if size is None:
+            size = constants.SNAKES_INITIAL_SIZE
+        starts = starts or multi_start_positions(mazeSize, size, len(bots))
+        return MultiGame(starts, size, mazeSize, bots, parallel=parallel)
+
+    @property
+    def randomNonOccupiedCell(self) -> Union[Coordinate, None]:
+        """
+        The same cell as Game.randomNonOccupiedCell, checked in the occupancy index
+        """
+        width, height = self.mazeSize.x, self.mazeSize.y
+        x0 = random.randint(0, width - 1)
+        y0 = random.randint(0, height - 1)
+        occupancy = self.occupancy
+        for dy in range(height):
+            y = (y0 + dy) % height
+            for dx in range(width):
+                x = (x0 + dx) % width
+                if not occupancy[x * height + y]:
+                    return Coordinate(x, y)
+        return None
+
+    def alive_snakes(self) -> List[int]:
+        return [i for i, isAlive in enumerate(self.alive) if isAlive]
+
+    def get_decisions(self, timeout, requestTimeout) -> List[Tuple[Direction, Exception]]:
+        """
+        Ask bots of alive snakes, decisions of dead ones are None
+        """
+        alive = self.alive_snakes()
+        for i in alive:
+            runner = self.runners[i]
+            runner.apple = self.appleCoordinate
+            runner.choose_opponent(self.snakes, self.alive)
+
+        decisions = [None] * len(self.snakes)
+        if self.parallel:
+            pool = decision_pool()
+            futures = [(i, pool.submit(Game.get_decision, self.runners[i], timeout, requestTimeout)) for i in alive]
+            for i, future in futures:
+                decisions[i] = future.result()
+        else:
+            for i in alive:
+                decisions[i] = Game.get_decision(self.runners[i], timeout, requestTimeout)
+        return decisions
+
+    def run_one_step(self, timeout=1, requestTimeout=2):
+        """
+        Run one step of the game. Raise GameOver when at most one snake is alive
+        """
+        if self.end:
+            raise GameOver(self.winner, 'The game is over')
+        if self.iterationNumber > constants.MAX_GAME_ITERATIONS:
+            self.end_game('exceeded the maximum number of iterations')
+
+        moves = {}
+        for i, decision in enumerate(self.get_decisions(timeout, requestTimeout)):
+            if decision is None:
+                continue
+            direction, error = decision
+            if isinstance(error, TimeoutError):
+                self.kill(i, 'took too long to make a decision')
+            elif error is not None:
+                self.kill(i, str(error))
+            elif not is_direction(direction):
+                self.kill(i, f'invalid direction: {direction}')
+            else:
+                moves[i] = direction
+        self.apply_moves(moves)
+
+    def apply_moves(self, moves: dict):
+        """
+        Move snakes {index: direction} and remove dead ones
+        """
+        occupancy, height, apple = self.occupancy, self.height, self.appleCoordinate
+        width = self.mazeSize.x
+
+        # tails first: a cell left by a tail is free for any head
+        heads = {}
+        grown = []
+        for i, d in moves.items():
+            snake = self.snakes[i]
+            head = snake.head.moveTo(d)
+            grow = head == apple
+            if grow:
+                grown.append(i)
+            else:
+                tail = snake.body.pop()
+                snake.elements.discard(tail)
+                occupancy[tail.x * height + tail.y] -= 1
+            snake.body.insert(0, head)
+            heads.setdefault((head.x, head.y), []).append(i)
+
+        dead = []
+        for (x, y), snakes in heads.items():
+            if len(snakes) > 1:
+                dead.extend(snakes)
+                reason = 'collided with another head'
+            elif not (0 <= x < width and 0 <= y < height):
+                dead.append(snakes[0])
+                reason = 'left the maze'
+            elif occupancy[x * height + y]:
+                dead.append(snakes[0])
+                reason = 'hit a snake'
+            else:
+                continue
+            for i in snakes:
+                self.reasons[i] = reason
+
+        # heads are put into the index after all checks, so collisions do not depend on the order
+        deadSet = set(dead)
+        for (x, y), snakes in heads.items():
+            for i in snakes:
+                if i not in deadSet:
+                    occupancy[x * height + y] += 1
+                    self.snakes[i].elements.add(self.snakes[i].head)
+        for i in dead:
+            # the head of a dead snake is not in the index
+            self.remove(i, self.snakes[i].body[1:])
+
+        for i in grown:
+            if self.alive[i]:
+                self.scores[i] += 1
+
+        if len(self.alive_snakes()) <= 1:
+            self.end_game('the last snake is alive' if any(self.alive) else 'all snakes are dead')
+
+        self.iterationNumber += 1
+        if any(self.alive[i] for i in grown):
+            self.appleCoordinate = self.randomNonOccupiedCell
+
+    def kill(self, i: int, reason: str):
+        """
+        Remove the snake of the bot which failed to make a decision
+        """
+        self.reasons[i] = reason
+        self.failed[i] = True
+        self.remove(i, self.snakes[i].body)
+
+    def remove(self, i: int, cells):
+        occupancy, height = self.occupancy, self.height
+        for cell in cells:
+            occupancy[cell.x * height + cell.y] -= 1
+        self.alive[i] = False
+        self.deathTicks[i] = self.iterationNumber
+
+    def end_game(self, description: str):
+        """
+        Compute places and FFA points, raise GameOver
+        """
+        self.end = True
+        self.description = description
+        for i in self.alive_snakes():
+            self.deathTicks[i] = self.iterationNumber + 1
+
+        keys = [(self.deathTicks[i], not self.failed[i], self.scores[i]) for i in range(len(self.snakes))]
+        self.places = [1 + sum(other > key for other in keys) for key in keys]
+        self.points = [sum(other < key for other in keys) + 0.5 * (keys.count(key) - 1) for key in keys]
+        logging.info(f"End of free-for-all game {self.gameId}: {description}, places {self.places}")
+        raise GameOver(self.winner, description)
+
+    @property
+    def winner(self) -> int:
+        """
+        Number of the winner starting from 1, 0 if the first place is shared
+        """
+        if self.places.count(1) != 1:
+            return 0
+        return self.places.index(1) + 1
+
+    def run(self, timeout=1, requestTimeout=2) -> dict:
+        """
+        Play the game to the end and return its metadata
+        """
+        try:
+            while True:
+                self.run_one_step(timeout, requestTimeout)
+        except GameOver:
+            pass
+        return self.metadata()
+
+    def metadata(self) -> dict:
+        return {
+            'gameId': self.gameId,
+            'winner': self.winner,
+            'description': self.description,
+            'iterations': self.iterationNumber,
+            'teams': [
+                {
+                    'name': runner.name,
+                    'id': runner.id,
+                    'score': score,
+                    'place': place,
+                    'points': points,
+                    'deathTick': deathTick,
+                    'reason': reason,
+                    'latency': runner.latency.to_dict(),
+                }
+                for runner, score, place, points, deathTick, reason in zip(
+                    self.runners, self.scores, self.places, self.points, self.deathTicks, self.reasons)
+            ],
+        }
+
+    def __str__(self):
+        """
+        Game state in string view: snakes are a, b, c..., heads are capital letters
+        """
+        rows = [['.'] * self.mazeSize.x for _ in range(self.mazeSize.y)]
+        for i in self.alive_snakes():
+            letter = chr(ord('a') + i % 26)
+            for cell in self.snakes[i].body:
+                rows[cell.y][cell.x] = letter
+            rows[self.snakes[i].head.y][self.snakes[i].head.x] = letter.upper()
+        if self.appleCoordinate:
+            rows[self.appleCoordinate.y][self.appleCoordinate.x] = 'X'
+        return '\n'.join(''.join(row) for row in rows[::-1]) + '\n'
@@ -0,0 +1,152 @@
+"""
+Policy/value network in pure NumPy.
+
+A multilayer perceptron over features of src.planes: presence and relative
+age of both bodies, the apple and both heads. Hidden layers use ReLU, the policy
+head gives logits of the moves in the order of src.geometry.directions, the value
+head gives tanh of the expected outcome for the snake (1 win, -1 loss).
+
+Everything works on batches: evaluate() of N positions is one matrix multiply
+per layer, so a search scores all its leaves in one call.
+Weights are saved with np.savez together with the maze size and layer sizes
+"""
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from .planes import APPLE, OPPONENT_BODY, OPPONENT_HEAD, OWN_BODY, OWN_HEAD
+
+VERSION = 1
+MOVES = 4
+FEATURE_PLANES = 7
+
+
+def features(planes: np.ndarray) -> np.ndarray:
+    """
+    Input of the network for planes [N, PLANES, width, height]. Ages of body cells
+    are divided by the length of the body, so the tail is small and the head is 1
+    """
+    planes = np.asarray(planes)
+    n = len(planes)
+    result = np.empty((n, FEATURE_PLANES) + planes.shape[2:], dtype=np.float32)
+    for i, body in enumerate((OWN_BODY, OPPONENT_BODY)):
+        ages = planes[:, body].astype(np.float32)
+        lengths = ages.reshape(n, -1).max(axis=1)
+        result[:, 2 * i] = ages > 0
+        result[:, 2 * i + 1] = ages / np.maximum(lengths, 1)[:, None, None]
+    result[:, 4] = planes[:, APPLE]
+    result[:, 5] = planes[:, OWN_HEAD]
+    result[:, 6] = planes[:, OPPONENT_HEAD]
+    return result.reshape(n, -1)
+
+
+class PolicyValueNet:
+    def __init__(self, mazeSize: Tuple[int, int], hidden: Sequence[int] = (256, 128), seed=0):
+        self.mazeSize = tuple(mazeSize)
+        self.hidden = tuple(hidden)
+        generator = np.random.default_rng(seed)
+
+        sizes = (FEATURE_PLANES * mazeSize[0] * mazeSize[1],) + self.hidden
+        self.weights = {}
+        for i, (inputs, outputs) in enumerate(zip(sizes, sizes[1:])):
+            # He initialization for ReLU
+            self.weights[f'W{i}'] = (generator.standard_normal((inputs, outputs)) * np.sqrt(2 / inputs)).astype(np.float32)
+            self.weights[f'b{i}'] = np.zeros(outputs, dtype=np.float32)
+        self.weights['Wp'] = (generator.standard_normal((sizes[-1], MOVES)) * np.sqrt(1 / sizes[-1])).astype(np.float32)
+        self.weights['bp'] = np.zeros(MOVES, dtype=np.float32)
+        self.weights['Wv'] = (generator.standard_normal((sizes[-1], 1)) * np.sqrt(1 / sizes[-1])).astype(np.float32)
+        self.weights['bv'] = np.zeros(1, dtype=np.float32)
+
+    def save(self, path):
+        np.savez(path, version=VERSION, mazeSize=self.mazeSize, hidden=self.hidden, **self.weights)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as data:
+            if int(data['version']) != VERSION:
+                raise ValueError(f"{path} has unknown version {int(data['version'])}")
+            network = PolicyValueNet(tuple(int(v) for v in data['mazeSize']), tuple(int(v) for v in data['hidden']))
+            for name in network.weights:
+                network.weights[name] = data[name].astype(np.float32)
+        return network
+
+    def forward(self, x: np.ndarray):
+        """
+        Return (policy logits [N, 4], values [N], activations of hidden layers)
+        """
+        activations = [x]
+        for i in range(len(self.hidden)):
+            x = np.maximum(x @ self.weights[f'W{i}'] + self.weights[f'b{i}'], 0)
+            activations.append(x)
+        logits = x @ self.weights['Wp'] + self.weights['bp']
+        values = np.tanh(x @ self.weights['Wv'] + self.weights['bv'])[:, 0]
+        return logits, values, activations
+
+    def evaluate(self, planes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return (probabilities of moves [N, 4], values [N]) of a batch of planes
+        """
+        logits, values, _ = self.forward(features(planes))
+        logits -= logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(logits)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+        return probabilities, values
+
+    def gradients(self, planes: np.ndarray, moves: np.ndarray, outcomes: np.ndarray, valueWeight=1.0):
+        """
+        Return (policy loss, value loss, accuracy of moves, gradients).
+        The policy loss is cross-entropy over positions with a move (moves >= 0),
+        the value loss is the mean squared error of outcomes
+        """
+        x = features(planes)
+        n = len(x)
+        logits, values, activations = self.forward(x)
+
+        shifted = logits - logits.max(axis=1, keepdims=True)
+        probabilities = np.exp(shifted)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        withMove = moves >= 0
+        count = max(int(withMove.sum()), 1)
+        rows = np.flatnonzero(withMove)
+        policyLoss = -np.log(probabilities[rows, moves[rows]] + 1e-12).sum() / count
+        accuracy = (probabilities[rows].argmax(axis=1) == moves[rows]).sum() / count
+        error = values - outcomes
+        valueLoss = float((error ** 2).mean())
+
+        dLogits = probabilities * withMove[:, None]
+        dLogits[rows, moves[rows]] -= 1
+        dLogits /= count
+        # derivative of tanh
+        dValues = (valueWeight * 2 * error / n * (1 - values ** 2))[:, None]
+
+        last = activations[-1]
+        grads = {
+            'Wp': last.T @ dLogits, 'bp': dLogits.sum(axis=0),
+            'Wv': last.T @ dValues, 'bv': dValues.sum(axis=0),
+        }
+        dx = dLogits @ self.weights['Wp'].T + dValues @ self.weights['Wv'].T
+        for i in reversed(range(len(self.hidden))):
+            dx = dx * (activations[i + 1] > 0)
+            grads[f'W{i}'] = activations[i].T @ dx
+            grads[f'b{i}'] = dx.sum(axis=0)
+            if i:
+                dx = dx @ self.weights[f'W{i}'].T
+        return float(policyLoss), valueLoss, float(accuracy), grads
+
+
+class Adam:
+    def __init__(self, weights: Dict[str, np.ndarray], rate=1e-3, beta1=0.9, beta2=0.999, epsilon=1e-8):
+        self.weights = weights
+        self.rate, self.beta1, self.beta2, self.epsilon = rate, beta1, beta2, epsilon
+        self.m = {name: np.zeros_like(w) for name, w in weights.items()}
+        self.v = {name: np.zeros_like(w) for name, w in weights.items()}
+        self.t = 0
+
+    def step(self, grads: Dict[str, np.ndarray]):
+        self.t += 1
+        correction = np.sqrt(1 - self.beta2 ** self.t) / (1 - self.beta1 ** self.t)
+        for name, grad in grads.items():
+            self.m[name] = self.beta1 * self.m[name] + (1 - self.beta1) * grad
+            self.v[name] = self.beta2 * self.v[name] + (1 - self.beta2) * grad * grad
+            self.weights[name] -= (self.rate * correction * self.m[name] / (np.sqrt(self.v[name]) + self.epsilon)).astype(np.float32)
@@ -0,0 +1,217 @@
+"""
+Opening book for the fixed start positions of src.constants.
+
+Every game starts from the same snakes, only the apple varies. For every
+apple and both sides the first `plies` moves are searched in advance:
+the book follows its own move and every move of the opponent, until
+somebody eats the apple. The search is a paranoid alpha-beta over
+simultaneous moves: the opponent answers knowing our move.
+
+File format: header (magic, version, maze width, maze height, plies, depth,
+number of entries), sorted 64-bit keys of positions, one byte per position
+with the index of the move in src.geometry.directions
+"""
+import hashlib
+import multiprocessing
+import struct
+from array import array
+from typing import Dict, Tuple, Union
+
+from . import constants
+from .geometry import Coordinate, Direction, directions
+
+MAGIC = b'SNKB'
+VERSION = 1
+HEADER = struct.Struct('<4sHBBBBI')
+
+WIN = 1_000_000
+APPLE = 1_000
+INFINITY = 2 * WIN
+
+# (dx, dy) in the order of directions
+MOVES = [(d.dx, d.dy) for d in directions]
+
+Cell = Tuple[int, int]
+Body = Tuple[Cell, ...]
+
+
+def position_key(snake: Body, opponent: Body, apple: Cell, mazeSize: Cell) -> int:
+    """
+    Stable 64-bit key of the position from the point of view of `snake`
+    """
+    data = bytes((*mazeSize, *apple, len(snake), len(opponent)))
+    data += bytes(c for cell in snake + opponent for c in cell)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+
+def initial_bodies() -> Tuple[Body, Body]:
+    bodies = []
+    for head, (dx, dy) in ((constants.SNAKE1_INITIAL_HEAD, constants.SNAKE1_INITIAL_DIRECTION),
+                           (constants.SNAKE2_INITIAL_HEAD, constants.SNAKE2_INITIAL_DIRECTION)):
+        x, y = head
+        bodies.append(tuple((x + i * dx, y + i * dy) for i in range(constants.SNAKES_INITIAL_SIZE)))
+    return bodies[0], bodies[1]
+
+
+def move_body(body: Body, move: Cell, apple: Cell, mazeSize: Cell) -> Tuple[Body, bool, bool]:
+    """
+    Return (new body, grown, dead by walls or itself) as Snake.moveTo does
+    """
+    head = (body[0][0] + move[0], body[0][1] + move[1])
+    grown = head == apple
+    rest = body if grown else body[:-1]
+    dead = not (0 <= head[0] < mazeSize[0] and 0 <= head[1] < mazeSize[1]) or head in rest
+    return (head,) + rest, grown, dead
+
+
+def evaluate(snake: Body, opponent: Body, apple: Cell, mazeSize: Cell) -> int:
+    """
+    Static evaluation: who is closer to the apple and has more free neighbors
+    """
+    def distance(body):
+        return abs(body[0][0] - apple[0]) + abs(body[0][1] - apple[1])
+
+    occupied = set(snake) | set(opponent)
+
+    def freedom(body):
+        x, y = body[0]
+        return sum(1 for dx, dy in MOVES
+                   if 0 <= x + dx < mazeSize[0] and 0 <= y + dy < mazeSize[1] and (x + dx, y + dy) not in occupied)
+
+    return 10 * (distance(opponent) - distance(snake)) + freedom(snake) - freedom(opponent)
+
+
+def outcome(snake: Body, opponent: Body, apple: Cell, mazeSize: Cell, move: Cell, opponentMove: Cell, depth=0):
+    """
+    Apply both moves. Return (value, None) if the search stops here
+    or (None, (snake, opponent)) to search deeper.
+    Remaining depth is added to wins and apples, so the earlier is the better
+    """
+    newSnake, grown, dead = move_body(snake, move, apple, mazeSize)
+    newOpponent, opponentGrown, opponentDead = move_body(opponent, opponentMove, apple, mazeSize)
+    dead |= newSnake[0] in newOpponent
+    opponentDead |= newOpponent[0] in newSnake
+
+    if dead or opponentDead:
+        # scores are equal in the opening, so both dead is a draw
+        return (opponentDead - dead) * (WIN + depth), None
+    if grown or opponentGrown:
+        # the next apple is random, the search stops here
+        return (grown - opponentGrown) * (APPLE + depth) + evaluate(newSnake, newOpponent, apple, mazeSize), None
+    return None, (newSnake, newOpponent)
+
+
+def search(snake: Body, opponent: Body, apple: Cell, mazeSize: Cell, depth: int,
+           alpha=-INFINITY, beta=INFINITY) -> Tuple[int, int]:
+    """
+    Return (value, index of the best move)
+    """
+    best, bestMove = -INFINITY, 0
+    for i, move in enumerate(MOVES):
+        value = INFINITY
+        for opponentMove in MOVES:
+            result, nextState = outcome(snake, opponent, apple, mazeSize, move, opponentMove, depth)
+            if result is None:
+                result = evaluate(*nextState, apple, mazeSize) if depth == 1 \
+                    else search(*nextState, apple, mazeSize, depth - 1, max(alpha, best), value)[0]
+            value = min(value, result)
+            if value <= max(alpha, best):
+                break
+        if value > best:
+            best, bestMove = value, i
+            if best >= beta:
+                break
+    return best, bestMove
+
+
+def book_positions(side: int, apple: Cell, plies: int, depth: int) -> Dict[int, int]:
+    """
+    Search positions of the first `plies` moves of the snake number `side`
+    with the given apple. Return {key: index of the move}
+    """
+    mazeSize = constants.GAME_SIZE
+    snake, opponent = initial_bodies()
+    if side == 2:
+        snake, opponent = opponent, snake
+
+    book = {}
+    positions = [(snake, opponent)]
+    for ply in range(plies):
+        nextPositions = []
+        for snake, opponent in positions:
+            key = position_key(snake, opponent, apple, mazeSize)
+            if key in book:
+                continue
+            _, move = search(snake, opponent, apple, mazeSize, depth)
+            book[key] = move
+            for opponentMove in MOVES:
+                _, nextState = outcome(snake, opponent, apple, mazeSize, MOVES[move], opponentMove)
+                if nextState:
+                    nextPositions.append(nextState)
+        positions = nextPositions
+    return book
+
+
+def _book_task(task) -> Dict[int, int]:
+    return book_positions(*task)
+
+
+def build_book(plies: int, depth: int, processes=None, progress=None) -> Dict[int, int]:
+    """
+    Search all apples and both sides in a process pool.
+    progress is called with (done, total) after every apple
+    """
+    snake, opponent = initial_bodies()
+    occupied = set(snake) | set(opponent)
+    width, height = constants.GAME_SIZE
+    tasks = [(side, (x, y), plies, depth)
+             for side in (1, 2) for x in range(width) for y in range(height) if (x, y) not in occupied]
+
+    book = {}
+    with multiprocessing.Pool(processes) as pool:
+        for i, positions in enumerate(pool.imap_unordered(_book_task, tasks), 1):
+            book.update(positions)
+            if progress:
+                progress(i, len(tasks))
+    return book
+
+
+def write_book(path, book: Dict[int, int], plies: int, depth: int):
+    keys = sorted(book)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, *constants.GAME_SIZE, plies, depth, len(keys)))
+        file.write(array('Q', keys).tobytes())
+        file.write(bytes(book[key] for key in keys))
+
+
+class OpeningBook:
+    """
+    Bot side of the book. Lookups are dictionary probes
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        magic, version, width, height, self.plies, self.depth, n = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not an opening book")
+
+        self.mazeSize = (width, height)
+        keys = array('Q')
+        keys.frombytes(data[HEADER.size:HEADER.size + 8 * n])
+        moves = data[HEADER.size + 8 * n:HEADER.size + 9 * n]
+        self.moves = dict(zip(keys, moves))
+
+    def __len__(self):
+        return len(self.moves)
+
+    def lookup(self, snake, opponent, mazeSize: Coordinate, apple: Coordinate) -> Union[Direction, None]:
+        """
+        Return the move of the book for arguments of chooseDirection or None
+        """
+        if (mazeSize.x, mazeSize.y) != self.mazeSize:
+            return None
+        key = position_key(tuple((c.x, c.y) for c in snake.body), tuple((c.x, c.y) for c in opponent.body),
+                           (apple.x, apple.y), self.mazeSize)
+        move = self.moves.get(key)
+        return None if move is None else directions[move]
@@ -0,0 +1,125 @@
+"""
+Online model of the policy of the opponent.
+
+Bots see only the current snakes, so the model recovers moves of the opponent
+from changes of its body between calls of chooseDirection and keeps a mixture
+of simple policies:
+
+    greedy   -- a safe move closest to the apple
+    straight -- keeps the direction if it is safe
+    random   -- any safe move
+
+Weights of the mixture are updated with the probability each policy gave to
+the observed move (Bayes' rule with forgetting, so the model follows an opponent
+which changes its behaviour). The mixture gives probabilities of the next moves
+of the opponent; a search takes replies in this order and can skip unlikely ones.
+Pure Python, one update is a few dozen operations
+"""
+from typing import List, Tuple
+
+from .geometry import Coordinate, Direction, directions
+
+POLICIES = ('greedy', 'straight', 'random')
+
+
+def safe_moves(body, other, mazeSize: Coordinate) -> List[bool]:
+    """
+    Moves of the snake which do not run into walls or bodies at once, in the order of directions.
+    Tails move away, so their cells are free
+    """
+    occupied = set(body[:-1]) | set(other[:-1])
+    return [head.inBounds(mazeSize) and head not in occupied for head in (body[0].moveTo(d) for d in directions)]
+
+
+def uniform(mask: List[bool]) -> List[float]:
+    count = sum(mask)
+    if not count:
+        return [1 / len(mask)] * len(mask)
+    return [1 / count if allowed else 0.0 for allowed in mask]
+
+
+def policies(body, other, mazeSize: Coordinate, apple: Coordinate) -> List[List[float]]:
+    """
+    Probabilities of moves of the snake under every policy of POLICIES
+    """
+    safe = safe_moves(body, other, mazeSize)
+    random = uniform(safe)
+
+    if apple is None or not any(safe):
+        greedy = random
+    else:
+        distances = [body[0].moveTo(d).getDistance(apple) for d in directions]
+        closest = min(distance for distance, allowed in zip(distances, safe) if allowed)
+        greedy = uniform([allowed and distance == closest for distance, allowed in zip(distances, safe)])
+
+    current = body[1].getDirection(body[0]) if len(body) > 1 else None
+    if current is not None and safe[current.index]:
+        straight = [float(i == current.index) for i in range(len(directions))]
+    else:
+        straight = random
+
+    return [greedy, straight, random]
+
+
+class OpponentModel:
+    def __init__(self, decay=0.9, floor=0.05):
+        """
+        decay -- exponent applied to old weights at every update, 1 never forgets
+        floor -- probability kept for moves a policy would not make, so one surprise does not rule it out
+        """
+        self.decay = decay
+        self.floor = floor
+        self.reset()
+
+    def reset(self):
+        self.weights = [1 / len(POLICIES)] * len(POLICIES)
+        # observed moves of the opponent
+        self.moves: List[Direction] = []
+        # (opponent body, own body, apple) of the previous call
+        self.previous = None
+
+    def observe(self, snake, opponent, mazeSize: Coordinate, apple: Coordinate):
+        """
+        Update the model with arguments of chooseDirection. Call it once per move
+        """
+        if self.previous is not None:
+            previousBody, previousOther, previousApple = self.previous
+            move = previousBody[0].getDirection(opponent.body[0])
+            if move is None or len(opponent.body) < 2 or opponent.body[1] != previousBody[0]:
+                # a new game
+                self.reset()
+            else:
+                self.moves.append(move)
+                likelihoods = policies(previousBody, previousOther, mazeSize, previousApple)
+                self.weights = [weight ** self.decay * (self.floor + (1 - self.floor) * likelihood[move.index])
+                                for weight, likelihood in zip(self.weights, likelihoods)]
+                total = sum(self.weights)
+                self.weights = [weight / total for weight in self.weights]
+
+        self.previous = (list(opponent.body), list(snake.body), apple)
+
+    def probabilities(self, snake, opponent, mazeSize: Coordinate, apple: Coordinate) -> List[float]:
+        """
+        Probabilities of the next moves of the opponent in the order of directions
+        """
+        mixture = [0.0] * len(directions)
+        for weight, policy in zip(self.weights, policies(opponent.body, snake.body, mazeSize, apple)):
+            for i, p in enumerate(policy):
+                mixture[i] += weight * p
+        return mixture
+
+    def ordered_moves(self, snake, opponent, mazeSize: Coordinate, apple: Coordinate) -> List[Tuple[Direction, float]]:
+        """
+        (direction, probability) of moves of the opponent, the most likely first
+        """
+        moves = zip(directions, self.probabilities(snake, opponent, mazeSize, apple))
+        return sorted(moves, key=lambda move: -move[1])
+
+    def likely_replies(self, snake, opponent, mazeSize: Coordinate, apple: Coordinate, threshold=0.1) -> List[Coordinate]:
+        """
+        Next cells of the head of the opponent, the most likely first.
+        Moves less likely than threshold are left out, the most likely one is always kept
+        """
+        moves = self.ordered_moves(snake, opponent, mazeSize, apple)
+        head = opponent.body[0]
+        return [head.moveTo(d) for i, (d, p) in enumerate(moves) if not i or p >= threshold]
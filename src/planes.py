@@ -0,0 +1,53 @@
+"""
+Encoding of positions as fixed-size planes for learned evaluators.
+
+A position from the point of view of `snake` is a uint8 array
+[PLANES, width, height] indexed as occupation[x][y] of the bots:
+
+    own body      -- ticks the cell stays occupied: the tail is 1, the head is the length
+    opponent body -- the same for the opponent
+    apple         -- 1 in the cell of the apple
+    own head      -- 1 in the cell of the head
+    opponent head -- 1 in the cell of the head of the opponent
+
+Ages longer than 255 are cut to 255
+"""
+import numpy as np
+
+from .geometry import Coordinate
+
+PLANES = ('own body', 'opponent body', 'apple', 'own head', 'opponent head')
+OWN_BODY, OPPONENT_BODY, APPLE, OWN_HEAD, OPPONENT_HEAD = range(len(PLANES))
+
+
+def encode_cells(snake, opponent, mazeSize, apple, out=None) -> np.ndarray:
+    """
+    Planes of the position given as (x, y) tuples: bodies start with heads,
+    mazeSize is (width, height), apple may be None.
+    out is an array of the shape to fill instead of a new one
+    """
+    width, height = mazeSize
+    if out is None:
+        out = np.zeros((len(PLANES), width, height), dtype=np.uint8)
+    else:
+        out[:] = 0
+
+    for plane, headPlane, body in ((OWN_BODY, OWN_HEAD, snake), (OPPONENT_BODY, OPPONENT_HEAD, opponent)):
+        for age, (x, y) in enumerate(body[::-1], 1):
+            # heads of dead snakes can be out of the maze
+            if 0 <= x < width and 0 <= y < height:
+                out[plane, x, y] = min(age, 255)
+        if body and 0 <= body[0][0] < width and 0 <= body[0][1] < height:
+            out[headPlane, body[0][0], body[0][1]] = 1
+
+    if apple is not None:
+        out[APPLE, apple[0], apple[1]] = 1
+    return out
+
+
+def encode_position(snake, opponent, mazeSize: Coordinate, apple: Coordinate, out=None) -> np.ndarray:
+    """
+    Planes of the position for arguments of chooseDirection
+    """
+    return encode_cells([(cell.x, cell.y) for cell in snake.body], [(cell.x, cell.y) for cell in opponent.body],
+                        (mazeSize.x, mazeSize.y), (apple.x, apple.y) if apple is not None else None, out)
@@ -0,0 +1,314 @@
+import cProfile
+import marshal
+import os
+import pstats
+import sys
+import threading
+from collections import Counter, defaultdict
+
+
+def function_label(func) -> str:
+    filename, line, name = func
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def write_collapsed(path, stacks: Counter):
+    """
+    Write stacks in collapsed format: "root;child;leaf count" per line
+    """
+    with open(path, 'w') as file:
+        for stack, count in sorted(stacks.items()):
+            if count:
+                file.write(f"{';'.join(stack)} {count}\n")
+
+
+class BotProfiler:
+    """
+    Base class of profilers of chooseDirection.
+    Stats of every bot are merged across all games
+    """
+
+    def call(self, name: str, func, *args):
+        raise NotImplementedError()
+
+    def tick(self, func, *args, **kwargs):
+        """
+        Wrapper of one step of the game engine
+        """
+        return func(*args, **kwargs)
+
+    def dump(self, directory):
+        """
+        Write <bot>.pstats and <bot>.collapsed (for flame graphs) files
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Stop background work of the profiler
+        """
+
+
+class CProfileProfiler(BotProfiler):
+    """
+    Deterministic profiler based on cProfile
+    """
+
+    def __init__(self):
+        self.profiles = {}
+
+    def call(self, name, func, *args):
+        if name not in self.profiles:
+            self.profiles[name] = cProfile.Profile()
+        return self.profiles[name].runcall(func, *args)
+
+    def dump(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name, profile in self.profiles.items():
+            stats = pstats.Stats(profile)
+            stats.dump_stats(os.path.join(directory, f"{name}.pstats"))
+            write_collapsed(os.path.join(directory, f"{name}.collapsed"), self.collapse(stats.stats))
+
+    @staticmethod
+    def collapse(stats, maxDepth=64) -> Counter:
+        """
+        Rebuild stacks from caller-callee graph of cProfile.
+        Time of a function is split between its callees in proportion
+        to the time of every call edge. Values are in microseconds
+        """
+        callees = defaultdict(dict)
+        for func, (_, _, _, _, callers) in stats.items():
+            for caller, edge in callers.items():
+                callees[caller][func] = edge[3]
+
+        stacks = Counter()
+
+        def walk(func, stack, time):
+            stack = stack + (function_label(func),)
+            _, _, tt, ct, _ = stats[func]
+            scale = time / ct if ct else 0
+            stacks[stack] += int(tt * scale * 1e6)
+            if len(stack) >= maxDepth:
+                return
+            for callee, edgeTime in callees[func].items():
+                # skip recursion, its time is already counted in the caller
+                if function_label(callee) not in stack:
+                    walk(callee, stack, edgeTime * scale)
+
+        for func, (_, _, _, ct, callers) in stats.items():
+            if not callers:
+                walk(func, (), ct)
+
+        return stacks
+
+
+class SamplingProfiler(BotProfiler):
+    """
+    Low-overhead profiler that samples the stack of the thread
+    running chooseDirection every `interval` seconds
+    """
+
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = defaultdict(Counter)
+        # (thread id, bot name, frame of call), while chooseDirection is running
+        self.active = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def call(self, name, func, *args):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.sample, daemon=True)
+            self.thread.start()
+
+        self.active = (threading.get_ident(), name, sys._getframe())
+        try:
+            return func(*args)
+        finally:
+            self.active = None
+
+    def sample(self):
+        while not self.stopped.wait(self.interval):
+            active = self.active
+            if active is None:
+                continue
+
+            threadId, name, base = active
+            frame = sys._current_frames().get(threadId)
+            stack = []
+            while frame is not None and frame is not base:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+
+            # the thread has left chooseDirection in the meantime
+            if frame is None or not stack:
+                continue
+            self.samples[name][tuple(reversed(stack))] += 1
+
+    def close(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def dump(self, directory):
+        # samples are complete and not modified while they are written
+        self.close()
+        os.makedirs(directory, exist_ok=True)
+        for name, samples in list(self.samples.items()):
+            stacks = Counter({tuple(map(function_label, stack)): count for stack, count in samples.items()})
+            write_collapsed(os.path.join(directory, f"{name}.collapsed"), stacks)
+
+            with open(os.path.join(directory, f"{name}.pstats"), 'wb') as file:
+                marshal.dump(self.to_pstats(samples), file)
+
+    def to_pstats(self, samples: Counter) -> dict:
+        """
+        Convert samples to the format of pstats.Stats.
+        Call counts are counts of samples
+        """
+        stats = {}
+
+        def entry(func):
+            if func not in stats:
+                stats[func] = [0, 0, 0.0, 0.0, {}]
+            return stats[func]
+
+        for stack, count in samples.items():
+            seconds = count * self.interval
+            for func in set(stack):
+                current = entry(func)
+                current[0] += count
+                current[1] += count
+                current[3] += seconds
+            entry(stack[-1])[2] += seconds
+
+            for caller, callee in set(zip(stack, stack[1:])):
+                callers = entry(callee)[4]
+                edge = callers.get(caller, (0, 0, 0.0, 0.0))
+                callers[caller] = (edge[0] + count, edge[1] + count, edge[2], edge[3] + seconds)
+
+        return {func: tuple(value) for func, value in stats.items()}
+
+
+class MemoryProfiler(BotProfiler):
+    """
+    Tracks allocations with tracemalloc.
+
+    Peak and net allocated memory are measured for every move of a bot
+    and for every step of the engine (step without moves of bots).
+    Every `interval` ticks the memory is compared with the previous snapshot
+    by source line. A line is attributed to a bot if the bot's file
+    is in the traceback of the allocation, otherwise to the engine
+    """
+    ENGINE = 'engine'
+
+    def __init__(self, top=10, interval=25, frames=8):
+        import tracemalloc
+        self.tracemalloc = tracemalloc
+        self.top = top
+        self.interval = interval
+        # {section: {(filename, lineno): bytes}}
+        self.lines = defaultdict(Counter)
+        # {section: [net allocated bytes per move or tick]}
+        self.allocated = defaultdict(list)
+        self.peaks = defaultdict(int)
+        # {filename of bot: name of bot}
+        self.botFiles = {}
+        # allocations and peak of bots during the current tick
+        self.tickBots = 0
+        self.tickPeak = 0
+        self.tickStart = 0
+        self.ticks = 0
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        self.filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        self.lastSnapshot = self.snapshot()
+
+    def snapshot(self):
+        return self.tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def call(self, name, func, *args):
+        code = getattr(func, '__code__', None)
+        if code:
+            self.botFiles[code.co_filename] = name
+
+        # engine peak before the call
+        current, peak = self.tracemalloc.get_traced_memory()
+        self.tickPeak = max(self.tickPeak, peak - self.tickStart)
+
+        self.tracemalloc.reset_peak()
+        start = self.tracemalloc.get_traced_memory()[0]
+        try:
+            return func(*args)
+        finally:
+            current, peak = self.tracemalloc.get_traced_memory()
+            self.peaks[name] = max(self.peaks[name], peak - start)
+            self.allocated[name].append(current - start)
+            self.tickBots += current - start
+            self.tracemalloc.reset_peak()
+
+    def tick(self, func, *args, **kwargs):
+        self.tickBots = 0
+        self.tickPeak = 0
+        self.tracemalloc.reset_peak()
+        self.tickStart = start = self.tracemalloc.get_traced_memory()[0]
+        try:
+            return func(*args, **kwargs)
+        finally:
+            current, peak = self.tracemalloc.get_traced_memory()
+            self.tickPeak = max(self.tickPeak, peak - self.tickStart)
+            self.peaks[self.ENGINE] = max(self.peaks[self.ENGINE], self.tickPeak)
+            self.allocated[self.ENGINE].append(current - start - self.tickBots)
+
+            self.ticks += 1
+            if self.ticks % self.interval == 0:
+                self.collect_lines()
+
+    def section(self, traceback) -> str:
+        for frame in traceback:
+            if frame.filename in self.botFiles:
+                return self.botFiles[frame.filename]
+        return self.ENGINE
+
+    def collect_lines(self):
+        snapshot = self.snapshot()
+        for stat in snapshot.compare_to(self.lastSnapshot, 'traceback'):
+            # the last frame is the line which allocated memory
+            frame = stat.traceback[-1]
+            self.lines[self.section(stat.traceback)][(frame.filename, frame.lineno)] += stat.size_diff
+        self.lastSnapshot = snapshot
+
+    def summary(self) -> str:
+        self.collect_lines()
+        result = []
+        for section in sorted(self.allocated, key=lambda s: s == self.ENGINE):
+            allocated = self.allocated[section]
+            result.append(
+                f"{section}: peak {self.peaks[section] / 1024:.1f} KiB, "
+                f"net allocated {sum(allocated) / 1024:.1f} KiB in {len(allocated)} "
+                f"{'ticks' if section == self.ENGINE else 'moves'} "
+                f"(max {max(allocated, default=0) / 1024:.1f} KiB)")
+
+            top = [item for item in self.lines[section].most_common(self.top) if item[1] > 0]
+            for (filename, lineno), size in top:
+                result.append(f"    {size / 1024:10.1f} KiB  {filename}:{lineno}")
+        return '\n'.join(result)
+
+    def dump(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        summary = self.summary()
+        with open(os.path.join(directory, 'memory.txt'), 'w') as file:
+            file.write(summary + '\n')
+        print(summary)
+
+
+PROFILERS = {
+    'cprofile': CProfileProfiler,
+    'sampling': SamplingProfiler,
+    'memory': MemoryProfiler,
+}
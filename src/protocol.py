@@ -0,0 +1,171 @@
+"""
+Compact binary protocol between the checker and bot executors.
+
+The full state is sent once per game, then every tick only the delta:
+new heads, number of cells removed from the tails and the apple.
+
+    FULL:  kind, maze width, maze height, apple x, apple y,
+           snake length (u16), snake cells, opponent length (u16), opponent cells
+    DELTA: kind, apple x, apple y,
+           snake head x, snake head y, snake tail pops,
+           opponent head x, opponent head y, opponent tail pops
+
+Cells are pairs of bytes (x, y), so the maze can not be larger than 255x255.
+A missing apple (the maze is full) is sent as (255, 255), which is never a cell.
+Frames of many games are packed into one batch: game id (u32), side (u8), length (u16), payload
+"""
+import struct
+from collections import deque
+from typing import List, Tuple
+
+from .geometry import Coordinate, Direction, directions, is_direction
+from .snake import Snake
+
+FULL = 0
+DELTA = 1
+
+# coordinate of the apple when there is no apple
+NO_APPLE = 255
+
+REPLY_DIRECTION = 0
+REPLY_ERROR = 1
+
+FULL_HEADER = struct.Struct('<BBBBB')
+LENGTH = struct.Struct('<H')
+DELTA_MESSAGE = struct.Struct('<BBBBBBBBB')
+FRAME_HEADER = struct.Struct('<IBH')
+
+
+def pack_cells(cells) -> bytes:
+    return LENGTH.pack(len(cells)) + bytes(c for cell in cells for c in (cell.x, cell.y))
+
+
+def unpack_cells(data: bytes, offset: int) -> Tuple[List[Coordinate], int]:
+    length, = LENGTH.unpack_from(data, offset)
+    offset += LENGTH.size
+    cells = [Coordinate(data[i], data[i + 1]) for i in range(offset, offset + 2 * length, 2)]
+    return cells, offset + 2 * length
+
+
+class StateEncoder:
+    """
+    Checker side. Remembers the last sent state of one bot
+    """
+
+    def __init__(self):
+        # (snake body, opponent body) which were sent last time
+        self.sent = None
+
+    @staticmethod
+    def delta(old: List[Coordinate], new: List[Coordinate]) -> int:
+        """
+        Return number of tail cells removed between two states
+        or -1 if the new body is not the old body moved by one cell
+        """
+        pops = len(old) + 1 - len(new)
+        if not 0 <= pops < 256 or len(new) < 2:
+            return -1
+        # the body between the new head and the new tail is the same
+        if new[1] != old[0] or new[-1] != old[len(new) - 2]:
+            return -1
+        return pops
+
+    def encode(self, snake: Snake, opponent: Snake, mazeSize: Coordinate, apple: Coordinate) -> bytes:
+        if self.sent:
+            snakePops = self.delta(self.sent[0], snake.body)
+            opponentPops = self.delta(self.sent[1], opponent.body)
+        else:
+            snakePops = opponentPops = -1
+        self.sent = (snake.body.copy(), opponent.body.copy())
+        appleX, appleY = (apple.x, apple.y) if apple is not None else (NO_APPLE, NO_APPLE)
+
+        if snakePops < 0 or opponentPops < 0:
+            return FULL_HEADER.pack(FULL, mazeSize.x, mazeSize.y, appleX, appleY) \
+                + pack_cells(snake.body) + pack_cells(opponent.body)
+
+        return DELTA_MESSAGE.pack(
+            DELTA, appleX, appleY,
+            snake.head.x, snake.head.y, snakePops,
+            opponent.head.x, opponent.head.y, opponentPops)
+
+
+class StateDecoder:
+    """
+    Executor side. Restores the state of one bot from messages
+    """
+
+    def __init__(self):
+        self.mazeSize = None
+        self.apple = None
+        self.snake = None
+        self.opponent = None
+
+    def decode(self, data: bytes) -> tuple:
+        """
+        Apply message and return (snake, opponent, mazeSize, apple) for chooseDirection
+        """
+        if data[0] == FULL:
+            _, width, height, appleX, appleY = FULL_HEADER.unpack_from(data)
+            self.mazeSize = Coordinate(width, height)
+            snake, offset = unpack_cells(data, FULL_HEADER.size)
+            opponent, _ = unpack_cells(data, offset)
+            self.snake, self.opponent = deque(snake), deque(opponent)
+
+        elif data[0] == DELTA:
+            if self.snake is None:
+                raise ValueError("Delta message before the full state")
+            _, appleX, appleY, headX, headY, pops, opponentX, opponentY, opponentPops \
+                = DELTA_MESSAGE.unpack(data)
+            for body, x, y, n in ((self.snake, headX, headY, pops),
+                                  (self.opponent, opponentX, opponentY, opponentPops)):
+                body.appendleft(Coordinate(x, y))
+                for _ in range(n):
+                    body.pop()
+        else:
+            raise ValueError(f"Unknown message kind {data[0]}")
+
+        self.apple = Coordinate(appleX, appleY) if appleX != NO_APPLE else None
+
+        # new objects every tick, so the bot can not spoil the state
+        snakeBody, opponentBody = list(self.snake), list(self.opponent)
+        return (
+            Snake(self.mazeSize, set(snakeBody), snakeBody),
+            Snake(self.mazeSize, set(opponentBody), opponentBody),
+            self.mazeSize.clone(), self.apple.clone() if self.apple is not None else None,
+        )
+
+
+def encode_reply(direction: Direction = None, error: str = None) -> bytes:
+    if error is None:
+        if is_direction(direction):
+            return bytes((REPLY_DIRECTION, direction.index))
+        error = f"Invalid direction: {direction}"
+    return bytes((REPLY_ERROR,)) + error.encode()
+
+
+def decode_reply(data: bytes) -> Tuple[str, Direction]:
+    """
+    Return (error, direction) as executors do
+    """
+    if data[0] == REPLY_DIRECTION:
+        return None, directions[data[1]]
+    return data[1:].decode(), None
+
+
+def encode_batch(frames: List[Tuple[int, int, bytes]]) -> bytes:
+    """
+    Pack frames (game id, side, payload) into one message
+    """
+    return b''.join(FRAME_HEADER.pack(gameId, side, len(payload)) + payload
+                    for gameId, side, payload in frames)
+
+
+def decode_batch(data: bytes) -> List[Tuple[int, int, bytes]]:
+    frames = []
+    offset = 0
+    while offset < len(data):
+        gameId, side, length = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+        frames.append((gameId, side, data[offset:offset + length]))
+        offset += length
+    return frames
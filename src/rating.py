@@ -0,0 +1,77 @@
+import math
+import random
+from typing import Dict, List, Tuple
+
+ELO_SCALE = 400 / math.log(10)
+ELO_BASE = 1500
+
+# (player, opponent, score of player: 1 for a win, 0.5 for a draw, 0 for a loss)
+Result = Tuple[str, str, float]
+
+
+def bradley_terry(results: List[Result], players: List[str], iterations=200, tolerance=1e-9) -> Dict[str, float]:
+    """
+    Fit Bradley-Terry strengths with minorization-maximization.
+    A draw counts as a half of a win for both players.
+
+    Every player also gets one virtual draw against a player of strength 1,
+    so strengths stay finite for bots that won or lost all their games
+    """
+    wins = {p: 0.5 for p in players}
+    games = {p: {} for p in players}
+    for a, b, score in results:
+        wins[a] += score
+        wins[b] += 1 - score
+        games[a][b] = games[a].get(b, 0) + 1
+        games[b][a] = games[b].get(a, 0) + 1
+
+    strength = {p: 1.0 for p in players}
+    for _ in range(iterations):
+        updated = {}
+        for p in players:
+            denominator = 1 / (strength[p] + 1)
+            for q, n in games[p].items():
+                denominator += n / (strength[p] + strength[q])
+            updated[p] = wins[p] / denominator
+
+        # normalize by geometric mean
+        logMean = sum(math.log(s) for s in updated.values()) / len(players)
+        updated = {p: s / math.exp(logMean) for p, s in updated.items()}
+
+        change = max(abs(updated[p] - strength[p]) for p in players)
+        strength = updated
+        if change < tolerance:
+            break
+
+    return strength
+
+
+def elo_ratings(results: List[Result], players: List[str], bootstrap=200, confidence=0.95, seed=0) -> Dict[str, tuple]:
+    """
+    Return {player: (elo, lower bound, upper bound)}.
+    Confidence intervals are computed with bootstrap over games
+    """
+    def to_elo(strength):
+        return {p: ELO_BASE + ELO_SCALE * math.log(s) for p, s in strength.items()}
+
+    ratings = to_elo(bradley_terry(results, players))
+
+    rng = random.Random(seed)
+    samples = {p: [] for p in players}
+    for _ in range(bootstrap if results else 0):
+        resampled = [rng.choice(results) for _ in results]
+        for p, elo in to_elo(bradley_terry(resampled, players, iterations=50)).items():
+            samples[p].append(elo)
+
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for p in players:
+        values = sorted(samples[p])
+        if values:
+            low = values[int(alpha * (len(values) - 1))]
+            high = values[int((1 - alpha) * (len(values) - 1))]
+        else:
+            low = high = ratings[p]
+        intervals[p] = (ratings[p], low, high)
+
+    return intervals
@@ -0,0 +1,133 @@
+"""
+Terminal renderer of games.
+
+The first frame is drawn in full, the next ones only redraw cells which
+changed since the previous drawn frame, with ANSI cursor moves. Frames are
+kept as {(x, y): char} of non-empty cells, so a frame costs O(length of snakes)
+and not O(area of the maze). With `every` = k only every k-th tick is drawn.
+
+If the stream is not a terminal, every drawn frame is written in full as plain text
+"""
+import sys
+from typing import Dict, List, Sequence, Tuple
+
+from .geometry import Coordinate
+
+EMPTY = '.'
+APPLE = 'X'
+COLLISION = '!'
+# (body, head) of snakes in two-snake games, as in Game.__str__
+TWO_SNAKES = (('b', 'h'), ('B', 'H'))
+
+Cell = Tuple[int, int]
+
+
+def frame_cells(bodies: Sequence[Sequence[Cell]], apple: Cell = None) -> Dict[Cell, str]:
+    """
+    Non-empty cells of a frame. Bodies start with heads.
+    Two snakes are drawn as in Game.__str__, more snakes as a, b, c... with capital heads
+    """
+    cells = {}
+    heads = {}
+    for i, body in enumerate(bodies):
+        bodyChar, headChar = TWO_SNAKES[i] if len(bodies) == 2 else (chr(ord('a') + i % 26), chr(ord('A') + i % 26))
+        for cell in body:
+            cells[cell] = bodyChar
+        if body:
+            heads[body[0]] = COLLISION if body[0] in heads else headChar
+    if apple:
+        cells[apple] = APPLE
+    cells.update(heads)
+    return cells
+
+
+def snakes_cells(snakes, apple: Coordinate = None) -> Dict[Cell, str]:
+    """
+    Frame of src.snake.Snake objects
+    """
+    return frame_cells([[(cell.x, cell.y) for cell in snake.body] for snake in snakes],
+                       (apple.x, apple.y) if apple else None)
+
+
+def parse_cell(string: str) -> Cell:
+    x, y = string.split()
+    return int(x), int(y)
+
+
+def state_cells(state: dict) -> Dict[Cell, str]:
+    """
+    Frame of a state recorded by GameIter (see Game.get_state)
+    """
+    bodies = [list(map(parse_cell, state['snake1'])), list(map(parse_cell, state['snake2']))]
+    apple = parse_cell(state['apple']) if state['apple'] != 'None' else None
+    return frame_cells(bodies, apple)
+
+
+class TerminalRenderer:
+    def __init__(self, mazeSize: Coordinate, stream=None, every: int = 1, ansi: bool = None):
+        self.width, self.height = mazeSize.x, mazeSize.y
+        self.stream = stream or sys.stdout
+        self.every = max(1, every)
+        self.ansi = self.stream.isatty() if ansi is None else ansi
+        self.tick = -1
+        # the last drawn frame, None before the first one
+        self.cells = None
+
+    def position(self, cell: Cell) -> str:
+        """
+        Cursor move to the cell. The status line is the first row, y grows upwards
+        """
+        return f'\x1b[{self.height - cell[1] + 1};{cell[0] + 1}H'
+
+    def full_frame(self, cells: Dict[Cell, str]) -> List[str]:
+        return [''.join(cells.get((x, y), EMPTY) for x in range(self.width))
+                for y in range(self.height - 1, -1, -1)]
+
+    def draw(self, cells: Dict[Cell, str], status: str = '', force: bool = False) -> bool:
+        """
+        Draw the frame if it is the k-th tick or force is set. Return True if it was drawn
+        """
+        self.tick += 1
+        if not force and self.tick % self.every:
+            return False
+        # heads of dead snakes can be out of the maze
+        cells = {cell: char for cell, char in cells.items()
+                 if 0 <= cell[0] < self.width and 0 <= cell[1] < self.height}
+
+        if not self.ansi:
+            self.stream.write(status + '\n' + '\n'.join(self.full_frame(cells)) + '\n\n')
+        elif self.cells is None:
+            # clear the screen and hide the cursor
+            self.stream.write('\x1b[2J\x1b[H\x1b[?25l' + status + '\x1b[K\n' + '\n'.join(self.full_frame(cells)))
+        else:
+            self.stream.write(self.diff(cells) + '\x1b[1;1H' + status + '\x1b[K')
+        self.stream.flush()
+        self.cells = cells
+        return True
+
+    def diff(self, cells: Dict[Cell, str]) -> str:
+        """
+        ANSI commands to turn the last drawn frame into the given one.
+        The cursor is moved only if the next changed cell is not the next one in the row
+        """
+        previous = self.cells
+        changed = [cell for cell, char in cells.items() if previous.get(cell) != char]
+        changed += [cell for cell in previous if cell not in cells]
+        changed.sort(key=lambda cell: (-cell[1], cell[0]))
+
+        parts = []
+        cursor = None
+        for cell in changed:
+            if cell != cursor:
+                parts.append(self.position(cell))
+            parts.append(cells.get(cell, EMPTY))
+            cursor = (cell[0] + 1, cell[1])
+        return ''.join(parts)
+
+    def close(self):
+        """
+        Move the cursor below the maze and show it
+        """
+        if self.ansi and self.cells is not None:
+            self.stream.write(f'\x1b[{self.height + 2};1H\x1b[?25h')
+            self.stream.flush()
@@ -0,0 +1,194 @@
+"""
+Columnar storage of results of many games and vectorized statistics over them.
+
+Every column is a numpy array with one value per game. Descriptions of
+endings are stored as codes, the strings are kept once in `descriptions`.
+A table is saved as a directory with one .npy file per column and
+meta.json, so columns of a large file are memory-mapped on load
+"""
+import csv
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+COLUMNS = {
+    'result1': np.int8,
+    'result2': np.int8,
+    'score1': np.int16,
+    'score2': np.int16,
+    'iterations': np.int16,
+    'description': np.int32,
+}
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def wilson_interval(successes, n, z=1.96):
+    """
+    Wilson score interval of a binomial proportion.
+    Works with scalars and arrays, empty samples get (0, 1)
+    """
+    successes = np.asarray(successes, dtype=float)
+    n = np.asarray(n, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        p = successes / n
+        denominator = 1 + z * z / n
+        center = (p + z * z / (2 * n)) / denominator
+        margin = z * np.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    low = np.where(n > 0, np.clip(center - margin, 0, 1), 0.0)
+    high = np.where(n > 0, np.clip(center + margin, 0, 1), 1.0)
+    return low, high
+
+
+class ResultTable:
+    def __init__(self, names=('bot1', 'bot2'), capacity=1024):
+        """
+        names -- names of the first and the second bot
+        """
+        self.names = list(names)
+        self.size = 0
+        self.descriptions: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.data = {name: np.zeros(capacity, dtype) for name, dtype in COLUMNS.items()}
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, column) -> np.ndarray:
+        return self.data[column][:self.size]
+
+    def code(self, description: str) -> int:
+        if description not in self.codes:
+            self.codes[description] = len(self.descriptions)
+            self.descriptions.append(description)
+        return self.codes[description]
+
+    def append(self, metadata: dict):
+        """
+        Add the game by metadata of GameIter
+        """
+        if self.size == len(self.data['result1']):
+            for name, column in self.data.items():
+                self.data[name] = np.concatenate([column, np.zeros_like(column)])
+
+        row = self.size
+        self.data['result1'][row], self.data['result2'][row] = metadata['result']
+        self.data['score1'][row], self.data['score2'][row] = metadata['score']
+        self.data['iterations'][row] = metadata.get('iterations', -1)
+        self.data['description'][row] = self.code(metadata['description'])
+        self.size += 1
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(directory, f'{name}.npy'), self[name])
+        with open(os.path.join(directory, 'meta.json'), 'w') as file:
+            json.dump({'names': self.names, 'descriptions': self.descriptions}, file)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, 'meta.json')) as file:
+            meta = json.load(file)
+        table = cls(meta['names'], capacity=0)
+        table.descriptions = meta['descriptions']
+        table.codes = {description: i for i, description in enumerate(table.descriptions)}
+        for name in COLUMNS:
+            table.data[name] = np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r' if mmap else None)
+        table.size = len(table.data['result1'])
+        return table
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(list(COLUMNS))
+            descriptions = np.array(self.descriptions, dtype=object)
+            columns = [self[name].tolist() for name in COLUMNS if name != 'description']
+            columns.append(descriptions[self['description']].tolist() if self.size else [])
+            writer.writerows(zip(*columns))
+
+    def summary(self, lengthBin=25) -> dict:
+        """
+        Win, draw and loss counts with Wilson intervals, score distributions,
+        histogram of game lengths and results split by description
+        """
+        n = self.size
+        wins1 = np.asarray(self['result1'] == 1)
+        wins2 = np.asarray(self['result2'] == 1)
+        draws = ~(wins1 | wins2)
+        counts = np.array([wins1.sum(), draws.sum(), wins2.sum()])
+        low, high = wilson_interval(counts, n)
+
+        score1 = np.asarray(self['score1'], dtype=np.int32)
+        score2 = np.asarray(self['score2'], dtype=np.int32)
+        names = self.names if self.names[0] != self.names[1] else [f'{name} ({i})' for i, name in enumerate(self.names, 1)]
+        scores = {}
+        for name, values in ((names[0], score1), (names[1], score2), ('difference', score1 - score2)):
+            scores[name] = {
+                'mean': float(values.mean()) if n else 0.0,
+                'std': float(values.std()) if n else 0.0,
+                'quantiles': dict(zip(QUANTILES, np.quantile(values, QUANTILES).tolist())) if n else {},
+            }
+
+        iterations = np.asarray(self['iterations'])
+        # -1 are games without a known length, they are counted apart
+        unknown = int((iterations < 0).sum())
+        iterations = iterations[iterations >= 0]
+        edges = np.arange(0, (iterations.max(initial=0) // lengthBin + 2) * lengthBin, lengthBin)
+        lengthCounts, _ = np.histogram(iterations, edges)
+
+        codes = np.asarray(self['description'])
+        k = len(self.descriptions)
+        byDescription = np.stack([
+            np.bincount(codes, weights=wins1, minlength=k),
+            np.bincount(codes, weights=draws, minlength=k),
+            np.bincount(codes, weights=wins2, minlength=k),
+        ], axis=1).astype(int)
+
+        return {
+            'games': n,
+            'names': self.names,
+            # wins of the first bot, draws, wins of the second bot
+            'results': counts.tolist(),
+            'intervals': list(zip(low.tolist(), high.tolist())),
+            'decisive': {
+                'winRate': float(counts[0] / max(counts[0] + counts[2], 1)),
+                'interval': tuple(float(v) for v in wilson_interval(counts[0], counts[0] + counts[2])),
+            },
+            'scores': scores,
+            'lengths': {'edges': edges.tolist(), 'counts': lengthCounts.tolist(), 'unknown': unknown},
+            'descriptions': sorted(
+                ((self.descriptions[i], *byDescription[i].tolist()) for i in range(k) if byDescription[i].any()),
+                key=lambda item: -sum(item[1:])),
+        }
+
+
+def format_summary(summary: dict) -> str:
+    n = max(summary['games'], 1)
+    name1, name2 = summary['names']
+    lines = [f"Total games: {summary['games']}"]
+    for label, count, (low, high) in zip((f'{name1} wins', 'draws', f'{name2} wins'),
+                                         summary['results'], summary['intervals']):
+        lines.append(f'{label:<28} {count:>8} {count / n:7.1%}  [{low:.1%}, {high:.1%}]')
+    decisive = summary['decisive']
+    lines.append('{} win rate in decisive games: {:.1%} [{:.1%}, {:.1%}]'.format(
+        name1, decisive['winRate'], *decisive['interval']))
+
+    lines.append('{:<22}{:>7}{:>7}'.format('Scores:', 'mean', 'std') + ''.join(f'{f"p{q * 100:.0f}":>7}' for q in QUANTILES))
+    for name, score in summary['scores'].items():
+        quantiles = ''.join(f'{value:7.1f}' for value in score['quantiles'].values())
+        lines.append(f"{name[:22]:<22}{score['mean']:7.1f}{score['std']:7.1f}{quantiles}")
+
+    lines.append('Game length:')
+    lengths = summary['lengths']
+    largest = max(lengths['counts'], default=0) or 1
+    for start, end, count in zip(lengths['edges'], lengths['edges'][1:], lengths['counts']):
+        if count:
+            lines.append(f'{start:>5}-{end - 1:<5} {count:>8} {"#" * round(40 * count / largest)}')
+    if lengths.get('unknown'):
+        lines.append(f'{"unknown":<11} {lengths["unknown"]:>8}')
+
+    lines.append(f'By description (+{name1} =draw -{name2}):')
+    for description, wins1, draws, wins2 in summary['descriptions']:
+        lines.append(f'{wins1 + draws + wins2:>8}: {description} (+{wins1} ={draws} -{wins2})')
+    return '\n'.join(lines)
@@ -0,0 +1,219 @@
+"""
+Self-play datasets for learned evaluators.
+
+Seeded games between bots are played in worker processes. Every tick gives
+two positions, one from the point of view of each snake, encoded as planes
+(see src.planes) with labels: the move played (index in src.geometry.directions,
+-1 if no move was made: the bot failed or the game hit the limit of iterations)
+and the outcome of the game for the snake (1 win, 0 draw, -1 loss).
+
+A dataset is a directory of shards and index.json. A shard is one .npy file
+per column, named shard-<number>.<column>.npy, so columns are memory-mapped
+on load and training streams positions without reading the whole dataset.
+The index is rewritten after every shard, an interrupted run keeps finished shards
+"""
+import json
+import multiprocessing
+import os
+import random
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+from .botPool import make_bot, warm_up
+from .game import Game
+from .planes import PLANES, encode_position
+
+VERSION = 1
+INDEX = 'index.json'
+
+# columns besides planes: dtype of labels and metadata of positions
+LABELS = {
+    'moves': np.int8,
+    'outcomes': np.int8,
+    'ticks': np.int16,
+    'games': np.int32,
+}
+
+
+def play_game(task) -> Dict[str, np.ndarray]:
+    """
+    Play one game in a worker and return columns of its positions.
+    task is (seed, bot1, bot2, board), bots are specs of make_bot,
+    board is a dict of arguments of Game.default_game
+    """
+    seed, bot1, bot2, board = task
+    # bots are made before seeding: the first import of a bot module may use random
+    bots = make_bot(bot1), make_bot(bot2)
+    random.seed(seed)
+    game = Game.default_game(bots=bots, **board)
+    runners = (game.bot1_runner, game.bot2_runner)
+
+    planes, moves, ticks = [], [], []
+    gameIter = game.__iter__()
+    while not gameIter.stop:
+        sides = ((game.snake1, game.snake2), (game.snake2, game.snake1))
+        for snake, opponent in sides:
+            planes.append(encode_position(snake, opponent, game.mazeSize, game.appleCoordinate))
+        for runner in runners:
+            runner.lastMove = None
+        tick = game.iterationNumber
+        next(gameIter)
+        # lastMove is set only if the bot made a decision in time
+        moves += [runner.lastMove.index if runner.lastMove is not None else -1 for runner in runners]
+        ticks += [tick, tick]
+
+    result1, result2 = game.result
+    n = len(planes)
+    return {
+        'planes': np.stack(planes) if planes else np.zeros((0, len(PLANES), game.mazeSize.x, game.mazeSize.y), np.uint8),
+        'moves': np.array(moves, dtype=LABELS['moves']),
+        # positions alternate between the first and the second snake
+        'outcomes': np.tile(np.array([result1 - result2, result2 - result1], dtype=LABELS['outcomes']), n // 2),
+        'ticks': np.array(ticks, dtype=LABELS['ticks']),
+        'games': np.full(n, seed, dtype=LABELS['games']),
+    }
+
+
+class DatasetWriter:
+    """
+    Buffers positions and writes them in shards of `shardSize` positions.
+    New shards are added to an existing dataset of the same maze
+    """
+
+    def __init__(self, path, mazeSize, shardSize=32768):
+        self.path = path
+        self.shardSize = shardSize
+        self.shape = (len(PLANES), mazeSize[0], mazeSize[1])
+        os.makedirs(path, exist_ok=True)
+
+        indexPath = os.path.join(path, INDEX)
+        if os.path.exists(indexPath):
+            with open(indexPath) as file:
+                self.index = json.load(file)
+            if tuple(self.index['mazeSize']) != tuple(mazeSize) or self.index['version'] != VERSION:
+                raise ValueError(f"{path} is a dataset of {self.index['mazeSize']} maze")
+        else:
+            self.index = {'version': VERSION, 'mazeSize': list(mazeSize), 'planes': list(PLANES),
+                          'positions': 0, 'shards': []}
+
+        self.buffer = {'planes': np.zeros((shardSize,) + self.shape, np.uint8)}
+        self.buffer.update((name, np.zeros(shardSize, dtype)) for name, dtype in LABELS.items())
+        self.size = 0
+
+    def write(self, columns: Dict[str, np.ndarray]):
+        """
+        Add positions of play_game
+        """
+        n = len(columns['moves'])
+        done = 0
+        while done < n:
+            count = min(n - done, self.shardSize - self.size)
+            for name, column in self.buffer.items():
+                column[self.size:self.size + count] = columns[name][done:done + count]
+            self.size += count
+            done += count
+            if self.size == self.shardSize:
+                self.flush()
+
+    def flush(self):
+        """
+        Write buffered positions as a new shard and update the index
+        """
+        if not self.size:
+            return
+        name = f"shard-{len(self.index['shards']):05d}"
+        for column, data in self.buffer.items():
+            np.save(os.path.join(self.path, f'{name}.{column}.npy'), data[:self.size])
+        self.index['shards'].append({'name': name, 'positions': self.size})
+        self.index['positions'] += self.size
+        self.size = 0
+
+        temporary = os.path.join(self.path, INDEX + '.tmp')
+        with open(temporary, 'w') as file:
+            json.dump(self.index, file, indent=2)
+        os.replace(temporary, os.path.join(self.path, INDEX))
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def generate(path, pairs: List[tuple], games: int, processes=None, seed=0, board=None, shardSize=32768,
+             progress=None) -> int:
+    """
+    Play `games` games with seeds seed, seed + 1, ... Pairs of bots take turns.
+    progress is called with (done, total) after every game.
+    Return number of written positions
+    """
+    board = board or {}
+    mazeSize, _, _ = Game.default_board(**board)
+    tasks = [(seed + i, *pairs[i % len(pairs)], board) for i in range(games)]
+    paths = sorted({bot if isinstance(bot, str) else bot[0] for pair in pairs for bot in pair})
+
+    positions = 0
+    with DatasetWriter(path, (mazeSize.x, mazeSize.y), shardSize) as writer, \
+            multiprocessing.Pool(processes, initializer=warm_up, initargs=(paths, False)) as pool:
+        # ordered, so the dataset does not depend on the number of processes
+        for i, columns in enumerate(pool.imap(play_game, tasks), 1):
+            writer.write(columns)
+            positions += len(columns['moves'])
+            if progress:
+                progress(i, games)
+    return positions
+
+
+class SelfPlayDataset:
+    """
+    Memory-mapped dataset written by DatasetWriter
+    """
+
+    def __init__(self, path):
+        with open(os.path.join(path, INDEX)) as file:
+            self.index = json.load(file)
+        if self.index['version'] != VERSION:
+            raise ValueError(f"{path} has unknown version {self.index['version']}")
+
+        self.shards = [
+            {column: np.load(os.path.join(path, f"{shard['name']}.{column}.npy"), mmap_mode='r')
+             for column in ('planes', *LABELS)}
+            for shard in self.index['shards']
+        ]
+        self.offsets = np.cumsum([0] + [shard['positions'] for shard in self.index['shards']])
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    @property
+    def mazeSize(self):
+        return tuple(self.index['mazeSize'])
+
+    def __getitem__(self, i) -> Dict[str, np.ndarray]:
+        """
+        Columns of the position number i
+        """
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        shard = int(np.searchsorted(self.offsets, i, side='right')) - 1
+        row = i - self.offsets[shard]
+        return {column: data[row] for column, data in self.shards[shard].items()}
+
+    def batches(self, size: int, shuffle=True, seed=0) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Yield dicts of columns of `size` positions. Only one shard is read at a time:
+        with shuffle the order of shards and positions in every shard is random
+        """
+        generator = np.random.default_rng(seed)
+        order = generator.permutation(len(self.shards)) if shuffle else range(len(self.shards))
+        for shard in order:
+            columns = self.shards[shard]
+            n = len(columns['moves'])
+            rows = generator.permutation(n) if shuffle else np.arange(n)
+            for start in range(0, n, size):
+                batch = np.sort(rows[start:start + size]) if shuffle else rows[start:start + size]
+                yield {column: np.asarray(data[batch]) for column, data in columns.items()}
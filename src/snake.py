@@ -3,6 +3,7 @@ from typing import List, Set
 
 from .bot import IBot
 from .geometry import DOWN, LEFT, RIGHT, UP, Coordinate, Direction
+from .stats import LatencyHistogram
 
 
 class Snake:
@@ -89,29 +90,50 @@ class SnakeRunner:
         self.mazeSize = mazeSize
         self.apple = apple
         self.lastMove: Direction = None
+        # decision time of the bot in nanoseconds
+        self.latency = LatencyHistogram()
+        self.firstLatency = None
+        # src.profiling.BotProfiler for chooseDirection of local bot
+        self.profiler = None
     
+    def add_latency(self, elapsed: int):
+        if self.firstLatency is None:
+            self.firstLatency = elapsed
+        self.latency.add(elapsed)
+
     def run(self, timeout=1, requestTimeout=2) -> Direction:
         """
         Execute chooseDirection function of bot
         and check if there was timeout 
         """
-        # clone data, to prevent cheating (modifying objects)
-        data = (
-            self.snake.clone(), self.opponent.clone(), 
-            self.mazeSize.clone(), self.apple.clone(),
-            )
+        if self.mode == 'checker' and getattr(self.executor, 'serializes', False):
+            # executor sends only serialized state, bot can not modify these objects
+            data = (self.snake, self.opponent, self.mazeSize, self.apple)
+        else:
+            # clone data, to prevent cheating (modifying objects)
+            data = (
+                self.snake.clone(), self.opponent.clone(), 
+                self.mazeSize.clone(), self.apple.clone(),
+                )
         if self.mode == 'local':
-            startTime = time.time()
-            result = self.bot.chooseDirection(*data)
+            startTime = time.perf_counter_ns()
+            if self.profiler:
+                result = self.profiler.call(self.name, self.bot.chooseDirection, *data)
+            else:
+                result = self.bot.chooseDirection(*data)
+            elapsed = time.perf_counter_ns() - startTime
+            self.add_latency(elapsed)
     
-            if time.time() - startTime > timeout:
+            if elapsed > timeout * 1e9:
                 raise TimeoutError
     
         elif self.mode == 'checker':
             if not self.executor.running:
                 raise Exception(f"Container is not running. Status: ({self.executor.status})")
             
+            startTime = time.perf_counter_ns()
             error, result = self.executor.send(_data=data, timeout=requestTimeout)
+            self.add_latency(time.perf_counter_ns() - startTime)
             if error:
                 if 'timeout' in error:
                     raise TimeoutError
@@ -0,0 +1,95 @@
+import math
+
+
+def binom_tail(k: int, n: int, p: float = 0.5) -> float:
+    """
+    Exact probability P(X >= k) for X ~ Binomial(n, p).
+    The same as scipy.stats.binom_test(k, n, p, alternative='greater')
+    """
+    if k <= 0:
+        return 1.0
+    if k > n:
+        return 0.0
+    if p <= 0 or p >= 1:
+        return float(p >= 1)
+
+    # sum terms in log space starting from the largest one to avoid underflow
+    logP, logQ = math.log(p), math.log(1 - p)
+
+    def log_term(i):
+        return (math.lgamma(n + 1) - math.lgamma(i + 1) - math.lgamma(n - i + 1)
+                + i * logP + (n - i) * logQ)
+
+    logTerms = [log_term(i) for i in range(k, n + 1)]
+    largest = max(logTerms)
+    total = sum(math.exp(t - largest) for t in logTerms)
+    return min(1.0, math.exp(largest) * total)
+
+
+class LatencyHistogram:
+    """
+    Compact log-linear histogram of latencies in nanoseconds.
+    Every power of two is split into 2**(SUB_BITS - 1) buckets,
+    so the relative error of quantiles is below 1 / 2**(SUB_BITS - 1)
+    """
+    SUB_BITS = 4
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def bucket(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.SUB_BITS)
+        return (shift << self.SUB_BITS) | (value >> shift)
+
+    def bucket_upper_bound(self, bucket: int) -> int:
+        shift = bucket >> self.SUB_BITS
+        mantissa = bucket & ((1 << self.SUB_BITS) - 1)
+        return ((mantissa + 1) << shift) - 1
+
+    def add(self, value: int):
+        bucket = self.bucket(value)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> int:
+        """
+        Return upper bound of the bucket that contains given quantile
+        """
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.bucket_upper_bound(bucket), self.max)
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'buckets': {str(bucket): count for bucket, count in self.buckets.items()},
+        }
+
+    @staticmethod
+    def from_dict(data: dict):
+        histogram = LatencyHistogram()
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.max = data['max']
+        histogram.buckets = {int(bucket): count for bucket, count in data['buckets'].items()}
+        return histogram
@@ -0,0 +1,145 @@
+"""
+Tablebase of small pockets.
+
+For every set of free cells in a 4x4 window (a 16-bit mask) and every
+start cell the table keeps the number of cells of the longest simple
+path from the start cell. The table is solved backwards, from small
+masks to large ones: the longest path from a cell is one plus the
+longest path from a neighbor in the mask without the cell.
+
+The file is 2**16 * 16 bytes after the header and is memory-mapped,
+so a probe is one byte read. Bots probe it when the snake is in a pocket
+which fits in the window: if the cells reachable from a move fit in it,
+pathExists is answered exactly (see Tablebase.probe)
+"""
+import mmap
+import struct
+from typing import List, Union
+
+from .geometry import Coordinate
+
+MAGIC = b'SNKT'
+VERSION = 1
+HEADER = struct.Struct('<4sHB')
+WINDOW = 4
+CELLS = WINDOW * WINDOW
+
+
+def window_neighbors() -> List[List[int]]:
+    """
+    Neighbors of window cells, cell index is x * WINDOW + y
+    """
+    return [
+        [(x + dx) * WINDOW + y + dy
+         for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0))
+         if 0 <= x + dx < WINDOW and 0 <= y + dy < WINDOW]
+        for x in range(WINDOW) for y in range(WINDOW)
+    ]
+
+
+def solve():
+    """
+    Return numpy array [mask, start] of lengths of the longest paths
+    """
+    import numpy as np
+
+    masks = np.arange(1 << CELLS, dtype=np.int64)
+    popcount = np.zeros(len(masks), dtype=np.int64)
+    for bit in range(CELLS):
+        popcount += (masks >> bit) & 1
+
+    table = np.zeros((len(masks), CELLS), dtype=np.uint8)
+    neighbors = window_neighbors()
+    # masks without the start cell have fewer cells, so they are solved before
+    for size in range(1, CELLS + 1):
+        layer = masks[popcount == size]
+        for start in range(CELLS):
+            withStart = layer[(layer >> start) & 1 == 1]
+            rest = withStart ^ (1 << start)
+            longest = np.zeros(len(withStart), dtype=np.uint8)
+            for neighbor in neighbors[start]:
+                inRest = (rest >> neighbor) & 1 == 1
+                longest = np.maximum(longest, np.where(inRest, table[rest, neighbor], 0))
+            table[withStart, start] = longest + 1
+    return table
+
+
+def write_tablebase(path, table):
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, WINDOW))
+        file.write(table.tobytes())
+
+
+class Tablebase:
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, window = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION or window != WINDOW:
+            raise ValueError(f"{path} is not a tablebase of {WINDOW}x{WINDOW} pockets")
+
+    def longest_path(self, mask: int, start: int) -> int:
+        """
+        Number of cells of the longest simple path from start over cells of the mask
+        """
+        return self.data[HEADER.size + mask * CELLS + start]
+
+    @staticmethod
+    def region(occupation, mazeSize: Coordinate, cell: Coordinate, length: int):
+        """
+        Cells which are free before the end of a path of `length` cells
+        and connected with the cell. Return (cells, minX, minY) if they fit
+        in the window together with the cell, otherwise None
+        """
+        cells = [(cell.x, cell.y)]
+        seen = {cells[0]}
+        minX = maxX = cell.x
+        minY = maxY = cell.y
+        stack = [cells[0]]
+        while stack:
+            x, y = stack.pop()
+            for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if neighbor in seen or not (0 <= neighbor[0] < mazeSize.x and 0 <= neighbor[1] < mazeSize.y) \
+                        or occupation[neighbor[0]][neighbor[1]] >= length:
+                    continue
+                seen.add(neighbor)
+                minX, maxX = min(minX, neighbor[0]), max(maxX, neighbor[0])
+                minY, maxY = min(minY, neighbor[1]), max(maxY, neighbor[1])
+                if maxX - minX >= WINDOW or maxY - minY >= WINDOW:
+                    return None
+                cells.append(neighbor)
+                stack.append(neighbor)
+        return cells, minX, minY
+
+    def in_pocket(self, occupation, mazeSize: Coordinate, head: Coordinate, length: int) -> bool:
+        """
+        True if the snake is in a pocket which fits in the window.
+        Probes are worth it only then, in open areas they never answer
+        """
+        return self.region(occupation, mazeSize, head, length) is not None
+
+    def probe(self, occupation, mazeSize: Coordinate, move: Coordinate, length: int) -> Union[bool, None]:
+        """
+        Answer pathExists(move, length, occupation, mazeSize) of the bots:
+        True or False if cells which the path may use fit in the window, otherwise None
+        """
+        region = self.region(occupation, mazeSize, move, length)
+        if region is None:
+            return None
+
+        cells, minX, minY = region
+        start = (move.x - minX) * WINDOW + move.y - minY
+        usable = free = 0
+        for x, y in cells:
+            bit = 1 << ((x - minX) * WINDOW + y - minY)
+            usable |= bit
+            if occupation[x][y] == 0:
+                free |= bit
+
+        # even cells which are free later are not enough
+        if self.longest_path(usable, start) < length:
+            return False
+        # cells which are free now are enough
+        if self.longest_path(free, start) >= length:
+            return True
+        return None
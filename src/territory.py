@@ -0,0 +1,129 @@
+"""
+Voronoi territory of two snakes.
+
+Both heads are expanded by one BFS, layer by layer. A cell belongs to
+the snake which reaches it first, cells reached by both at the same time
+are the frontier. Bodies are taken from the `occupation` countdown of the
+bots: a cell with occupation k is free from the step k + 1. A blocked
+cell next to the territory of a snake waits until it is free, as if the
+snake waits for it nearby.
+
+Territory keeps its buffers between calls and only reads `occupation`,
+so it can be called after simulateMove/rollbackMove without copies. There
+is no incremental update: every call is a full BFS (~150 us on 14x14),
+and no bot uses it yet
+"""
+from array import array
+from typing import List, Tuple
+
+from .geometry import Coordinate, move_table
+
+NOBODY = 0
+FIRST = 1
+SECOND = 2
+FRONTIER = 3
+
+
+def occupation_grid(mazeSize: Coordinate, *bodies) -> List[List[int]]:
+    """
+    occupation[x][y] is the number of steps before the cell is free
+    """
+    occupation = [[0] * mazeSize.y for _ in range(mazeSize.x)]
+    for body in bodies:
+        for i, cell in enumerate(body[::-1]):
+            occupation[cell.x][cell.y] = i + 1
+    return occupation
+
+
+class Territory:
+    def __init__(self, mazeSize: Coordinate):
+        self.mazeSize = mazeSize
+        height = mazeSize.y
+        size = mazeSize.x * mazeSize.y
+        # cell index is x * height + y
+        self.xs = [i // height for i in range(size)]
+        self.ys = [i % height for i in range(size)]
+        tables = move_table(mazeSize.x, height)
+        self.neighbors = [[table[i] for table in tables if table[i] >= 0] for i in range(size)]
+        # owner is valid only for cells with stamp == generation,
+        # so buffers are not cleared between calls
+        self.owner = bytearray(size)
+        self.stamp = array('I', bytes(4 * size))
+        self.generation = 0
+        self.counts = (0, 0)
+
+    def index(self, cell: Coordinate) -> int:
+        return cell.x * self.mazeSize.y + cell.y
+
+    def compute(self, occupation, head1: Coordinate, head2: Coordinate) -> Tuple[int, int]:
+        """
+        Return number of cells of the first and the second snake
+        """
+        self.generation += 1
+        generation, owner, stamp = self.generation, self.owner, self.stamp
+        xs, ys, neighbors = self.xs, self.ys, self.neighbors
+
+        layers = ([self.index(head1)], [self.index(head2)])
+        for side, layer in enumerate(layers, FIRST):
+            stamp[layer[0]] = generation
+            owner[layer[0]] = side
+        # {step: [(cell, side)]} for blocked cells
+        waiting = {}
+        counts = [0, 0, 0, 0]
+
+        step = 0
+        while layers[0] or layers[1] or waiting:
+            step += 1
+            reached = ({}, {})
+            # cells which are free from this step, of both snakes
+            freed = waiting.pop(step, ())
+            for side in (0, 1):
+                candidates = reached[side]
+                for cell in layers[side]:
+                    for neighbor in neighbors[cell]:
+                        if stamp[neighbor] == generation or neighbor in candidates:
+                            continue
+                        busy = occupation[xs[neighbor]][ys[neighbor]]
+                        if busy >= step:
+                            waiting.setdefault(busy + 1, []).append((neighbor, side))
+                        else:
+                            candidates[neighbor] = True
+                for cell, waitingSide in freed:
+                    if waitingSide == side and stamp[cell] != generation:
+                        candidates[cell] = True
+
+            first, second = reached
+            for cell in first:
+                stamp[cell] = generation
+                owner[cell] = FRONTIER if cell in second else FIRST
+                counts[owner[cell]] += 1
+            for cell in second:
+                if cell not in first:
+                    stamp[cell] = generation
+                    owner[cell] = SECOND
+                    counts[SECOND] += 1
+
+            layers = ([cell for cell in first if cell not in second],
+                      [cell for cell in second if cell not in first])
+
+        self.counts = (counts[FIRST], counts[SECOND])
+        return self.counts
+
+    def owner_of(self, cell: Coordinate) -> int:
+        """
+        NOBODY, FIRST, SECOND or FRONTIER by the last compute
+        """
+        i = self.index(cell)
+        return self.owner[i] if self.stamp[i] == self.generation else NOBODY
+
+    def frontier_mask(self) -> bytearray:
+        """
+        1 for frontier cells by the last compute, indexed by x * height + y
+        """
+        generation = self.generation
+        return bytearray(
+            owner == FRONTIER and stamp == generation for owner, stamp in zip(self.owner, self.stamp))
+
+    def frontier(self) -> List[Coordinate]:
+        mask = self.frontier_mask()
+        return [Coordinate(self.xs[i], self.ys[i]) for i, value in enumerate(mask) if value]
@@ -0,0 +1,219 @@
+"""
+Black-box tuning of module constants of a bot (EDGE_PENALTY, APPLE_REWARDS, ...).
+
+Constants are flattened into a parameter vector. Candidates are injected
+into fresh copies of the bot module (see import_bot(constants=...)) and
+scored by seeded games against a reference bot in a BotPool.
+The optimizer is SPSA, it needs two candidates per iteration whatever
+the number of parameters. Scores are cached per (constants, seed) and
+the state of the optimizer is checkpointed, so an interrupted run is resumed
+"""
+import json
+import sqlite3
+import zlib
+from typing import Dict, List
+
+import numpy as np
+
+from .botPool import BotPool
+from .importsTools import load_bot_class
+from .utils import get_package_name
+
+TUNABLE = (
+    'EDGE_PENALTY', 'CORNER_PENALTIES', 'OPPONENT_HEAD_PENALTIES', 'SNAKE_PENALTY',
+    'APPLE_REWARD', 'APPLE_REWARDS', 'CENTER_REWARDS',
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS config (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evaluations (
+    params TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (params, seed)
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    iteration INTEGER PRIMARY KEY,
+    theta TEXT NOT NULL,
+    plus REAL NOT NULL,
+    minus REAL NOT NULL
+);
+"""
+
+
+def default_constants(path, names=TUNABLE) -> dict:
+    """
+    Return values of constants of the bot module which are present in it
+    """
+    module = load_bot_class(path).chooseDirection.__globals__
+    return {name: module[name] for name in names if name in module}
+
+
+class ParameterSpace:
+    def __init__(self, defaults: Dict[str, object]):
+        """
+        defaults -- {name: number or list of numbers}
+        """
+        self.defaults = defaults
+        # (name of constant, index in the list or None)
+        self.parameters = []
+        initial = []
+        for name, value in defaults.items():
+            if isinstance(value, (list, tuple)):
+                self.parameters += [(name, i) for i in range(len(value))]
+                initial += value
+            else:
+                self.parameters.append((name, None))
+                initial.append(value)
+        # integer constants stay integers, e.g. depths of search
+        self.integers = [isinstance(value, int) for value in initial]
+        self.initial = np.array(initial, dtype=float)
+        # steps are relative to magnitudes of default values
+        self.scale = np.maximum(np.abs(self.initial), 1.0)
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def vector(self, theta: np.ndarray) -> np.ndarray:
+        """
+        Values of parameters by normalized vector, theta = 0 is the defaults
+        """
+        return self.initial + self.scale * theta
+
+    def constants(self, theta: np.ndarray) -> dict:
+        constants = {name: list(value) if isinstance(value, (list, tuple)) else value
+                     for name, value in self.defaults.items()}
+        for (name, index), value, integer in zip(self.parameters, self.vector(theta), self.integers):
+            # rounding makes close candidates share cached results
+            value = round(float(value)) if integer else round(float(value), 2)
+            if index is None:
+                constants[name] = value
+            else:
+                constants[name][index] = value
+        return constants
+
+
+def params_key(constants: dict) -> str:
+    return json.dumps(constants, sort_keys=True)
+
+
+class SPSATuner:
+    def __init__(self, path, reference, space: ParameterSpace, dbPath, games, processes=None,
+                 a=0.5, c=0.2, A=10, alpha=0.602, gamma=0.101, seed=0):
+        """
+        path      -- bot to tune
+        reference -- opponent of candidates
+        games     -- games per candidate in every iteration, candidates share seeds
+        a, c, A, alpha, gamma -- gain sequences of SPSA: step a / (k + 1 + A) ** alpha
+                                 and perturbation c / (k + 1) ** gamma
+        """
+        self.path = path
+        self.reference = reference
+        self.space = space
+        self.games = games
+        self.a, self.c, self.A, self.alpha, self.gamma = a, c, A, alpha, gamma
+        self.seed = seed
+        self.db = sqlite3.connect(dbPath)
+        self.db.executescript(SCHEMA)
+        self.check_config()
+        self.pool = BotPool([path, reference], processes)
+
+    def check_config(self):
+        config = {
+            'bot': get_package_name(self.path),
+            'reference': get_package_name(self.reference),
+            'defaults': self.space.defaults,
+            'games': self.games,
+            'gains': [self.a, self.c, self.A, self.alpha, self.gamma],
+            'seed': self.seed,
+        }
+        stored = {name: json.loads(value) for name, value in self.db.execute("SELECT name, value FROM config")}
+        if stored and stored != json.loads(json.dumps(config)):
+            raise ValueError("The database was created for another tuning run")
+        self.db.executemany("INSERT OR IGNORE INTO config VALUES (?, ?)",
+                            [(name, json.dumps(value)) for name, value in config.items()])
+        self.db.commit()
+
+    def game_seeds(self, iteration) -> List[int]:
+        return [zlib.crc32(f"{self.seed} {iteration} {game}".encode()) for game in range(self.games)]
+
+    def evaluate(self, candidates: List[dict], seeds: List[int]) -> List[float]:
+        """
+        Mean score (1 for a win, 0.5 for a draw) of every candidate against the reference.
+        The candidate plays the first snake in even games
+        """
+        keys = [params_key(constants) for constants in candidates]
+        scores = {}
+        for key in set(keys):
+            scores.update({
+                (key, seed): score for seed, score in
+                self.db.execute("SELECT seed, score FROM evaluations WHERE params = ?", (key,))
+                if seed in seeds
+            })
+
+        tasks = []
+        for key, constants in zip(keys, candidates):
+            for game, seed in enumerate(seeds):
+                if (key, seed) in scores:
+                    continue
+                scores[(key, seed)] = None
+                side = game % 2
+                bots = ((self.path, constants), self.reference)
+                tasks.append((*(bots[::-1] if side else bots), seed, (key, seed, side)))
+
+        for (key, seed, side), metadata in self.pool.play(tasks):
+            wins = metadata['result'][::-1] if side else metadata['result']
+            score = 1.0 if wins[0] else 0.0 if wins[1] else 0.5
+            scores[(key, seed)] = score
+            self.db.execute("INSERT INTO evaluations VALUES (?, ?, ?)", (key, seed, score))
+            self.db.commit()
+
+        return [sum(scores[(key, seed)] for seed in seeds) / len(seeds) for key in keys]
+
+    def resume(self):
+        """
+        Return the next iteration and theta from the last checkpoint
+        """
+        row = self.db.execute(
+            "SELECT iteration, theta FROM checkpoints ORDER BY iteration DESC LIMIT 1").fetchone()
+        if row is None:
+            return 0, np.zeros(len(self.space))
+        return row[0] + 1, np.array(json.loads(row[1]))
+
+    def step(self, iteration, theta) -> np.ndarray:
+        # perturbation depends only on the iteration, so a resumed run is the same
+        rng = np.random.default_rng([self.seed, iteration])
+        delta = rng.choice([-1.0, 1.0], size=len(self.space))
+        ck = self.c / (iteration + 1) ** self.gamma
+        ak = self.a / (iteration + 1 + self.A) ** self.alpha
+
+        plus, minus = self.evaluate(
+            [self.space.constants(theta + ck * delta), self.space.constants(theta - ck * delta)],
+            self.game_seeds(iteration))
+        theta = theta + ak * (plus - minus) / (2 * ck * delta)
+
+        self.db.execute("INSERT INTO checkpoints VALUES (?, ?, ?, ?)",
+                        (iteration, json.dumps(theta.tolist()), plus, minus))
+        self.db.commit()
+        print(f"Iteration {iteration}: score {plus:.2f} / {minus:.2f}, "
+              f"constants {self.space.constants(theta)}")
+        return theta
+
+    def run(self, iterations) -> dict:
+        """
+        Run SPSA up to the given number of iterations and return tuned constants
+        """
+        start, theta = self.resume()
+        for iteration in range(start, iterations):
+            theta = self.step(iteration, theta)
+        return self.space.constants(theta)
+
+    def validate(self, constants: dict, games) -> float:
+        """
+        Score of constants against the reference on seeds which were not used for tuning
+        """
+        seeds = [zlib.crc32(f"{self.seed} validation {game}".encode()) for game in range(games)]
+        return self.evaluate([constants], seeds)[0]
@@ -1,7 +1,10 @@
 from src.bot import IBot
 from src.geometry import Direction, Coordinate, directions
+from src.importsTools import shared_file
 from src.snake import Snake
+from src.tablebase import Tablebase
 
+import os
 import random
 from copy import deepcopy
 
@@ -12,6 +15,10 @@ SNAKE_PENALTY = -11
 APPLE_REWARDS = [10, 8, 6, 4, 2]
 CENTER_REWARDS = [12, 10, 8, 6, 4, 2]
 
+# built by buildTablebase.py, without it pockets are always searched
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pockets.tb')
+tablebase = shared_file(TABLEBASE_PATH, Tablebase) if os.path.exists(TABLEBASE_PATH) else None
+
 
 def neighbors(cell, mazeSize):
     for d in directions:
@@ -90,10 +97,15 @@ def rollbackMove(move, snake, occupation):
         occupation[c.x][c.y] += 1
 
 
-def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpponentMove=None):
+def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpponentMove=None, pockets=None):
     if occupation[move.x][move.y] > 0:
         return False
     elif depth == 1:
+        # small pockets are solved in advance
+        if pockets:
+            known = pockets.probe(occupation, mazeSize, move, len(snake))
+            if known is not None:
+                return known
         res = pathExists(move, len(snake), occupation, mazeSize)
         return res
     else:
@@ -122,7 +134,8 @@ def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpp
 
                         safeMoveExists = False
                         for nextMove in allowedMoves(move, mazeSize, occupation):
-                            if isMoveSafe(nextMove, [move] + snake[:-1], [opponentMove] + opponent[:-1], occupation, mazeSize, depth - 1):
+                            if isMoveSafe(nextMove, [move] + snake[:-1], [opponentMove] + opponent[:-1], occupation, mazeSize, depth - 1,
+                                          pockets=pockets):
                                 safeMoveExists = True
                                 break
                         if not safeMoveExists:
@@ -148,8 +161,8 @@ class Bot(IBot):
 
     def initMaze(self, mazeSize):
         self.baseMaze = []
-        for y in range(mazeSize.y):
-            self.baseMaze.append([0 for _ in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            self.baseMaze.append([0 for _ in range(mazeSize.y)])
 
         # penalize edges
         for y in range(mazeSize.y):
@@ -204,15 +217,20 @@ class Bot(IBot):
 
         # avoid dead zones
         occupation = []
-        for y in range(mazeSize.y):
-            occupation.append([0 for _ in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            occupation.append([0 for _ in range(mazeSize.y)])
         for i, cell in enumerate(snake.body[::-1]):
             occupation[cell.x][cell.y] = i + 1
         for i, cell in enumerate(opponent.body[::-1]):
             occupation[cell.x][cell.y] = i + 1
 
+        # the tablebase is probed only in small pockets
+        pockets = tablebase if tablebase and tablebase.in_pocket(occupation, mazeSize, snake.head, len(snake.body)) else None
+        opponentPockets = tablebase \
+            if tablebase and tablebase.in_pocket(occupation, mazeSize, opponent.head, len(opponent.body)) else None
+
         for move in allowedMoves(snake.head, mazeSize, occupation):
-            if not isMoveSafe(move, snake.body, opponent.body, occupation, mazeSize, 3):
+            if not isMoveSafe(move, snake.body, opponent.body, occupation, mazeSize, 3, pockets=pockets):
                 cells_to_avoid.add(move)
                 # for debug
                 # if path_exists(neighbor, len(snake.body)) and len(snake.body) > len(opponent.body):
@@ -222,7 +240,8 @@ class Bot(IBot):
             if move not in cells_to_avoid:
                 winning = True
                 for opponentMove in allowedMoves(opponent.head, mazeSize, occupation):
-                    if isMoveSafe(opponentMove, opponent.body, snake.body, occupation, mazeSize, 3, move):
+                    if isMoveSafe(opponentMove, opponent.body, snake.body, occupation, mazeSize, 3, move,
+                                  pockets=opponentPockets):
                         winning = False
                 if winning:
                     winning_cells.add(move)
@@ -1,7 +1,10 @@
 from src.bot import IBot
 from src.geometry import Direction, Coordinate, directions
+from src.importsTools import shared, shared_file
 from src.snake import Snake
+from src.tablebase import Tablebase
 
+import os
 import random
 from copy import deepcopy
 
@@ -12,6 +15,10 @@ SNAKE_PENALTY = -11
 APPLE_REWARDS = [10, 8, 6, 4, 2]
 CENTER_REWARDS = [12, 10, 8, 6, 4, 2]
 
+# built by buildTablebase.py, without it pockets are always searched
+TABLEBASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pockets.tb')
+tablebase = shared_file(TABLEBASE_PATH, Tablebase) if os.path.exists(TABLEBASE_PATH) else None
+
 
 def neighbors(cell, mazeSize):
     for d in directions:
@@ -90,10 +97,16 @@ def rollbackMove(move, snake, occupation):
         occupation[c.x][c.y] += 1
 
 
-def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpponentMove=None):
+def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpponentMove=None, pockets=None,
+               likelyReplies=None):
     if occupation[move.x][move.y] > 0:
         return False
     elif depth == 1:
+        # small pockets are solved in advance
+        if pockets:
+            known = pockets.probe(occupation, mazeSize, move, len(snake))
+            if known is not None:
+                return known
         res = pathExists(move, len(snake), occupation, mazeSize)
         return res
     else:
@@ -116,13 +129,17 @@ def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpp
                 # opponent has no moves (heads collision is considered above)
                 return True
             else:
+                # replies of the opponent model, the likely ones first. Unlikely replies are not searched
+                if likelyReplies is not None:
+                    opponentMoves = [m for m in likelyReplies if m in opponentMoves] or opponentMoves
                 for opponentMove in opponentMoves:
                     try:
                         simulateMove(opponentMove, opponent, occupation)
 
                         safeMoveExists = False
                         for nextMove in allowedMoves(move, mazeSize, occupation):
-                            if isMoveSafe(nextMove, [move] + snake[:-1], [opponentMove] + opponent[:-1], occupation, mazeSize, depth - 1):
+                            if isMoveSafe(nextMove, [move] + snake[:-1], [opponentMove] + opponent[:-1], occupation, mazeSize, depth - 1,
+                                          pockets=pockets):
                                 safeMoveExists = True
                                 break
                         if not safeMoveExists:
@@ -135,6 +152,33 @@ def isMoveSafe(move, snake, opponent, occupation, mazeSize, depth, predefinedOpp
     return True
 
 
+def buildInitialMazes(mazeSize):
+    baseMaze = []
+    for x in range(mazeSize.x):
+        baseMaze.append([0 for _ in range(mazeSize.y)])
+
+    # penalize edges
+    for y in range(mazeSize.y):
+        baseMaze[0][y] += EDGE_PENALTY
+        baseMaze[mazeSize.x - 1][y] += EDGE_PENALTY
+
+    for x in range(1, mazeSize.x - 1):
+        baseMaze[x][0] += EDGE_PENALTY
+        baseMaze[x][mazeSize.y - 1] += EDGE_PENALTY
+
+    # penalize corners
+    setValuesAroundCell(baseMaze, mazeSize, Coordinate(0, 0), CORNER_PENALTIES, False)
+    setValuesAroundCell(baseMaze, mazeSize, Coordinate(mazeSize.x - 1, 0), CORNER_PENALTIES, False)
+    setValuesAroundCell(baseMaze, mazeSize, Coordinate(0, mazeSize.y - 1), CORNER_PENALTIES, False)
+    setValuesAroundCell(baseMaze, mazeSize, Coordinate(mazeSize.x - 1, mazeSize.y - 1), CORNER_PENALTIES, False)
+
+    centeredMaze = deepcopy(baseMaze)
+    setValuesAroundSquare(centeredMaze, mazeSize, Coordinate(mazeSize.x // 2 - 1, mazeSize.y // 2 - 1), CENTER_REWARDS, False)
+
+    center = Coordinate((mazeSize.x - 1) / 2, (mazeSize.y - 1) / 2)
+    return baseMaze, centeredMaze, center
+
+
 # Guards the apple to the end of game
 class Bot(IBot):
     def __init__(self, *args, **kwargs):
@@ -145,31 +189,14 @@ class Bot(IBot):
         self.centeredMaze = None
         self.center = None
         self.lastMaze = None
+        self.winningCells = set()
+        # src.opponentModel.OpponentModel, without it all replies of the opponent are searched
+        self.opponentModel = None
 
     def initMaze(self, mazeSize):
-        self.baseMaze = []
-        for y in range(mazeSize.y):
-            self.baseMaze.append([0 for _ in range(mazeSize.x)])
-
-        # penalize edges
-        for y in range(mazeSize.y):
-            self.baseMaze[0][y] += EDGE_PENALTY
-            self.baseMaze[mazeSize.x - 1][y] += EDGE_PENALTY
-
-        for x in range(1, mazeSize.x - 1):
-            self.baseMaze[x][0] += EDGE_PENALTY
-            self.baseMaze[x][mazeSize.y - 1] += EDGE_PENALTY
-
-        # penalize corners
-        setValuesAroundCell(self.baseMaze, mazeSize, Coordinate(0, 0), CORNER_PENALTIES, False)
-        setValuesAroundCell(self.baseMaze, mazeSize, Coordinate(mazeSize.x - 1, 0), CORNER_PENALTIES, False)
-        setValuesAroundCell(self.baseMaze, mazeSize, Coordinate(0, mazeSize.y - 1), CORNER_PENALTIES, False)
-        setValuesAroundCell(self.baseMaze, mazeSize, Coordinate(mazeSize.x - 1, mazeSize.y - 1), CORNER_PENALTIES, False)
-
-        self.centeredMaze = deepcopy(self.baseMaze)
-        setValuesAroundSquare(self.centeredMaze, mazeSize, Coordinate(mazeSize.x // 2 - 1, mazeSize.y // 2 - 1), CENTER_REWARDS, False)
-
-        self.center = Coordinate((mazeSize.x - 1) / 2, (mazeSize.y - 1) / 2)
+        # mazes are shared by all instances of the bot with the same constants, they are never modified in place
+        key = ('strategy3 mazes', mazeSize.x, mazeSize.y, EDGE_PENALTY, tuple(CORNER_PENALTIES), tuple(CENTER_REWARDS))
+        self.baseMaze, self.centeredMaze, self.center = shared(key, buildInitialMazes, mazeSize)
 
     def chooseDirection(self, snake: Snake, opponent: Snake, mazeSize: Coordinate, apple: Coordinate) -> Direction:
         if self.baseMaze is None:
@@ -204,15 +231,26 @@ class Bot(IBot):
 
         # avoid dead zones
         occupation = []
-        for y in range(mazeSize.y):
-            occupation.append([0 for _ in range(mazeSize.x)])
+        for x in range(mazeSize.x):
+            occupation.append([0 for _ in range(mazeSize.y)])
         for i, cell in enumerate(snake.body[::-1]):
             occupation[cell.x][cell.y] = i + 1
         for i, cell in enumerate(opponent.body[::-1]):
             occupation[cell.x][cell.y] = i + 1
 
+        # the tablebase is probed only in small pockets
+        pockets = tablebase if tablebase and tablebase.in_pocket(occupation, mazeSize, snake.head, len(snake.body)) else None
+        opponentPockets = tablebase \
+            if tablebase and tablebase.in_pocket(occupation, mazeSize, opponent.head, len(opponent.body)) else None
+
+        likelyReplies = None
+        if self.opponentModel is not None:
+            self.opponentModel.observe(snake, opponent, mazeSize, apple)
+            likelyReplies = self.opponentModel.likely_replies(snake, opponent, mazeSize, apple)
+
         for move in allowedMoves(snake.head, mazeSize, occupation):
-            if not isMoveSafe(move, snake.body, opponent.body, occupation, mazeSize, 3):
+            if not isMoveSafe(move, snake.body, opponent.body, occupation, mazeSize, 3, pockets=pockets,
+                              likelyReplies=likelyReplies):
                 cells_to_avoid.add(move)
                 # for debug
                 # if path_exists(neighbor, len(snake.body)) and len(snake.body) > len(opponent.body):
@@ -222,7 +260,8 @@ class Bot(IBot):
             if move not in cells_to_avoid:
                 winning = True
                 for opponentMove in allowedMoves(opponent.head, mazeSize, occupation):
-                    if isMoveSafe(opponentMove, opponent.body, snake.body, occupation, mazeSize, 3, move):
+                    if isMoveSafe(opponentMove, opponent.body, snake.body, occupation, mazeSize, 3, move,
+                                  pockets=opponentPockets):
                         winning = False
                 if winning:
                     winning_cells.add(move)
@@ -230,6 +269,8 @@ class Bot(IBot):
                     # if snake.head.getDistance(opponent.head) > 2:
                     #     pass
 
+        self.winningCells = winning_cells
+
         possible_directions = []
         risky_directions = []
         safe_directions = []
@@ -0,0 +1,15 @@
+import os
+
+from src.importsTools import load_bot_class
+from src.opponentModel import OpponentModel
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+Strategy3Bot = load_bot_class(os.path.join(DIRECTORY, 'strategy3_bot.py'))
+
+
+# strategy3_bot which searches only the replies its model of the opponent finds likely
+class Bot(Strategy3Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.opponentModel = OpponentModel()
@@ -0,0 +1,28 @@
+import os
+
+from src.importsTools import load_bot_class, shared_file
+from src.openingBook import OpeningBook
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+# built by buildOpeningBook.py, without it the bot plays as strategy3_bot
+BOOK_PATH = os.path.join(DIRECTORY, 'openings.book')
+
+book = shared_file(BOOK_PATH, OpeningBook) if os.path.exists(BOOK_PATH) else None
+Strategy3Bot = load_bot_class(os.path.join(DIRECTORY, 'strategy3_bot.py'))
+
+
+# strategy3_bot with moves of the opening book
+class Bot(Strategy3Bot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inOpening = book is not None
+
+    def chooseDirection(self, snake, opponent, mazeSize, apple):
+        if self.inOpening:
+            move = book.lookup(snake, opponent, mazeSize, apple)
+            if move is not None:
+                return move
+            # positions after the book never return to it
+            self.inOpening = False
+
+        return super().chooseDirection(snake, opponent, mazeSize, apple)
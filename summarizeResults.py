@@ -0,0 +1,38 @@
+import argparse
+import json
+import time
+
+from src.results import ResultTable, format_summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Summarize results saved by simulator.py --output')
+    parser.add_argument(
+        'directory',
+        help='directory with results of games',
+    )
+    parser.add_argument(
+        '--bin', type=int, default=25,
+        help='width of bins of the game length histogram. default is 25',
+    )
+    parser.add_argument(
+        '--json', action='store_true',
+        help='print the summary as json',
+    )
+    parser.add_argument(
+        '--csv',
+        help='export results of games to the CSV file',
+    )
+
+    args = parser.parse_args()
+    startTime = time.perf_counter()
+    table = ResultTable.load(args.directory)
+    summary = table.summary(lengthBin=args.bin)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(format_summary(summary))
+        print(f'Summarized in {time.perf_counter() - startTime:.2f} s')
+
+    if args.csv:
+        table.to_csv(args.csv)
@@ -0,0 +1,62 @@
+import random
+
+from src.geometry import Coordinate
+from src.territory import FRONTIER, Territory, occupation_grid
+
+
+def test_blocked_corridor():
+    # 1x5 corridor: heads at the ends, cells next to them are free from step 3
+    mazeSize = Coordinate(1, 5)
+    occupation = [[0, 2, 0, 2, 0]]
+    territory = Territory(mazeSize)
+
+    assert territory.compute(occupation, Coordinate(0, 0), Coordinate(0, 4)) == (1, 1)
+    assert territory.frontier() == [Coordinate(0, 2)]
+    assert territory.owner_of(Coordinate(0, 2)) == FRONTIER
+    assert territory.compute(occupation, Coordinate(0, 4), Coordinate(0, 0)) == (1, 1)
+
+
+def test_free_corridor():
+    mazeSize = Coordinate(1, 6)
+    territory = Territory(mazeSize)
+    assert territory.compute(occupation_grid(mazeSize), Coordinate(0, 0), Coordinate(0, 5)) == (2, 2)
+    assert territory.frontier() == []
+
+
+def random_position(generator, mazeSize, length):
+    """
+    Two random walks of the given length which do not cross
+    """
+    while True:
+        occupied = set()
+        bodies = []
+        for _ in range(2):
+            cell = Coordinate(generator.randrange(mazeSize.x), generator.randrange(mazeSize.y))
+            body = [cell]
+            while len(body) < length and cell not in occupied:
+                options = [n for n in (Coordinate(cell.x + dx, cell.y + dy)
+                                       for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)))
+                           if n.inBounds(mazeSize) and n not in occupied and n not in body]
+                if not options:
+                    break
+                cell = generator.choice(options)
+                body.append(cell)
+            if len(body) < length or body[0] in occupied:
+                break
+            occupied.update(body)
+            bodies.append(body)
+        if len(bodies) == 2:
+            return bodies
+
+
+def test_swapped_heads_give_swapped_counts():
+    generator = random.Random(0)
+    mazeSize = Coordinate(14, 14)
+    territory = Territory(mazeSize)
+    for _ in range(200):
+        body1, body2 = random_position(generator, mazeSize, generator.randrange(2, 30))
+        occupation = occupation_grid(mazeSize, body1, body2)
+        first, second = territory.compute(occupation, body1[0], body2[0])
+        frontier = territory.frontier()
+        assert territory.compute(occupation, body2[0], body1[0]) == (second, first)
+        assert territory.frontier() == frontier
@@ -0,0 +1,202 @@
+import argparse
+import itertools
+import multiprocessing
+import random
+import sqlite3
+import zlib
+from collections import defaultdict
+
+from src.botPool import BotPool
+from src.rating import elo_ratings
+from src.utils import find_all_files_with_pattern, get_package_name
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    round INTEGER NOT NULL,
+    bot1 TEXT NOT NULL,
+    bot2 TEXT NOT NULL,
+    game INTEGER NOT NULL,
+    seed INTEGER NOT NULL,
+    winner INTEGER NOT NULL,
+    score1 INTEGER NOT NULL,
+    score2 INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (round, bot1, bot2, game)
+);
+CREATE TABLE IF NOT EXISTS pairings (
+    round INTEGER NOT NULL,
+    bot1 TEXT NOT NULL,
+    bot2 TEXT NOT NULL,
+    PRIMARY KEY (round, bot1, bot2)
+);
+"""
+
+
+def game_seed(round, bot1, bot2, game) -> int:
+    return zlib.crc32(f"{round} {bot1} {bot2} {game}".encode())
+
+
+def schedule_task(task) -> tuple:
+    """
+    Return (path of 1st bot, path of 2nd bot, seed, task) for BotPool
+    """
+    round, path1, path2, game = task
+    # bots change sides every game
+    first, second = (path1, path2) if game % 2 == 0 else (path2, path1)
+    return first, second, game_seed(round, path1, path2, game), task
+
+
+class Tournament:
+    def __init__(self, bots, dbPath, games, processes, warmUp=True):
+        self.bots = {get_package_name(path): path for path in bots}
+        self.games = games
+        self.pool = BotPool(bots, processes, warmUp=warmUp)
+        self.db = sqlite3.connect(dbPath)
+        self.db.executescript(SCHEMA)
+
+    def pending_tasks(self, round, pairs):
+        played = set(self.db.execute(
+            "SELECT bot1, bot2, game FROM games WHERE round = ?", (round,)))
+        for bot1, bot2 in pairs:
+            for game in range(self.games):
+                if (bot1, bot2, game) not in played:
+                    yield round, bot1, bot2, game
+
+    def run_tasks(self, tasks):
+        tasks = [(r, self.bots[b1], self.bots[b2], g) for r, b1, b2, g in tasks]
+        if not tasks:
+            return
+
+        print(f"Playing {len(tasks)} games")
+        for i, (task, metadata) in enumerate(self.pool.play(map(schedule_task, tasks)), 1):
+            round, path1, path2, game = task
+            winner = metadata['winner']
+            score1, score2 = metadata['score']
+            if game % 2 == 1:
+                winner = {1: 2, 2: 1}.get(winner, winner)
+                score1, score2 = score2, score1
+
+            self.db.execute(
+                "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (round, get_package_name(path1), get_package_name(path2),
+                 game, game_seed(*task), winner, score1, score2, metadata['description']))
+            # commit every game, so an interrupted run can be resumed
+            self.db.commit()
+            print(f"{i}/{len(tasks)}: {get_package_name(path1)} vs {get_package_name(path2)}, winner {winner}")
+
+    def round_robin(self):
+        pairs = list(itertools.combinations(sorted(self.bots), 2))
+        self.run_tasks(self.pending_tasks(0, pairs))
+
+    def swiss_pairs(self, round):
+        pairs = list(self.db.execute(
+            "SELECT bot1, bot2 FROM pairings WHERE round = ?", (round,)))
+        if pairs:
+            return pairs
+
+        points = self.points()
+        met = {frozenset(p) for p in self.db.execute("SELECT bot1, bot2 FROM pairings")}
+        # random tiebreak, but the same on resume
+        rng = random.Random(round)
+        unpaired = sorted(self.bots, key=lambda bot: (-points[bot], rng.random()))
+
+        while len(unpaired) > 1:
+            bot1 = unpaired.pop(0)
+            opponent = next((bot for bot in unpaired if frozenset((bot1, bot)) not in met), unpaired[0])
+            unpaired.remove(opponent)
+            pairs.append((bot1, opponent))
+
+        self.db.executemany("INSERT INTO pairings VALUES (?, ?, ?)",
+                            [(round, bot1, bot2) for bot1, bot2 in pairs])
+        self.db.commit()
+        return pairs
+
+    def swiss(self, rounds):
+        for round in range(1, rounds + 1):
+            pairs = self.swiss_pairs(round)
+            print(f"Round {round}: {pairs}")
+            self.run_tasks(self.pending_tasks(round, pairs))
+
+    def results(self):
+        """
+        Return list of (bot1, bot2, score of bot1)
+        """
+        scores = {0: 0.5, 1: 1, 2: 0}
+        return [
+            (bot1, bot2, scores[winner])
+            for bot1, bot2, winner in self.db.execute("SELECT bot1, bot2, winner FROM games")
+            if bot1 in self.bots and bot2 in self.bots
+        ]
+
+    def points(self):
+        points = defaultdict(float)
+        for bot1, bot2, score in self.results():
+            points[bot1] += score
+            points[bot2] += 1 - score
+        return points
+
+    def print_ratings(self):
+        results = self.results()
+        ratings = elo_ratings(results, list(self.bots))
+
+        stats = defaultdict(lambda: [0, 0, 0])  # wins, draws, losses
+        for bot1, bot2, score in results:
+            index = {1: 0, 0.5: 1, 0: 2}
+            stats[bot1][index[score]] += 1
+            stats[bot2][index[1 - score]] += 1
+
+        print(f'Total games: {len(results)}')
+        print('{:<22} {:>6} {:>15} {:>14}'.format('Bot', 'Elo', '95% CI', '+=-'))
+        for bot, (elo, low, high) in sorted(ratings.items(), key=lambda r: -r[1][0]):
+            wins, draws, losses = stats[bot]
+            print('{:<22} {:>6.0f} {:>15} {:>14}'.format(
+                bot, elo, f'[{low:.0f}, {high:.0f}]', f'+{wins}={draws}-{losses}'))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        'directory', nargs='?', default='.',
+        help='directory with bots. default is current directory',
+    )
+    parser.add_argument(
+        '-p', '--pattern', default=r'_bot\.py$',
+        help='pattern of bot files. default is _bot.py',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=2,
+        help='number of games for each pair of bots. default is 2',
+    )
+    parser.add_argument(
+        '-s', '--swiss', type=int, metavar='ROUNDS',
+        help='play given number of swiss rounds instead of round-robin',
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=multiprocessing.cpu_count(),
+        help='number of worker processes. default is number of CPUs',
+    )
+    parser.add_argument(
+        '--cold', action='store_true',
+        help='do not warm up bots when worker processes start',
+    )
+    parser.add_argument(
+        '--latency', action='store_true',
+        help='compare first-move and steady-state latency of bots',
+    )
+    parser.add_argument(
+        '--db', default='tournament.sqlite',
+        help='database with results. an interrupted tournament is resumed from it',
+    )
+
+    args = parser.parse_args()
+    bots = find_all_files_with_pattern(args.directory, args.pattern)
+    tournament = Tournament(sorted(bots), args.db, args.games, args.processes, warmUp=not args.cold)
+    with tournament.pool:
+        if args.swiss:
+            tournament.swiss(args.swiss)
+        else:
+            tournament.round_robin()
+
+    tournament.print_ratings()
+    if args.latency:
+        tournament.pool.print_latencies()
@@ -0,0 +1,119 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.network import Adam, PolicyValueNet
+from src.selfPlay import SelfPlayDataset
+
+# moves after mirroring of the maze, in the order of directions: UP, DOWN, RIGHT, LEFT
+FLIP_X_MOVES = np.array([0, 1, 3, 2])
+FLIP_Y_MOVES = np.array([1, 0, 2, 3])
+
+
+def augment(planes, moves, generator):
+    """
+    Mirror random halves of the batch along x and y. Moves of -1 stay -1
+    """
+    planes = planes.copy()
+    moves = moves.astype(np.int64)
+    for axis, table in ((2, FLIP_X_MOVES), (3, FLIP_Y_MOVES)):
+        flipped = generator.random(len(moves)) < 0.5
+        planes[flipped] = np.flip(planes[flipped], axis=axis)
+        withMove = flipped & (moves >= 0)
+        moves[withMove] = table[moves[withMove]]
+    return planes, moves
+
+
+def split(batch, validation: bool):
+    """
+    Positions of every tenth game are kept for validation
+    """
+    rows = (batch['games'] % 10 == 0) == validation
+    return batch['planes'][rows], batch['moves'][rows].astype(np.int64), batch['outcomes'][rows].astype(np.float32)
+
+
+def validate(network, dataset, batchSize):
+    totals = np.zeros(3)
+    count = 0
+    for batch in dataset.batches(batchSize, shuffle=False):
+        planes, moves, outcomes = split(batch, validation=True)
+        if len(planes):
+            policyLoss, valueLoss, accuracy, _ = network.gradients(planes, moves, outcomes)
+            totals += np.array([policyLoss, valueLoss, accuracy]) * len(planes)
+            count += len(planes)
+    return totals / max(count, 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Train the policy/value network of network_bot.py on a self-play dataset')
+    parser.add_argument(
+        'dataset', nargs='?', default='selfplay',
+        help='directory of generateSelfPlay.py. default is selfplay',
+    )
+    parser.add_argument(
+        '-o', '--output', default='network.npz',
+        help='file of weights. default is network.npz',
+    )
+    parser.add_argument(
+        '--epochs', type=int, default=10,
+        help='passes over the dataset. default is 10',
+    )
+    parser.add_argument(
+        '--batch', type=int, default=256,
+        help='positions per step. default is 256',
+    )
+    parser.add_argument(
+        '--lr', type=float, default=1e-3,
+        help='learning rate of Adam. default is 0.001',
+    )
+    parser.add_argument(
+        '--hidden', type=int, nargs='+', default=[256, 128],
+        help='sizes of hidden layers. default is 256 128',
+    )
+    parser.add_argument(
+        '--value-weight', type=float, default=1.0,
+        help='weight of the value loss. default is 1',
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help='continue training of the weights in --output',
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+    )
+
+    args = parser.parse_args()
+    dataset = SelfPlayDataset(args.dataset)
+    if not len(dataset):
+        parser.error(f'{args.dataset} is empty')
+    if args.resume:
+        network = PolicyValueNet.load(args.output)
+        if network.mazeSize != dataset.mazeSize:
+            parser.error(f'{args.output} is a network of {network.mazeSize} maze')
+    else:
+        network = PolicyValueNet(dataset.mazeSize, args.hidden, seed=args.seed)
+    optimizer = Adam(network.weights, rate=args.lr)
+    generator = np.random.default_rng(args.seed)
+
+    print(f'{len(dataset)} positions of {dataset.mazeSize} maze, hidden layers {network.hidden}')
+    for epoch in range(1, args.epochs + 1):
+        start = time.perf_counter()
+        totals = np.zeros(3)
+        count = 0
+        for batch in dataset.batches(args.batch, seed=args.seed + epoch):
+            planes, moves, outcomes = split(batch, validation=False)
+            if not len(planes):
+                continue
+            planes, moves = augment(planes, moves, generator)
+            policyLoss, valueLoss, accuracy, grads = network.gradients(planes, moves, outcomes, args.value_weight)
+            optimizer.step(grads)
+            totals += np.array([policyLoss, valueLoss, accuracy]) * len(planes)
+            count += len(planes)
+
+        train = totals / max(count, 1)
+        test = validate(network, dataset, args.batch)
+        print(f'epoch {epoch}: policy loss {train[0]:.3f}/{test[0]:.3f}, value loss {train[1]:.3f}/{test[1]:.3f}, '
+              f'accuracy {train[2]:.1%}/{test[2]:.1%} (train/validation), {time.perf_counter() - start:.1f} s')
+        # saved every epoch, so an interrupted training keeps its progress
+        network.save(args.output)
@@ -0,0 +1,68 @@
+import argparse
+import json
+import multiprocessing
+
+from src.results import wilson_interval
+from src.tuning import TUNABLE, ParameterSpace, SPSATuner, default_constants
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Tune constants of a bot with SPSA')
+    parser.add_argument(
+        'bot',
+        help='path to the bot to tune',
+    )
+    parser.add_argument(
+        '-r', '--reference',
+        help='path to the opponent of candidates. default is the bot itself',
+    )
+    parser.add_argument(
+        '-c', '--constants', nargs='+', default=TUNABLE, metavar='NAME',
+        help='module constants to tune. default is all known penalties and rewards of the bot',
+    )
+    parser.add_argument(
+        '-i', '--iterations', type=int, default=50,
+        help='number of SPSA iterations. default is 50',
+    )
+    parser.add_argument(
+        '-n', '--games', type=int, default=20,
+        help='games per candidate in every iteration. default is 20',
+    )
+    parser.add_argument(
+        '-v', '--validate', type=int, default=0, metavar='GAMES',
+        help='play given number of games with tuned constants on new seeds',
+    )
+    parser.add_argument(
+        '-j', '--processes', type=int, default=multiprocessing.cpu_count(),
+        help='number of worker processes. default is number of CPUs',
+    )
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='seed of perturbations and games. default is 0',
+    )
+    parser.add_argument(
+        '--db', default='tuning.sqlite',
+        help='database with cached games and checkpoints. an interrupted run is resumed from it',
+    )
+    parser.add_argument(
+        '-o', '--output',
+        help='json file for tuned constants',
+    )
+
+    args = parser.parse_args()
+    defaults = default_constants(args.bot, args.constants)
+    print(f'Tuning {defaults}')
+
+    tuner = SPSATuner(args.bot, args.reference or args.bot, ParameterSpace(defaults),
+                      args.db, args.games, args.processes, seed=args.seed)
+    with tuner.pool:
+        constants = tuner.run(args.iterations)
+        print(json.dumps(constants))
+
+        if args.validate:
+            score = tuner.validate(constants, args.validate)
+            low, high = wilson_interval(score * args.validate, args.validate)
+            print(f'Validation score: {score:.1%} [{low:.1%}, {high:.1%}] in {args.validate} games')
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(constants, file, indent=2)
@@ -0,0 +1,57 @@
+import argparse
+import json
+import time
+
+from src import constants
+from src.game import GameOver
+from src.geometry import Coordinate
+from src.render import TerminalRenderer, state_cells
+
+
+def watch(states: dict, delay: float, every=1, start=0):
+    """
+    Play back states recorded by playGame.py --output
+    """
+    metadata = states.get('metadata', {})
+    # games recorded before mazeSize was saved are played on the default maze
+    mazeSize = Coordinate(*metadata.get('mazeSize', constants.GAME_SIZE))
+    ticks = sorted(int(key) for key in states if key != 'metadata')
+    ticks = [tick for tick in ticks if tick >= start]
+
+    renderer = TerminalRenderer(mazeSize, every=every)
+    try:
+        for i, tick in enumerate(ticks):
+            state = states[str(tick)]
+            status = f"Score: {state['score1']}:{state['score2']}\tTick: {tick}"
+            if renderer.draw(state_cells(state), status, force=i == len(ticks) - 1):
+                time.sleep(delay)
+    finally:
+        renderer.close()
+
+    if 'winner' in metadata:
+        print(GameOver(metadata['winner'], metadata['description']))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Play back a game recorded by playGame.py --output')
+    parser.add_argument(
+        'game',
+        help='path to json file of the game',
+    )
+    parser.add_argument(
+        '-d', '--delay', type=float, default=0.1,
+        help='pause after every drawn tick in seconds. default is 0.1',
+    )
+    parser.add_argument(
+        '--every', type=int, default=1, metavar='K',
+        help='draw only every K-th tick. default is 1',
+    )
+    parser.add_argument(
+        '--start', type=int, default=0, metavar='TICK',
+        help='first tick to show. default is 0',
+    )
+
+    args = parser.parse_args()
+    with open(args.game) as file:
+        states = json.load(file)
+    watch(states, args.delay, every=args.every, start=args.start)